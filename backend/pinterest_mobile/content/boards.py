@@ -0,0 +1,93 @@
+"""
+Board listings for profile grids.
+
+A board holds its own pins and pins saved to it (PinSave), and pin_count
+counts both, so previews and covers draw on both as well, newest added
+first.
+
+A page of boards comes back with its owner joined in and each board's
+newest own pins and newest saves prefetched. Each prefetch is a sliced
+queryset, which Django evaluates as one ROW_NUMBER() window over all the
+boards on the page, so a page costs three queries however many boards it
+has; preview_pins merges the two into the board's thumbnails.
+
+While ``auto_cover`` is set, ``cover_image`` follows the board's newest
+pin; the pin and save signals and bulk ingest call refresh_covers for the
+boards they touch. Choosing a cover clears ``auto_cover`` (see
+content.signals), and clearing the cover sets it again.
+"""
+import datetime
+from django.db.models import Case, DateTimeField, F, OuterRef, Prefetch, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+from .models import Board, Pin, PinSave
+
+PREVIEW_SIZE = 4
+PREVIEW_FIELDS = ('id', 'board_id', 'image_url', 'width', 'height', 'dominant_color', 'placeholder', 'created_at')
+NEVER = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def visible_boards(viewer):
+    """Public boards, plus the viewer's own private ones"""
+    visible = Q(is_private=False)
+    if viewer.is_authenticated:
+        visible |= Q(user=viewer)
+    return Board.objects.filter(visible)
+
+
+def with_previews(boards, size=PREVIEW_SIZE):
+    """Join the owner and prefetch each board's newest `size` pins and saves; see preview_pins"""
+    pins = Pin.objects.only(*PREVIEW_FIELDS).order_by('-created_at', '-id')[:size]
+    saves = (
+        PinSave.objects.select_related('pin')
+        .only('board', 'created_at', *(f'pin__{field}' for field in PREVIEW_FIELDS))
+        .order_by('-created_at', '-id')[:size]
+    )
+    return boards.select_related('user').prefetch_related(
+        Prefetch('pins', queryset=pins, to_attr='newest_pins'),
+        Prefetch('saved_pins', queryset=saves, to_attr='newest_saves'),
+    )
+
+
+def preview_pins(board, size=PREVIEW_SIZE):
+    """The newest `size` pins added to a board from with_previews, its own and saved ones alike"""
+    added = [(pin.created_at, pin) for pin in board.newest_pins]
+    added += [(save.created_at, save.pin) for save in board.newest_saves]
+    added.sort(key=lambda item: item[0], reverse=True)
+    return [pin for _, pin in added[:size]]
+
+
+def boards_for_profile(owner, viewer):
+    """A profile's boards as visible to the viewer, ready for the board grid"""
+    return with_previews(visible_boards(viewer).filter(user=owner))
+
+
+def newest_pin_image():
+    """Image of the pin most recently added to the board, pinned or saved, or ''"""
+    pins = Pin.objects.filter(board=OuterRef('pk')).order_by('-created_at', '-id')
+    saves = PinSave.objects.filter(board=OuterRef('pk')).order_by('-created_at', '-id')
+    pinned_at = Coalesce(Subquery(pins.values('created_at')[:1]), Value(NEVER, output_field=DateTimeField()))
+    saved_at = Coalesce(Subquery(saves.values('created_at')[:1]), Value(NEVER, output_field=DateTimeField()))
+    return Coalesce(
+        Case(
+            When(GreaterThan(saved_at, pinned_at), then=Subquery(saves.values('pin__image_url')[:1])),
+            default=Subquery(pins.values('image_url')[:1]),
+        ),
+        Value(''),
+    )
+
+
+def refresh_covers(board_ids=None):
+    """
+    Point cover_image at each auto_cover board's newest pin (blank when it
+    has none). Only boards whose cover actually changes are written.
+    Returns the number of boards updated.
+    """
+    boards = Board.objects.filter(auto_cover=True)
+    if board_ids is not None:
+        boards = boards.filter(pk__in=board_ids)
+    stale = boards.annotate(newest_image=newest_pin_image()).exclude(cover_image=F('newest_image'))
+    return Board.objects.filter(pk__in=stale.values('pk')).update(
+        cover_image=newest_pin_image(), updated_at=timezone.now()
+    )
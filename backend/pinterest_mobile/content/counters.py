@@ -0,0 +1,118 @@
+from collections import defaultdict
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from .models import Pin, Board, PinSave, CounterDelta
+
+# Counters that are maintained through the delta buffer, per target.
+COUNTERS = {
+    'pin': (Pin, ('like_count', 'save_count', 'comment_count')),
+    'board': (Board, ('pin_count',)),
+}
+FLUSH_BATCH_SIZE = 5000
+
+
+def record(target, object_id, field, delta=1):
+    """
+    Buffer a change to a denormalized counter.
+
+    This is an append-only insert, so concurrent likes on one pin never wait
+    on that pin's row lock. flush() later folds the deltas into the counter.
+    """
+    model, fields = COUNTERS[target]
+    if field not in fields:
+        raise ValueError(f"{model.__name__}.{field} is not a buffered counter.")
+    CounterDelta.objects.create(target=target, object_id=object_id, field=field, delta=delta)
+
+
+def apply_deltas(totals):
+    """Apply {(target, field): {object_id: delta}} as one UPDATE per target and field"""
+    updated = 0
+    for (target, field), deltas in totals.items():
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            continue
+        model = COUNTERS[target][0]
+        change = Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        updated += model.objects.filter(pk__in=deltas.keys()).update(
+            **{field: Greatest(F(field) + change, Value(0))}
+        )
+    return updated
+
+
+def flush(batch_size=FLUSH_BATCH_SIZE):
+    """Fold one batch of buffered deltas into the counters. Returns the number of deltas consumed."""
+    with transaction.atomic():
+        pending = CounterDelta.objects.order_by('created_at')
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent flushers each take a disjoint batch.
+            pending = pending.select_for_update(skip_locked=True)
+        rows = list(pending.values_list('id', 'target', 'object_id', 'field', 'delta')[:batch_size])
+        if not rows:
+            return 0
+
+        totals = defaultdict(lambda: defaultdict(int))
+        for _, target, object_id, field, delta in rows:
+            totals[(target, field)][object_id] += delta
+
+        apply_deltas(totals)
+        CounterDelta.objects.filter(id__in=[row[0] for row in rows]).delete()
+    return len(rows)
+
+
+def flush_all(batch_size=FLUSH_BATCH_SIZE):
+    consumed = 0
+    while True:
+        count = flush(batch_size)
+        consumed += count
+        if count < batch_size:
+            return consumed
+
+
+def count_of(model, fk):
+    """Correlated COUNT(*) subquery of model rows pointing at the outer row"""
+    counts = (
+        model.objects.filter(**{fk: OuterRef('pk')})
+        .order_by()
+        .values(fk)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def reconcile(batch_size=FLUSH_BATCH_SIZE):
+    """Recompute every buffered counter from its source table, in primary key batches"""
+    # Imported here to keep content independent of social at import time.
+    from social.models import PinLike, Comment
+
+    expressions = {
+        Pin: {
+            'like_count': count_of(PinLike, 'pin'),
+            'save_count': count_of(PinSave, 'pin'),
+            'comment_count': count_of(Comment, 'pin'),
+        },
+        Board: {
+            'pin_count': count_of(Pin, 'board') + count_of(PinSave, 'board'),
+        },
+    }
+
+    return {model.__name__: update_in_batches(model, fields, batch_size) for model, fields in expressions.items()}
+
+
+def update_in_batches(model, fields, batch_size=FLUSH_BATCH_SIZE):
+    """Apply update(**fields) to every row of model in primary key batches; returns rows updated"""
+    updated, last_pk = 0, None
+    while True:
+        batch = model.objects.order_by('pk')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return updated
+        updated += model.objects.filter(pk__in=pks).update(**fields)
+        last_pk = pks[-1]
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .models import Pin
+from .images import probe_task
+
+BATCH_SIZE = 200
+FETCH_TIMEOUT = getattr(settings, 'IMAGE_FETCH_TIMEOUT', 10)
+WORKERS = getattr(settings, 'IMAGE_WORKERS', None)  # None = one per CPU
+# BlurHash x/y components; 4x3 is a 28 character hash.
+PLACEHOLDER_COMPONENTS = getattr(settings, 'PLACEHOLDER_COMPONENTS', (4, 3))
+
+MISSING_METADATA = (
+    Q(width__isnull=True) | Q(height__isnull=True) | Q(dominant_color='') | Q(placeholder='')
+)
+FIELDS = ['width', 'height', 'dominant_color', 'placeholder']
+
+
+def pins_missing_metadata(after=None):
+    pins = Pin.objects.filter(MISSING_METADATA).exclude(image_url='')
+    if after is not None:
+        pins = pins.filter(id__gt=after)
+    return pins.order_by('id')
+
+
+def apply_results(pins, results):
+    """
+    Fill only the fields each pin is missing; returns the pins changed.
+    updated_at moves too, so conditional GETs (pinterest_mobile.conditional)
+    stop answering 304 with the payload from before enrichment.
+    """
+    changed = []
+    now = timezone.now()
+    for pin in pins:
+        result = results.get(pin.id)
+        if result is None:
+            continue
+        if pin.width is None or pin.height is None:
+            pin.width, pin.height = result['width'], result['height']
+        if not pin.dominant_color and result['dominant_color']:
+            pin.dominant_color = result['dominant_color']
+        if not pin.placeholder and result['placeholder']:
+            pin.placeholder = result['placeholder']
+        pin.updated_at = now
+        changed.append(pin)
+    Pin.objects.bulk_update(changed, [*FIELDS, 'updated_at'])
+    return changed
+
+
+def extract_missing(executor, batch_size=BATCH_SIZE, limit=None, timeout=FETCH_TIMEOUT,
+                    components=PLACEHOLDER_COMPONENTS, skip=()):
+    """
+    Probe every pin with missing dimensions, color or placeholder, one batch
+    at a time. The image is only decoded when the color or placeholder is
+    missing; dimensions alone need just the header bytes.
+
+    Pins are walked in id order and each is tried once per call, so images
+    that fail to load do not hold up the rest; skip holds pin ids to leave
+    out, e.g. earlier failures in a long-running worker. Returns
+    (updated, failures) where failures is a list of (pin_id, error).
+    """
+    updated, failures, after = 0, [], None
+    while limit is None or updated + len(failures) < limit:
+        size = batch_size if limit is None else min(batch_size, limit - updated - len(failures))
+        pins = list(pins_missing_metadata(after).only('id', 'image_url', *FIELDS)[:size])
+        if not pins:
+            break
+        after = pins[-1].id
+        pins = [pin for pin in pins if pin.id not in skip]
+        tasks = [
+            (pin.id, pin.image_url, not (pin.dominant_color and pin.placeholder), tuple(components), timeout)
+            for pin in pins
+        ]
+        results = {}
+        for pin_id, result, error in executor.map(probe_task, tasks, chunksize=max(1, len(tasks) // 32)):
+            if error:
+                failures.append((pin_id, error))
+            else:
+                results[pin_id] = result
+        updated += len(apply_results(pins, results))
+    return updated, failures
+
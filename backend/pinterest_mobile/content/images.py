@@ -0,0 +1,171 @@
+"""
+Image probing for pin metadata.
+
+Kept free of Django imports: these functions run in worker processes
+started by content.enrichment, which only pass them plain arguments.
+"""
+import io
+import urllib.request
+import numpy as np
+from PIL import Image, ImageFile
+
+CHUNK_SIZE = 4096
+# Enough for JPEGs with large EXIF/ICC blocks in front of the frame header.
+MAX_HEADER_BYTES = 512 * 1024
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+SAMPLE_SIZE = 64
+USER_AGENT = 'pinterest-mobile-image-probe/1.0'
+
+
+class ImageProbeError(Exception):
+    pass
+
+
+def open_source(url, timeout):
+    """Readable binary stream for an http(s) URL, a file:// URL or a local path"""
+    if url.startswith(('http://', 'https://')):
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        return urllib.request.urlopen(request, timeout=timeout)
+    if url.startswith('file://'):
+        url = urllib.request.url2pathname(url[len('file://'):])
+    return open(url, 'rb')
+
+
+def read_header(stream, max_bytes=MAX_HEADER_BYTES):
+    """
+    Read just enough of the stream for Pillow to parse the image header.
+    Returns (width, height, bytes_read).
+    """
+    parser = ImageFile.Parser()
+    data = bytearray()
+    while parser.image is None:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        data += chunk
+        try:
+            parser.feed(chunk)
+        except Exception as e:
+            raise ImageProbeError(f"Unreadable image header: {e}")
+        if parser.image is None and len(data) >= max_bytes:
+            raise ImageProbeError(f"No image header in the first {max_bytes} bytes.")
+    if parser.image is None:
+        raise ImageProbeError("Not a recognized image.")
+    width, height = parser.image.size
+    return width, height, bytes(data)
+
+
+def decode_sample(data, size=SAMPLE_SIZE):
+    """Decode at reduced scale and return an (h, w, 4) RGBA uint8 array"""
+    try:
+        image = Image.open(io.BytesIO(data))
+        # JPEG decodes straight to 1/2, 1/4 or 1/8 scale; others resample after a full decode.
+        image.draft('RGB', (size, size))
+        image = image.convert('RGBA')
+        image.thumbnail((size, size), Image.Resampling.BILINEAR)
+    except Exception as e:
+        raise ImageProbeError(f"Undecodable image: {e}")
+    return np.asarray(image, dtype=np.uint8)
+
+
+def dominant_color(rgba, bits=4):
+    """
+    Hex color of the most populated cell after quantizing each channel to
+    `bits` bits, averaged over the (mostly opaque) pixels in that cell.
+    """
+    pixels = rgba.reshape(-1, 4)
+    opaque = pixels[pixels[:, 3] >= 128, :3]
+    pixels = opaque if len(opaque) else pixels[:, :3]
+    shift = 8 - bits
+    quantized = (pixels >> shift).astype(np.int32)
+    cells = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+    winner = np.bincount(cells, minlength=1 << (3 * bits)).argmax()
+    red, green, blue = np.rint(pixels[cells == winner].mean(axis=0)).astype(int)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+
+def base83(value, length):
+    return ''.join(BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+
+def srgb_to_linear(values):
+    values = values / 255.0
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(value):
+    value = min(max(value, 0.0), 1.0)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(rgba, components=(4, 3)):
+    """
+    BlurHash (https://blurha.sh) of an RGBA sample. The DCT is two small
+    cosine-basis matrices applied to the linear-light image with einsum.
+    """
+    x_components, y_components = components
+    if not (1 <= x_components <= 9 and 1 <= y_components <= 9):
+        raise ValueError("BlurHash components must be between 1 and 9.")
+    linear = srgb_to_linear(rgba[..., :3].astype(np.float64))
+    height, width = linear.shape[:2]
+    basis_x = np.cos(np.pi * np.outer(np.arange(x_components), np.arange(width)) / width)
+    basis_y = np.cos(np.pi * np.outer(np.arange(y_components), np.arange(height)) / height)
+    # factors[j, i] is the (i, j) component; the hash lists them row by row.
+    factors = np.einsum('jy,ix,yxc->jic', basis_y, basis_x, linear) / (width * height)
+    factors = factors.reshape(-1, 3)
+    factors[1:] *= 2
+    dc, ac = factors[0], factors[1:]
+
+    encoded = base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if len(ac):
+        quantized_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximum = (quantized_max + 1) / 166
+        encoded += base83(quantized_max, 1)
+    else:
+        maximum = 1.0
+        encoded += base83(0, 1)
+
+    red, green, blue = (linear_to_srgb(channel) for channel in dc)
+    encoded += base83((red << 16) + (green << 8) + blue, 4)
+
+    scaled = ac / maximum
+    quantized = np.clip(np.floor(np.sign(scaled) * np.sqrt(np.abs(scaled)) * 9 + 9.5), 0, 18).astype(int)
+    for red, green, blue in quantized:
+        encoded += base83(red * 19 * 19 + green * 19 + blue, 2)
+    return encoded
+
+
+def probe(url, decode=True, components=(4, 3), timeout=10, max_bytes=MAX_IMAGE_BYTES):
+    """
+    {'width', 'height', 'dominant_color', 'placeholder'} for one image. Without
+    decode, only the header bytes are read and the last two are None.
+    """
+    with open_source(url, timeout) as stream:
+        width, height, data = read_header(stream)
+        if not decode:
+            return {'width': width, 'height': height, 'dominant_color': None, 'placeholder': None}
+        rest = stream.read(max_bytes - len(data) + 1)
+    data += rest
+    if len(data) > max_bytes:
+        raise ImageProbeError(f"Image is larger than {max_bytes} bytes.")
+    sample = decode_sample(data)
+    return {
+        'width': width,
+        'height': height,
+        'dominant_color': dominant_color(sample),
+        'placeholder': blurhash(sample, components),
+    }
+
+
+def probe_task(task):
+    """Process-pool entry point: (pin_id, url, decode, components, timeout) -> (pin_id, result, error)"""
+    pin_id, url, decode, components, timeout = task
+    try:
+        return pin_id, probe(url, decode, components, timeout), None
+    except (ImageProbeError, OSError, ValueError) as e:
+        return pin_id, None, str(e) or e.__class__.__name__
@@ -0,0 +1,206 @@
+import csv
+import gzip
+import io
+import json
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils.text import slugify
+from user_management.models import User
+from .models import Pin, Board, Category
+from . import boards, counters, search
+
+DEFAULT_BOARD_TITLE = 'Unsplash'
+# Imported accounts are matched on this email domain, never on username
+# alone, so a photographer can't be mapped onto a local account.
+EMAIL_DOMAIN = 'unsplash.invalid'
+USERNAME_PREFIX = 'unsplash_'
+
+
+def open_text(path):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8')
+    return open(path, encoding='utf-8', newline='')
+
+
+def check_columns(columns):
+    """Reject CSV headers where a column is also a prefix of another, e.g. 'user' and 'user.username'"""
+    names = {column for column in columns if column}
+    for column in names:
+        parts = column.split('.')
+        for end in range(1, len(parts)):
+            parent = '.'.join(parts[:end])
+            if parent in names:
+                raise ValueError(f"CSV columns {parent!r} and {column!r} conflict; {parent!r} can't be both a value and a group.")
+
+
+def unflatten(row):
+    """Turn CSV columns like 'urls.regular' into nested dicts like the NDJSON shape; see check_columns"""
+    nested = {}
+    for key, value in row.items():
+        if key is None or value in (None, ''):
+            continue
+        target = nested
+        *parents, leaf = key.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return nested
+
+
+def read_records(path, file_format=None):
+    """Yield Unsplash-shaped photo dicts from an NDJSON or CSV file (optionally .gz), one at a time"""
+    file_format = file_format or ('csv' if path.removesuffix('.gz').endswith('.csv') else 'ndjson')
+    with open_text(path) as handle:
+        if file_format == 'csv':
+            reader = csv.DictReader(handle)
+            check_columns(reader.fieldnames or ())
+            for row in reader:
+                yield unflatten(row)
+        else:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A truncated or corrupt line is counted as skipped, not fatal.
+                    yield {}
+
+
+def to_int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_photo(photo, default_category=None):
+    """Normalize one photo record, or return None if it has no usable image URL"""
+    urls = photo.get('urls') or {}
+    image_url = urls.get('regular') or urls.get('full') or urls.get('raw') or photo.get('url')
+    user = photo.get('user') or {}
+    username = (user.get('username') or '').strip()[:50]
+    if not image_url or not username:
+        return None
+
+    color = (photo.get('color') or '').strip()
+    topic = photo.get('category') or photo.get('topic') or default_category
+    profile_image = user.get('profile_image')
+    if isinstance(profile_image, dict):
+        profile_image = profile_image.get('medium') or profile_image.get('large') or ''
+
+    return {
+        'username': username,
+        'name': (user.get('name') or '').strip(),
+        'profile_image': (profile_image or '')[:500],
+        'category': topic.strip() if isinstance(topic, str) and topic.strip() else None,
+        'title': (photo.get('alt_description') or photo.get('description') or '')[:200],
+        'description': photo.get('description') or '',
+        'image_url': image_url[:500],
+        'original_url': ((photo.get('links') or {}).get('html') or '')[:500],
+        'width': to_int(photo.get('width')),
+        'height': to_int(photo.get('height')),
+        'dominant_color': color if len(color) == 7 and color.startswith('#') else '',
+        'placeholder': (photo.get('blur_hash') or '')[:200],
+    }
+
+
+class Ingestor:
+    """Writes batches of parsed photos as users, boards, categories and pins"""
+
+    def __init__(self, board_title=DEFAULT_BOARD_TITLE):
+        self.board_title = board_title
+        # Lookups are cached across batches; they grow with distinct users
+        # and categories, not with the number of pins.
+        self.user_ids = {}
+        self.board_ids = {}
+        self.category_ids = {}
+
+    def upsert_users(self, photos):
+        missing = {photo['username']: photo for photo in photos if photo['username'] not in self.user_ids}
+        if not missing:
+            return
+        emails = {f"{username}@{EMAIL_DOMAIN}": username for username in missing}
+        found = dict(User.objects.filter(email__in=emails).values_list('email', 'user_id'))
+        new = {email: username for email, username in emails.items() if email not in found}
+        if new:
+            # Usernames held by local accounts get the prefix instead.
+            taken = set(User.objects.filter(username__in=new.values()).values_list('username', flat=True))
+            unusable_password = make_password(None)
+            new_users = []
+            for email, username in new.items():
+                first, _, last = missing[username]['name'].partition(' ')
+                new_users.append(User(
+                    username=(USERNAME_PREFIX + username)[:50] if username in taken else username,
+                    email=email,
+                    first_name=first[:50],
+                    last_name=last[:50],
+                    profile_image=missing[username]['profile_image'],
+                    password=unusable_password,
+                ))
+            User.objects.bulk_create(new_users, ignore_conflicts=True)
+            found.update(User.objects.filter(email__in=new).values_list('email', 'user_id'))
+        self.user_ids.update({username: found[email] for email, username in emails.items() if email in found})
+
+    def upsert_boards(self, photos):
+        user_ids = {self.user_ids[photo['username']] for photo in photos} - set(self.board_ids)
+        if not user_ids:
+            return
+        boards = Board.objects.filter(user_id__in=user_ids, title=self.board_title)
+        existing = set(boards.values_list('user_id', flat=True))
+        Board.objects.bulk_create([
+            Board(user_id=user_id, title=self.board_title)
+            for user_id in user_ids if user_id not in existing
+        ])
+        # Newest first, so the oldest board wins if a user has several.
+        self.board_ids.update(boards.order_by('-created_at').values_list('user_id', 'id'))
+
+    def upsert_categories(self, photos):
+        names = {photo['category'] for photo in photos if photo['category']} - set(self.category_ids)
+        if not names:
+            return
+        slugs = {name: slugify(name)[:100] for name in names}
+        Category.objects.bulk_create(
+            [Category(name=name[:100], slug=slug) for name, slug in slugs.items() if slug],
+            ignore_conflicts=True,
+        )
+        by_slug = dict(Category.objects.filter(slug__in=slugs.values()).values_list('slug', 'id'))
+        self.category_ids.update({name: by_slug.get(slug) for name, slug in slugs.items()})
+
+    def write(self, photos):
+        """Write one batch atomically; returns the number of pins created"""
+        with transaction.atomic():
+            self.upsert_users(photos)
+            # A photographer whose prefixed username is taken too has no account.
+            photos = [photo for photo in photos if photo['username'] in self.user_ids]
+            self.upsert_boards(photos)
+            self.upsert_categories(photos)
+
+            pins = []
+            for photo in photos:
+                user_id = self.user_ids[photo['username']]
+                pins.append(Pin(
+                    user_id=user_id,
+                    board_id=self.board_ids[user_id],
+                    category_id=self.category_ids.get(photo['category']),
+                    title=photo['title'],
+                    description=photo['description'],
+                    image_url=photo['image_url'],
+                    original_url=photo['original_url'],
+                    width=photo['width'],
+                    height=photo['height'],
+                    dominant_color=photo['dominant_color'],
+                    placeholder=photo['placeholder'],
+                ))
+            Pin.objects.bulk_create(pins)
+
+            # bulk_create skips the post_save signals, so keep the board
+            # counters, covers and the search index in step here.
+            board_counts = {}
+            for pin in pins:
+                board_counts[pin.board_id] = board_counts.get(pin.board_id, 0) + 1
+            counters.apply_deltas({('board', 'pin_count'): board_counts})
+            boards.refresh_covers(list(board_counts))
+            search.index_pins(Pin.objects.filter(pk__in=[pin.pk for pin in pins]))
+        return len(pins)
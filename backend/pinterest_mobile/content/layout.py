@@ -0,0 +1,121 @@
+import numpy as np
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+# Defaults match the two-column grid in the mobile home screen.
+DEFAULT_COLUMNS = 2
+MAX_COLUMNS = 6
+DEFAULT_VIEWPORT_WIDTH = 390
+MAX_VIEWPORT_WIDTH = 4096
+PADDING = 12
+GUTTER = 12
+MIN_TILE_HEIGHT = 150
+MAX_TILE_HEIGHT = 400
+DEFAULT_ASPECT_RATIO = 1.5  # height / width when a pin has no dimensions
+
+
+def column_width(columns, viewport_width, padding=PADDING, gutter=GUTTER):
+    return (viewport_width - 2 * padding - (columns - 1) * gutter) / columns
+
+
+def tile_heights(pins, width):
+    """Scaled image heights for every pin at once, clamped like the mobile grid"""
+    dims = np.array([(pin.width or 0, pin.height or 0) for pin in pins], dtype=np.float64).reshape(-1, 2)
+    known = (dims[:, 0] > 0) & (dims[:, 1] > 0)
+    ratios = np.full(len(dims), DEFAULT_ASPECT_RATIO)
+    ratios[known] = dims[known, 1] / dims[known, 0]
+    return np.clip(np.rint(width * ratios), MIN_TILE_HEIGHT, MAX_TILE_HEIGHT).astype(np.int64)
+
+
+def masonry_layout(pins, columns=DEFAULT_COLUMNS, viewport_width=DEFAULT_VIEWPORT_WIDTH, column_heights=None, footer_height=0):
+    """
+    Greedy shortest-column placement for one page of pins.
+
+    Passing the column heights returned for the previous page continues the
+    same layout, so tiles never move when the next page is appended.
+    Returns (placements, column_heights).
+    """
+    width = column_width(columns, viewport_width)
+    heights = tile_heights(pins, width) + footer_height
+    columns_y = np.zeros(columns, dtype=np.int64)
+    if column_heights is not None:
+        columns_y[:] = column_heights
+
+    column_x = np.rint(PADDING + np.arange(columns) * (width + GUTTER)).astype(np.int64)
+    placements = []
+    for height in heights:
+        column = int(np.argmin(columns_y))
+        placements.append({
+            'column': column,
+            'x': int(column_x[column]),
+            'y': int(columns_y[column]),
+            'width': int(round(width)),
+            'height': int(height),
+        })
+        columns_y[column] += height + GUTTER
+    return placements, [int(y) for y in columns_y]
+
+
+def parse_int(params, name, default, low, high):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: f"Must be an integer between {low} and {high}."})
+    if not low <= value <= high:
+        raise ValidationError({name: f"Must be an integer between {low} and {high}."})
+    return value
+
+
+def parse_layout_params(params):
+    """Layout options from query params, or None when masonry mode isn't requested"""
+    if params.get('layout') != 'masonry':
+        return None
+
+    columns = parse_int(params, 'columns', DEFAULT_COLUMNS, 1, MAX_COLUMNS)
+    viewport_width = parse_int(params, 'viewport_width', DEFAULT_VIEWPORT_WIDTH, 2 * PADDING + columns * 10, MAX_VIEWPORT_WIDTH)
+    footer_height = parse_int(params, 'footer_height', 0, 0, 1000)
+
+    column_heights = None
+    raw = params.get('column_heights')
+    if raw:
+        try:
+            column_heights = [int(y) for y in raw.split(',')]
+        except ValueError:
+            raise ValidationError({'column_heights': "Must be a comma-separated list of integers."})
+        if len(column_heights) != columns or min(column_heights) < 0:
+            raise ValidationError({'column_heights': f"Must contain {columns} non-negative integers."})
+
+    return {
+        'columns': columns,
+        'viewport_width': viewport_width,
+        'column_heights': column_heights,
+        'footer_height': footer_height,
+    }
+
+
+class MasonryLayoutMixin:
+    """
+    Adds ?layout=masonry to a paginated pin list view.
+
+    Each pin gets a ``layout`` block with its column and offsets, and the next
+    link carries ``column_heights`` so the following page continues the grid.
+    """
+    def get_paginated_response(self, data):
+        options = parse_layout_params(self.request.query_params)
+        if options is None:
+            return super().get_paginated_response(data)
+
+        placements, heights = masonry_layout(self.paginator.page, **options)
+        for item, placement in zip(data, placements):
+            item['layout'] = placement
+
+        response = super().get_paginated_response(data)
+        response.data['column_heights'] = heights
+        if response.data.get('next'):
+            response.data['next'] = replace_query_param(
+                response.data['next'], 'column_heights', ','.join(str(y) for y in heights)
+            )
+        return response
@@ -0,0 +1,73 @@
+import itertools
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from content.models import Pin
+from content.projections import PIN_FIELDS
+from content.serializers import PinSerializer
+from pinterest_mobile.benchmark import summarize
+
+
+def page_of(items, size):
+    """size items, repeating the available ones if the table is smaller"""
+    return list(itertools.islice(itertools.cycle(items), size))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare pin page serialization throughput: PinSerializer (ModelSerializer) against the "
+        "PIN_FIELDS projection, with and without the query, for several page sizes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 500])
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+
+    def handle(self, *args, **options):
+        newest = Pin.objects.order_by('-created_at', '-id')
+        max_size = max(options['sizes'])
+        instances = list(newest.select_related('user')[:max_size])
+        rows = list(PIN_FIELDS.rows(newest)[:max_size])
+        if not instances:
+            raise CommandError("No pins to serialize; load some first (e.g. manage.py ingest_pins).")
+        renderer = JSONRenderer()
+
+        results = []
+        for size in options['sizes']:
+            page_instances, page_rows = page_of(instances, size), page_of(rows, size)
+            cases = {
+                'model_serializer': lambda: renderer.render(PinSerializer(page_instances, many=True).data),
+                'projection': lambda: renderer.render(PIN_FIELDS.serialize(page_rows)),
+                'model_serializer_with_query': lambda: renderer.render(
+                    PinSerializer(list(newest.select_related('user')[:size]), many=True).data
+                ),
+                'projection_with_query': lambda: renderer.render(
+                    PIN_FIELDS.serialize(list(PIN_FIELDS.rows(newest)[:size]))
+                ),
+            }
+            if cases['model_serializer']() != cases['projection']():
+                raise CommandError("Projection output differs from PinSerializer output.")
+
+            runs = {name: self.time(case, options) for name, case in cases.items()}
+            for name, run in runs.items():
+                run['pins_per_s'] = round(run['throughput_per_s'] * size, 1)
+            runs['speedup'] = round(runs['model_serializer']['mean_ms'] / runs['projection']['mean_ms'], 2)
+            runs['speedup_with_query'] = round(
+                runs['model_serializer_with_query']['mean_ms'] / runs['projection_with_query']['mean_ms'], 2
+            )
+            results.append({'page_size': size, 'pins_in_table': min(len(instances), size), **runs})
+
+        self.stdout.write(json.dumps({'benchmark': 'pin_serialization', 'pages': results}, indent=2))
+
+    def time(self, case, options):
+        for _ in range(options['warmup']):
+            case()
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(options['iterations']):
+            start = time.perf_counter()
+            case()
+            latencies.append(time.perf_counter() - start)
+        return summarize(latencies, time.perf_counter() - started)
@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from content import enrichment
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in missing Pin width, height, dominant_color and BlurHash placeholder by "
+        "probing image_url (http(s), file:// or a local path) in a process pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=enrichment.WORKERS, help="Worker processes (default: one per CPU).")
+        parser.add_argument('--batch-size', type=int, default=enrichment.BATCH_SIZE)
+        parser.add_argument('--limit', type=int, help="Stop after this many pins.")
+        parser.add_argument('--timeout', type=float, default=enrichment.FETCH_TIMEOUT, help="Seconds per image fetch.")
+        parser.add_argument('--components', type=int, nargs=2, default=enrichment.PLACEHOLDER_COMPONENTS,
+                            metavar=('X', 'Y'), help="BlurHash components across and down (1-9 each).")
+        parser.add_argument('--loop', action='store_true', help="Keep picking up new pins until interrupted.")
+        parser.add_argument('--interval', type=float, default=60.0, help="Seconds to sleep between passes with --loop.")
+
+    def handle(self, *args, **options):
+        # Pins that failed are not retried within one run of the worker.
+        failed = set()
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                started = time.perf_counter()
+                updated, failures = enrichment.extract_missing(
+                    executor,
+                    batch_size=options['batch_size'],
+                    limit=options['limit'],
+                    timeout=options['timeout'],
+                    components=options['components'],
+                    skip=failed,
+                )
+                failed.update(pin_id for pin_id, _ in failures)
+                for pin_id, error in failures[:20]:
+                    self.stderr.write(f"Pin {pin_id}: {error}")
+                if updated or failures or not options['loop']:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(f"Updated {updated} pins, {len(failures)} failed in {elapsed:.1f}s.")
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from content import counters
+
+
+class Command(BaseCommand):
+    help = "Apply buffered like/save/comment/pin counter deltas in batched F() updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=counters.FLUSH_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep flushing until interrupted.")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds to sleep between flushes with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            consumed = counters.flush_all(options['batch_size'])
+            if consumed or not options['loop']:
+                self.stdout.write(f"Applied {consumed} counter deltas.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
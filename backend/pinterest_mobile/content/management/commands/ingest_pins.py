@@ -0,0 +1,57 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from content.ingest import DEFAULT_BOARD_TITLE, Ingestor, parse_photo, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream Unsplash-shaped photos from NDJSON or CSV (optionally gzipped) into users, boards, "
+        "categories and pins with batched bulk_create. CSV columns use dotted names, e.g. urls.regular, "
+        "user.username. Run rebuild_timelines afterwards to fan the new pins out to followers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--board-title', default=DEFAULT_BOARD_TITLE, help="Board each user's pins are written to.")
+        parser.add_argument('--category', help="Category for records without a category/topic field.")
+        parser.add_argument('--limit', type=int, help="Stop after this many pins.")
+        parser.add_argument('--progress-every', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        ingestor = Ingestor(board_title=options['board_title'])
+        batch_size = options['batch_size']
+        limit = options['limit']
+        written = skipped = reported = 0
+        batch = []
+        started = time.perf_counter()
+
+        try:
+            records = read_records(options['path'], options['format'])
+            for record in records:
+                photo = parse_photo(record, options['category'])
+                if photo is None:
+                    skipped += 1
+                    continue
+                batch.append(photo)
+                if limit is not None and written + len(batch) >= limit:
+                    break
+                if len(batch) >= batch_size:
+                    written += ingestor.write(batch)
+                    batch = []
+                    if written - reported >= options['progress_every']:
+                        reported = written
+                        self.report(written, skipped, started)
+            if batch:
+                written += ingestor.write(batch)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Ingest stopped after {written} pins: {e}")
+
+        self.report(written, skipped, started, style=self.style.SUCCESS)
+
+    def report(self, written, skipped, started, style=None):
+        elapsed = time.perf_counter() - started
+        rate = written / elapsed if elapsed else 0
+        message = f"{written} pins written, {skipped} records skipped in {elapsed:.1f}s ({rate:,.0f} rows/sec)."
+        self.stdout.write(style(message) if style else message)
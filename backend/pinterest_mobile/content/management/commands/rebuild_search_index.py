@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from content.models import Pin
+from content import search
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vector of every pin."
+
+    def handle(self, *args, **options):
+        backend = search.get_backend()
+        indexed = backend.index(Pin.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} pins with {type(backend).__name__}."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from content import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Pin like/save/comment counts and Board pin counts from the source tables. "
+        "Pending deltas are flushed first; run it while writes are quiet for an exact result."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=counters.FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        flushed = counters.flush_all(options['batch_size'])
+        self.stdout.write(f"Flushed {flushed} pending counter deltas.")
+        for model, count in counters.reconcile(options['batch_size']).items():
+            self.stdout.write(f"Reconciled {count} {model} rows.")
+        self.stdout.write(self.style.SUCCESS("Counters reconciled."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from content import boards
+
+
+class Command(BaseCommand):
+    help = "Point every auto_cover board's cover_image at its newest pin or save; only boards whose cover changed are written."
+
+    def handle(self, *args, **options):
+        updated = boards.refresh_covers()
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} board covers."))
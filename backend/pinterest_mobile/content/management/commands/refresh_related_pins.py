@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from content import related
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute top-K related pins from co-like/co-save cosine similarity. By default only pins "
+        "with likes or saves since the last run are refreshed; --full redoes every pin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute every pin and drop stale neighbours.")
+        parser.add_argument('--top-k', type=int, default=related.TOP_K)
+        parser.add_argument('--batch-size', type=int, default=related.BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep refreshing incrementally until interrupted.")
+        parser.add_argument('--interval', type=float, default=900.0, help="Seconds to sleep between refreshes with --loop.")
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            started = time.perf_counter()
+            pins, rows = related.refresh(full=full, top_k=options['top_k'], batch_size=options['batch_size'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Refreshed related pins for {pins} pins ({rows} neighbours) in {elapsed:.1f}s.")
+            if not options['loop']:
+                return
+            full = False
+            time.sleep(options['interval'])
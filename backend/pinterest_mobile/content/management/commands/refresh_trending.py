@@ -0,0 +1,19 @@
+import time
+from django.core.management.base import BaseCommand
+from content import trending
+
+
+class Command(BaseCommand):
+    help = "Fold recent likes, saves and comments into decayed trending scores and rebuild the top-N lists."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep refreshing until interrupted.")
+        parser.add_argument('--interval', type=float, default=300.0, help="Seconds to sleep between refreshes with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            touched, pruned = trending.refresh()
+            self.stdout.write(f"Scored {touched} active pins, pruned {pruned} cold pins.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
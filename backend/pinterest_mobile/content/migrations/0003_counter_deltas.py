@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:08
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounterDelta',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('pin', 'Pin'), ('board', 'Board')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('field', models.CharField(max_length=30)),
+                ('delta', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'counter_deltas',
+                'indexes': [models.Index(fields=['created_at'], name='counter_del_created_e0bc78_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:09
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0003_counter_deltas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingList',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('scope', models.CharField(max_length=50, unique=True)),
+                ('pin_ids', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'trending_lists',
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('pin', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='content.pin')),
+                ('score', models.FloatField(default=0)),
+                ('scored_at', models.DateTimeField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'trending_scores',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='pin',
+            name='pins_like_co_c506c7_idx',
+        ),
+        migrations.AddField(
+            model_name='trendingscore',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trending_scores', to='content.category'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['-rank'], name='trending_sc_rank_ce596e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['category', '-rank'], name='trending_sc_categor_ca0228_idx'),
+        ),
+    ]
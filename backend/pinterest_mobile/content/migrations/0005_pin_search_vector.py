@@ -0,0 +1,32 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:10
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; other databases use the
+    # in-memory search backend and don't read this column.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS pins_search_vector_gin ON pins USING gin (search_vector)')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS pins_search_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0004_trending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
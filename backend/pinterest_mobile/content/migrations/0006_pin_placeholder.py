@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0005_pin_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='placeholder',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+    ]
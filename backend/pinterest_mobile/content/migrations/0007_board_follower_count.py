@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0006_pin_placeholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
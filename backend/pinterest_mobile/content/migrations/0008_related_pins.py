@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:24
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0007_board_follower_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPin',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('pin', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_pins', to='content.pin')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_from', to='content.pin')),
+            ],
+            options={
+                'db_table': 'related_pins',
+                'indexes': [models.Index(fields=['pin', '-score'], name='related_pin_pin_id_fbb5be_idx'), models.Index(fields=['computed_at'], name='related_pin_compute_f37cb2_idx')],
+                'unique_together': {('pin', 'related')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:40
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def mark_chosen_covers(apps, schema_editor):
+    # A cover that is not the image of any pin on the board was picked by hand.
+    Board = apps.get_model('content', 'Board')
+    Pin = apps.get_model('content', 'Pin')
+    PinSave = apps.get_model('content', 'PinSave')
+    own = Pin.objects.filter(board=OuterRef('pk'), image_url=OuterRef('cover_image'))
+    saved = PinSave.objects.filter(board=OuterRef('pk'), pin__image_url=OuterRef('cover_image'))
+    Board.objects.exclude(cover_image='').filter(~Exists(own), ~Exists(saved)).update(auto_cover=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0008_related_pins'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='auto_cover',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(mark_chosen_covers, migrations.RunPython.noop),
+    ]
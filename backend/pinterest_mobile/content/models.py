@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 import uuid
 
@@ -31,10 +32,12 @@ class Board(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     cover_image = models.URLField(max_length=500, blank=True)
+    auto_cover = models.BooleanField(default=True)  # Cover follows the newest pin until one is chosen
     is_private = models.BooleanField(default=False)
 
     color_theme = models.CharField(max_length=7, default='#000000')
     pin_count = models.PositiveIntegerField(default=0)
+    follower_count = models.PositiveIntegerField(default=0)  # Maintained by social.follow_counts
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -49,7 +52,7 @@ class Board(models.Model):
         ordering = ['-updated_at']
     
     def __str__(self):
-        return f"{self.user.username} - {self.title}"
+        return self.title
 
 class Pin(models.Model):
     """Main pin model"""
@@ -83,12 +86,17 @@ class Pin(models.Model):
     
     # Mobile-specific fields
     dominant_color = models.CharField(max_length=7, blank=True)  # For blur/loading effects
+    placeholder = models.CharField(max_length=200, blank=True)  # BlurHash, see content.images
     is_video = models.BooleanField(default=False)
     
     # Engagement counts (denormalized for performance)
     like_count = models.PositiveIntegerField(default=0)
     save_count = models.PositiveIntegerField(default=0)
     comment_count = models.PositiveIntegerField(default=0)
+
+    # Weighted title/description/board/category text, maintained by content.search.
+    # GIN-indexed on PostgreSQL (see migration 0005_pin_search_vector).
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -100,12 +108,11 @@ class Pin(models.Model):
             models.Index(fields=['board']),
             models.Index(fields=['category']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['-like_count']),  # For trending
         ]
         ordering = ['-created_at']
     
     def __str__(self):
-        return self.title or f"Pin by {self.user.username}"
+        return self.title or f"Pin {self.pk}"
 
 class PinSave(models.Model):
     """When users save pins to their boards"""
@@ -139,4 +146,102 @@ class PinSave(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.user.username} saved pin to {self.board.title}"
\ No newline at end of file
+        return f"{self.user_id} saved pin {self.pin_id} to board {self.board_id}"
+
+class CounterDelta(models.Model):
+    """Pending change to a denormalized counter, applied in batches by flush_counters"""
+    TARGET_CHOICES = [
+        ('pin', 'Pin'),
+        ('board', 'Board'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    target = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    object_id = models.UUIDField()
+    field = models.CharField(max_length=30)
+    delta = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'counter_deltas'
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.target}.{self.field} {self.delta:+d} on {self.object_id}"
+
+
+class TrendingScore(models.Model):
+    """Time-decayed engagement score for a pin with recent activity"""
+    pin = models.OneToOneField(
+        Pin,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending_score'
+    )
+    # Copied from the pin so per-category rankings are a single index scan
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trending_scores'
+    )
+    score = models.FloatField(default=0)  # Decayed to scored_at
+    scored_at = models.DateTimeField()
+    # log2(score) + half-lives since the trending epoch; ordering by rank is
+    # ordering by the current decayed score, without rewriting idle rows.
+    rank = models.FloatField()
+
+    class Meta:
+        db_table = 'trending_scores'
+        indexes = [
+            models.Index(fields=['-rank']),
+            models.Index(fields=['category', '-rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.pin_id} trending rank {self.rank:.3f}"
+
+class TrendingList(models.Model):
+    """Precomputed top-N trending pin ids, globally or for one category"""
+    GLOBAL_SCOPE = 'global'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    scope = models.CharField(max_length=50, unique=True)  # 'global' or a category id
+    pin_ids = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'trending_lists'
+
+    def __str__(self):
+        return f"Trending {self.scope} ({len(self.pin_ids)} pins)"
+
+class RelatedPin(models.Model):
+    """One of a pin's top-K neighbours by co-like/co-save cosine similarity, see content.related"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    pin = models.ForeignKey(
+        Pin,
+        on_delete=models.CASCADE,
+        related_name='related_pins'
+    )
+    related = models.ForeignKey(
+        Pin,
+        on_delete=models.CASCADE,
+        related_name='related_from'
+    )
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'related_pins'
+        unique_together = ('pin', 'related')
+        indexes = [
+            models.Index(fields=['pin', '-score']),
+            models.Index(fields=['computed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.pin_id} ~ {self.related_id} ({self.score:.3f})"
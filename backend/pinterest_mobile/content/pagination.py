@@ -0,0 +1,133 @@
+import base64
+import binascii
+import uuid
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_filter(queryset, position, fields=('created_at', 'id')):
+    """Restrict a newest-first queryset to rows strictly after a cursor position"""
+    if position is None:
+        return queryset
+    created_field, pk_field = fields
+    created_at, pk = position
+    return queryset.filter(
+        Q(**{f'{created_field}__lt': created_at}) |
+        Q(**{created_field: created_at, f'{pk_field}__lt': pk})
+    )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over (created_at, id), newest first.
+
+    The cursor is the position of the last row on the current page, so the
+    next page is a range read on the created_at index instead of an OFFSET
+    scan, and pins inserted mid-scroll never shift the following pages.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    cursor_fields = ('created_at', 'id')
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        position = self.prepare(request)
+        queryset = keyset_filter(queryset.order_by(*self.ordering), position, self.cursor_fields)
+        # Fetch one extra row to know whether there is a next page.
+        return self.paginate_rows(list(queryset[:self.page_size + 1]))
+
+    def prepare(self, request):
+        """Read page size and cursor position from the request"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        return self.decode_cursor(request)
+
+    def paginate_rows(self, rows):
+        """Cut an already ordered list of up to page_size + 1 rows into the page"""
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            timestamp, pk = decoded.split('|', 1)
+            created_at = parse_datetime(timestamp)
+            pk = uuid.UUID(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def encode_cursor(self, row):
+        created_field, pk_field = self.cursor_fields
+        raw = f"{getattr(row, created_field).isoformat()}|{getattr(row, pk_field)}"
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def get_next_cursor(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.get_next_cursor(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor returned as next_cursor by the previous page.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
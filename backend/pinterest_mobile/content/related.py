@@ -0,0 +1,174 @@
+"""
+"More like this": item-item cosine similarity over co-likes and co-saves.
+
+The user x pin engagement matrix is held as two compressed sparse layouts
+(rows by user, rows by pin) in plain NumPy arrays. Neighbours for a batch
+of pins are one sparse product, pins -> engaging users -> their other pins,
+expanded with np.repeat and summed per (pin, neighbour) with np.unique and
+np.bincount. Each pin's top-K neighbours are stored in RelatedPin, so
+reading them back is a single range scan of the (pin, -score) index.
+"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from .models import Pin, PinSave, RelatedPin
+from .projections import PIN_FIELDS
+
+TOP_K = getattr(settings, 'RELATED_PINS_TOP_K', 20)
+WEIGHTS = getattr(settings, 'RELATED_PINS_WEIGHTS', {'like': 1.0, 'save': 2.0})
+# Caps on the expansion: only a user's most recent pins and a pin's most
+# recent engagers take part, which bounds the work per pin.
+MAX_PINS_PER_USER = getattr(settings, 'RELATED_PINS_MAX_PINS_PER_USER', 500)
+MAX_USERS_PER_PIN = getattr(settings, 'RELATED_PINS_MAX_USERS_PER_PIN', 2000)
+BATCH_SIZE = 500
+
+
+def rank_within(groups):
+    """0-based position of each element within its run of equal, already sorted group ids"""
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    lengths = np.diff(np.r_[starts, len(groups)])
+    return np.arange(len(groups)) - np.repeat(starts, lengths)
+
+
+def gather(indptr, rows):
+    """Positions of every stored entry of the given rows of a compressed layout, and their row's index in rows"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owners = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths), owners
+
+
+def compress(rows, cols, data, n_rows, cap):
+    """CSR-style (indptr, cols, data) keeping the first `cap` entries of each row in input order"""
+    order = np.argsort(rows, kind='stable')
+    rows, cols, data = rows[order], cols[order], data[order]
+    keep = rank_within(rows) < cap if len(rows) else np.ones(0, dtype=bool)
+    rows, cols, data = rows[keep], cols[keep], data[keep]
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols, data
+
+
+class EngagementMatrix:
+    """Sparse user x pin matrix of like/save weights over public pins"""
+
+    def __init__(self):
+        from social.models import PinLike
+
+        user_index, pin_index = {}, {}
+        users, pins, weights = [], [], []
+        for model, weight in ((PinLike, WEIGHTS['like']), (PinSave, WEIGHTS['save'])):
+            rows = (
+                model.objects.filter(pin__board__is_private=False)
+                .order_by('-created_at')
+                .values_list('user_id', 'pin_id')
+            )
+            for user_id, pin_id in rows.iterator(chunk_size=5000):
+                users.append(user_index.setdefault(user_id, len(user_index)))
+                pins.append(pin_index.setdefault(pin_id, len(pin_index)))
+                weights.append(weight)
+
+        self.pin_ids = list(pin_index)
+        self.pin_index = pin_index
+        n_users, n_pins = len(user_index), len(pin_index)
+
+        # A user who liked and saved a pin counts once, with the summed weight.
+        users = np.array(users, dtype=np.int64)
+        pins = np.array(pins, dtype=np.int64)
+        keys, first, inverse = np.unique(users * max(n_pins, 1) + pins, return_index=True, return_inverse=True)
+        weights = np.bincount(inverse, weights=np.array(weights, dtype=np.float64))
+        # np.unique sorts by key; put entries back in most-recent-first order for the caps.
+        order = np.argsort(first, kind='stable')
+        users, pins, weights = users[first][order], pins[first][order], weights[order]
+
+        self.by_user = compress(users, pins, weights, n_users, MAX_PINS_PER_USER)
+        self.by_pin = compress(pins, users, weights, n_pins, MAX_USERS_PER_PIN)
+        self.norms = np.sqrt(np.bincount(pins, weights=weights ** 2, minlength=n_pins))
+
+    def neighbours(self, targets, top_k=TOP_K):
+        """(target, neighbour, cosine) index arrays with at most top_k neighbours per target"""
+        user_ptr, user_pins, user_weights = self.by_user
+        pin_ptr, pin_users, pin_weights = self.by_pin
+
+        positions, owners = gather(pin_ptr, targets)
+        users, first_weights = pin_users[positions], pin_weights[positions]
+        positions, via = gather(user_ptr, users)
+        target_rows = owners[via]
+        products = first_weights[via] * user_weights[positions]
+        neighbour_rows = user_pins[positions]
+
+        n_pins = len(self.norms)
+        keys, inverse = np.unique(target_rows * n_pins + neighbour_rows, return_inverse=True)
+        dots = np.bincount(inverse, weights=products)
+        target_rows, neighbour_rows = keys // n_pins, keys % n_pins
+        target_pins = targets[target_rows]
+        scores = dots / (self.norms[target_pins] * self.norms[neighbour_rows])
+
+        other = neighbour_rows != target_pins
+        target_pins, neighbour_rows, scores = target_pins[other], neighbour_rows[other], scores[other]
+        order = np.lexsort((-scores, target_pins))
+        target_pins, neighbour_rows, scores = target_pins[order], neighbour_rows[order], scores[order]
+        top = rank_within(target_pins) < top_k if len(target_pins) else np.ones(0, dtype=bool)
+        return target_pins[top], neighbour_rows[top], scores[top]
+
+
+def store(matrix, targets, now, top_k=TOP_K):
+    """Replace the stored neighbours of one batch of pins"""
+    target_pins, neighbour_rows, scores = matrix.neighbours(targets, top_k)
+    rows = [
+        RelatedPin(
+            pin_id=matrix.pin_ids[target],
+            related_id=matrix.pin_ids[neighbour],
+            score=round(float(score), 6),
+            computed_at=now,
+        )
+        for target, neighbour, score in zip(target_pins.tolist(), neighbour_rows.tolist(), scores.tolist())
+    ]
+    with transaction.atomic():
+        RelatedPin.objects.filter(pin_id__in=[matrix.pin_ids[target] for target in targets.tolist()]).delete()
+        RelatedPin.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def pins_with_activity(since):
+    from social.models import PinLike
+
+    pin_ids = set(PinLike.objects.filter(created_at__gt=since).values_list('pin_id', flat=True))
+    pin_ids.update(PinSave.objects.filter(created_at__gt=since).values_list('pin_id', flat=True))
+    return pin_ids
+
+
+def refresh(full=False, now=None, top_k=TOP_K, batch_size=BATCH_SIZE):
+    """
+    Recompute related pins. Incremental runs only redo pins liked or saved
+    since the previous run; a full run redoes every pin with engagement and
+    also clears neighbours left over from removed likes and saves.
+    Returns (pins refreshed, neighbour rows written).
+    """
+    now = now or timezone.now()
+    since = None if full else RelatedPin.objects.aggregate(last=Max('computed_at'))['last']
+    matrix = EngagementMatrix()
+
+    if since is None:
+        targets = np.arange(len(matrix.pin_ids), dtype=np.int64)
+    else:
+        active = pins_with_activity(since)
+        targets = np.array(sorted(matrix.pin_index[pk] for pk in active if pk in matrix.pin_index), dtype=np.int64)
+
+    written = 0
+    for start in range(0, len(targets), batch_size):
+        written += store(matrix, targets[start:start + batch_size], now, top_k)
+    if since is None:
+        RelatedPin.objects.filter(computed_at__lt=now).delete()
+    return len(targets), written
+
+
+def related_pins(pin, limit=TOP_K):
+    """A pin's stored neighbours as PIN_FIELDS rows, most similar first, in one indexed query"""
+    return list(PIN_FIELDS.rows(
+        Pin.objects.filter(related_from__pin=pin, board__is_private=False)
+        .order_by('-related_from__score')[:limit]
+    ))
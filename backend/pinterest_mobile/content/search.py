@@ -0,0 +1,183 @@
+import math
+import re
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, OuterRef, Subquery
+from .models import Pin, Board, Category
+from .projections import PIN_FIELDS
+
+SEARCH_CONFIG = getattr(settings, 'SEARCH_CONFIG', 'english')
+BATCH_SIZE = 1000
+
+# Field weights, as in PostgreSQL's default ts_rank weights for A, B and C.
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2}
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'the', 'to', 'with',
+}
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def pin_documents(queryset):
+    """(pin_id, title, description, board title, category name) for public pins"""
+    return (
+        queryset.filter(board__is_private=False)
+        .values_list('id', 'title', 'description', 'board__title', 'category__name')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+
+class PostgresSearchBackend:
+    """Ranked search over the stored, GIN-indexed Pin.search_vector column"""
+
+    def vector(self):
+        """tsvector expression for a Pin row, pulling board and category text through subqueries"""
+        board_title = Subquery(Board.objects.filter(pk=OuterRef('board_id')).order_by().values('title')[:1])
+        category_name = Subquery(Category.objects.filter(pk=OuterRef('category_id')).order_by().values('name')[:1])
+        return (
+            SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+            SearchVector('description', weight='B', config=SEARCH_CONFIG) +
+            SearchVector(board_title, weight='C', config=SEARCH_CONFIG) +
+            SearchVector(category_name, weight='C', config=SEARCH_CONFIG)
+        )
+
+    def index(self, queryset):
+        indexed = 0
+        pin_ids = list(queryset.values_list('id', flat=True))
+        for start in range(0, len(pin_ids), BATCH_SIZE):
+            batch = pin_ids[start:start + BATCH_SIZE]
+            indexed += Pin.objects.filter(pk__in=batch).update(search_vector=self.vector())
+        return indexed
+
+    def remove(self, pin_ids):
+        Pin.objects.filter(pk__in=pin_ids).update(search_vector=None)
+
+    def search(self, text, limit, offset=0):
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return list(
+            Pin.objects.filter(search_vector=query, board__is_private=False)
+            .annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', '-created_at', '-id')
+            .values_list('id', flat=True)[offset:offset + limit]
+        )
+
+
+class InMemorySearchBackend:
+    """
+    Inverted index held in process memory, for SQLite and test deployments.
+
+    Built from the database on first use and kept current by the content
+    signals in this process. Matches every query term, ranked by weighted
+    tf-idf, so results line up with the PostgreSQL backend.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = defaultdict(dict)  # term -> {pin_id: weight}
+        self.documents = {}  # pin_id -> set of terms
+        self.built = False
+
+    def tokenize(self, text):
+        return [token for token in TOKEN_RE.findall((text or '').lower()) if token not in STOPWORDS]
+
+    def ensure_built(self):
+        if self.built:
+            return
+        with self.lock:
+            if not self.built:
+                for document in pin_documents(Pin.objects.all()):
+                    self.add(*document)
+                self.built = True
+
+    def add(self, pin_id, title, description, board_title, category_name):
+        weights = defaultdict(float)
+        for text, weight in ((title, 'A'), (description, 'B'), (board_title, 'C'), (category_name, 'C')):
+            for token in self.tokenize(text):
+                weights[token] += WEIGHTS[weight]
+        self.discard(pin_id)
+        for token, weight in weights.items():
+            self.postings[token][pin_id] = weight
+        self.documents[pin_id] = set(weights)
+
+    def discard(self, pin_id):
+        for token in self.documents.pop(pin_id, ()):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(pin_id, None)
+                if not postings:
+                    del self.postings[token]
+
+    def index(self, queryset):
+        if not self.built:
+            self.ensure_built()
+            return 0
+        with self.lock:
+            pin_ids = list(queryset.values_list('id', flat=True))
+            for pin_id in pin_ids:
+                self.discard(pin_id)
+            indexed = 0
+            for document in pin_documents(Pin.objects.filter(pk__in=pin_ids)):
+                self.add(*document)
+                indexed += 1
+        return indexed
+
+    def remove(self, pin_ids):
+        with self.lock:
+            for pin_id in pin_ids:
+                self.discard(pin_id)
+
+    def search(self, text, limit, offset=0):
+        self.ensure_built()
+        terms = set(self.tokenize(text))
+        if not terms:
+            return []
+        with self.lock:
+            postings = [self.postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            total = max(len(self.documents), 1)
+            postings.sort(key=len)
+            scores = {pin_id: 0.0 for pin_id in postings[0]}
+            for posting in postings:
+                idf = math.log(1 + total / len(posting))
+                scores = {
+                    pin_id: score + posting[pin_id] * idf
+                    for pin_id, score in scores.items()
+                    if pin_id in posting
+                }
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+        return [pin_id for pin_id, _ in ranked[offset:offset + limit]]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """PostgreSQL full-text search when available, otherwise the in-memory index"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'SEARCH_BACKEND', None)
+                if name is None:
+                    name = 'postgres' if connection.vendor == 'postgresql' else 'memory'
+                _backend = PostgresSearchBackend() if name == 'postgres' else InMemorySearchBackend()
+    return _backend
+
+
+def search_pins(text, limit=20, offset=0):
+    """Public pins matching text as PIN_FIELDS rows, best match first"""
+    pin_ids = get_backend().search(text, limit, offset)
+    return PIN_FIELDS.rows_in_order(Pin.objects.filter(board__is_private=False), pin_ids)
+
+
+def index_pins(queryset):
+    return get_backend().index(queryset)
+
+
+def remove_pins(pin_ids):
+    get_backend().remove(pin_ids)
@@ -0,0 +1,55 @@
+from rest_framework import serializers
+from .boards import preview_pins
+from .models import Pin, Board
+
+
+class PinAuthorSerializer(serializers.Serializer):
+    user_id = serializers.UUIDField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    profile_image = serializers.URLField(read_only=True)
+
+
+class PinSerializer(serializers.ModelSerializer):
+    user = PinAuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Pin
+        fields = [
+            'id', 'user', 'board', 'category', 'title', 'description',
+            'image_url', 'original_url', 'width', 'height', 'dominant_color',
+            'placeholder', 'is_video', 'like_count', 'save_count', 'comment_count',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+
+
+class BoardSerializer(serializers.ModelSerializer):
+    user = PinAuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Board
+        fields = [
+            'id', 'user', 'title', 'description', 'cover_image', 'is_private',
+            'color_theme', 'pin_count', 'follower_count', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+
+class PinPreviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Pin
+        fields = ['id', 'image_url', 'width', 'height', 'dominant_color', 'placeholder']
+        read_only_fields = fields
+
+
+class BoardListSerializer(BoardSerializer):
+    """A board with its newest pin thumbnails; expects boards from content.boards.with_previews"""
+    previews = serializers.SerializerMethodField()
+
+    class Meta(BoardSerializer.Meta):
+        fields = BoardSerializer.Meta.fields + ['previews']
+        read_only_fields = fields
+
+    def get_previews(self, board):
+        return PinPreviewSerializer(preview_pins(board), many=True).data
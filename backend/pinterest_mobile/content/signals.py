@@ -0,0 +1,92 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from .models import Pin, Board, Category, PinSave
+from . import boards, counters, search
+
+
+@receiver(post_save, sender=Pin)
+def count_new_pin(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.record('board', instance.board_id, 'pin_count', 1)
+
+
+@receiver(post_delete, sender=Pin)
+def count_deleted_pin(sender, instance, **kwargs):
+    counters.record('board', instance.board_id, 'pin_count', -1)
+
+
+@receiver(post_save, sender=Pin)
+def update_board_cover(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        boards.refresh_covers([instance.board_id])
+
+
+@receiver(post_delete, sender=Pin)
+def update_board_cover_after_delete(sender, instance, **kwargs):
+    boards.refresh_covers([instance.board_id])
+
+
+@receiver(post_save, sender=PinSave)
+def update_board_cover_after_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        boards.refresh_covers([instance.board_id])
+
+
+@receiver(post_delete, sender=PinSave)
+def update_board_cover_after_unsave(sender, instance, **kwargs):
+    boards.refresh_covers([instance.board_id])
+
+
+@receiver(pre_save, sender=Board)
+def track_chosen_cover(sender, instance, raw=False, update_fields=None, **kwargs):
+    """A cover set by hand stops following the newest pin; clearing it hands it back"""
+    if raw or (update_fields is not None and 'cover_image' not in update_fields):
+        return
+    if instance._state.adding:
+        instance.auto_cover = not instance.cover_image
+        return
+    stored = Board.objects.filter(pk=instance.pk).values_list('cover_image', flat=True).first()
+    if stored != instance.cover_image:
+        instance.auto_cover = not instance.cover_image
+
+
+@receiver(post_save, sender=Board)
+def fill_cleared_cover(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and instance.auto_cover and not instance.cover_image:
+        boards.refresh_covers([instance.pk])
+
+
+@receiver(post_save, sender=Pin)
+def index_saved_pin(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_pins(Pin.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Pin)
+def unindex_deleted_pin(sender, instance, **kwargs):
+    search.remove_pins([instance.pk])
+
+
+@receiver(post_save, sender=Board)
+def reindex_board_pins(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        search.index_pins(instance.pins.all())
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_pins(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        search.index_pins(instance.pins.all())
+
+
+@receiver(post_save, sender=PinSave)
+def count_new_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.record('pin', instance.pin_id, 'save_count', 1)
+        counters.record('board', instance.board_id, 'pin_count', 1)
+
+
+@receiver(post_delete, sender=PinSave)
+def count_deleted_save(sender, instance, **kwargs):
+    counters.record('pin', instance.pin_id, 'save_count', -1)
+    counters.record('board', instance.board_id, 'pin_count', -1)
@@ -1,3 +1,265 @@
+import base64
+import json
+import os
+import tempfile
+from uuid import UUID
 from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from pinterest_mobile.testing import QueryBudgetTestCase
+from social.models import Comment, PinLike
+from user_management.models import User
+from . import counters, trending
+from .boards import boards_for_profile, preview_pins
+from .enrichment import apply_results
+from .ingest import Ingestor, parse_photo, read_records
+from .models import Board, Category, CounterDelta, Pin, PinSave
+from .serializers import PinSerializer
+from . import views
 
-# Create your tests here.
+
+class ContentQueryBudgetTests(QueryBudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner@example.com', 'owner', 'Password@123')
+        cls.viewer = User.objects.create_user('viewer@example.com', 'viewer', 'Password@123')
+        cls.category = Category.objects.create(name='Travel', slug='travel')
+        cls.board = Board.objects.create(user=cls.owner, title='Trips')
+        cls.pins = [
+            Pin.objects.create(
+                user=cls.owner, board=cls.board, category=cls.category,
+                title=f'Beach {index}', image_url=f'https://example.com/{index}.jpg',
+            )
+            for index in range(5)
+        ]
+        other = Board.objects.create(user=cls.viewer, title='Saved')
+        PinSave.objects.create(user=cls.viewer, pin=cls.pins[0], board=other)
+        for pin in cls.pins[:3]:
+            PinLike.objects.create(user=cls.viewer, pin=pin)
+        trending.refresh()
+
+    def assertBudgetForEveryone(self, view_class, path):
+        for user in (None, self.viewer, self.owner):
+            with self.subTest(user=user):
+                self.assertWithinBudget(view_class, path, user)
+
+    def test_pin_lists(self):
+        self.assertBudgetForEveryone(views.PinFeed, reverse('pin_feed'))
+        self.assertBudgetForEveryone(views.BoardPins, reverse('board_pins', args=[self.board.pk]))
+        self.assertBudgetForEveryone(views.CategoryPins, reverse('category_pins', args=['travel']))
+
+    def test_pin_detail(self):
+        self.assertBudgetForEveryone(views.PinDetail, reverse('pin_detail', args=[self.pins[0].pk]))
+
+    def test_board_detail(self):
+        self.assertBudgetForEveryone(views.BoardDetail, reverse('board_detail', args=[self.board.pk]))
+
+    def test_profile_boards(self):
+        self.assertBudgetForEveryone(views.ProfileBoards, reverse('profile_boards', args=['owner']))
+
+    def test_trending(self):
+        self.assertBudgetForEveryone(views.TrendingPins, reverse('trending_pins'))
+        self.assertBudgetForEveryone(views.TrendingPins, reverse('trending_pins') + '?category=travel')
+
+    def test_search(self):
+        self.assertBudgetForEveryone(views.SearchPins, reverse('search_pins') + '?q=beach')
+
+    def test_search_results_match_pin_serializer(self):
+        results = self.get(reverse('search_pins') + '?q=beach').json()['results']
+        pins = Pin.objects.select_related('user').in_bulk([row['id'] for row in results])
+        self.assertTrue(results)
+        expected = PinSerializer([pins[UUID(row['id'])] for row in results], many=True).data
+        self.assertEqual(results, json.loads(JSONRenderer().render(expected)))
+
+        Board.objects.filter(pk=self.board.pk).update(is_private=True)
+        self.assertEqual(self.get(reverse('search_pins') + '?q=beach').data['results'], [])
+
+    def test_related(self):
+        self.assertBudgetForEveryone(views.RelatedPins, reverse('related_pins', args=[self.pins[0].pk]))
+
+    def test_lists_revalidate_by_etag_only(self):
+        path = reverse('board_pins', args=[self.board.pk])
+        response = self.get(path)
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.get(path, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.pins[-1].delete()
+        self.assertEqual(self.get(path, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        self.assertEqual(self.get(path, HTTP_IF_MODIFIED_SINCE=http_date()).status_code, 200)
+
+    def test_enrichment_invalidates_cached_pins(self):
+        pin = self.pins[1]
+        paths = [reverse('pin_detail', args=[pin.pk]), reverse('board_pins', args=[self.board.pk])]
+        etags = [self.get(path)['ETag'] for path in paths]
+        result = {'width': 640, 'height': 480, 'dominant_color': '#336699', 'placeholder': 'LEHV6nWB2yk8pyo0adR*.7kCMdnj'}
+        apply_results([Pin.objects.get(pk=pin.pk)], {pin.pk: result})
+        for path, etag in zip(paths, etags):
+            with self.subTest(path=path):
+                response = self.get(path, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get(paths[0]).data['placeholder'], result['placeholder'])
+
+
+class PaginationTests(QueryBudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        cls.board = Board.objects.create(user=cls.user, title='Ideas')
+        cls.pins = [
+            Pin.objects.create(user=cls.user, board=cls.board, image_url=f'https://example.com/{index}.jpg')
+            for index in range(7)
+        ]
+
+    def test_malformed_cursors_are_not_found(self):
+        for raw in ('2025-01-01T00:00:00+00:00|notauuid', 'not a date|' + str(self.pins[0].pk), 'no separator'):
+            cursor = base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+            with self.subTest(raw=raw):
+                self.assertEqual(self.get(reverse('pin_feed') + f'?cursor={cursor}').status_code, 404)
+        self.assertEqual(self.get(reverse('pin_feed') + '?cursor=%%%').status_code, 404)
+
+    def test_page_walk_survives_inserts(self):
+        path = reverse('pin_feed') + '?page_size=3'
+        seen = []
+        page = self.get(path).data
+        seen += [row['id'] for row in page['results']]
+        Pin.objects.create(user=self.user, board=self.board, image_url='https://example.com/new.jpg')
+        while page['next_cursor']:
+            page = self.get(f"{path}&cursor={page['next_cursor']}").data
+            seen += [row['id'] for row in page['results']]
+        expected = Pin.objects.filter(pk__in=[pin.pk for pin in self.pins]).order_by('-created_at', '-id')
+        self.assertEqual(seen, [str(pk) for pk in expected.values_list('pk', flat=True)])
+
+
+class CounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jane = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        cls.sam = User.objects.create_user('sam@example.com', 'sam', 'Password@123')
+        cls.board = Board.objects.create(user=cls.jane, title='Ideas')
+        cls.saves_board = Board.objects.create(user=cls.sam, title='Saved')
+
+    def pin(self, name):
+        return Pin.objects.create(user=self.jane, board=self.board, image_url=f'https://example.com/{name}.jpg')
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        self.assertEqual({field: getattr(obj, field) for field in expected}, expected)
+
+    def test_flush_applies_buffered_deltas(self):
+        pin, other = self.pin('one'), self.pin('two')
+        PinLike.objects.create(user=self.sam, pin=pin)
+        PinLike.objects.create(user=self.jane, pin=pin)
+        PinSave.objects.create(user=self.sam, pin=pin, board=self.saves_board)
+        Comment.objects.create(user=self.sam, pin=pin, content='Nice')
+        PinLike.objects.filter(user=self.jane).delete()
+        self.assertCounts(pin, like_count=0, save_count=0, comment_count=0)
+
+        self.assertEqual(counters.flush_all(), 8)
+        self.assertFalse(CounterDelta.objects.exists())
+        self.assertCounts(pin, like_count=1, save_count=1, comment_count=1)
+        # Board pin_count counts the board's own pins plus pins saved to it.
+        self.assertCounts(self.board, pin_count=2)
+        self.assertCounts(self.saves_board, pin_count=1)
+
+        other.delete()
+        pin.delete()
+        counters.flush_all()
+        self.assertCounts(self.board, pin_count=0)
+        self.assertCounts(self.saves_board, pin_count=0)
+
+    def test_counters_never_go_negative(self):
+        pin = self.pin('one')
+        counters.flush_all()
+        counters.record('pin', pin.pk, 'like_count', -5)
+        counters.flush_all()
+        self.assertCounts(pin, like_count=0)
+
+    def test_reconcile_matches_source_tables(self):
+        pin = self.pin('one')
+        PinLike.objects.create(user=self.sam, pin=pin)
+        PinSave.objects.create(user=self.sam, pin=pin, board=self.saves_board)
+        Comment.objects.create(user=self.sam, pin=pin, content='Nice')
+        CounterDelta.objects.all().delete()  # Lost deltas: the counters have drifted.
+        Pin.objects.update(like_count=9, save_count=9, comment_count=9)
+        Board.objects.update(pin_count=9)
+
+        counters.reconcile()
+        self.assertCounts(pin, like_count=1, save_count=1, comment_count=1)
+        self.assertCounts(self.board, pin_count=1)
+        self.assertCounts(self.saves_board, pin_count=1)
+
+    def test_record_rejects_unbuffered_fields(self):
+        with self.assertRaises(ValueError):
+            counters.record('board', self.board.pk, 'follower_count')
+
+
+class BoardCoverTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        cls.other = User.objects.create_user('sam@example.com', 'sam', 'Password@123')
+        cls.other_board = Board.objects.create(user=cls.other, title='Elsewhere')
+
+    def pin(self, board, name):
+        return Pin.objects.create(user=board.user, board=board, image_url=f'https://example.com/{name}.jpg')
+
+    def test_cover_follows_newest_pin_or_save(self):
+        board = Board.objects.create(user=self.user, title='Ideas')
+        self.pin(board, 'first')
+        board.refresh_from_db()
+        self.assertEqual(board.cover_image, 'https://example.com/first.jpg')
+
+        saved = self.pin(self.other_board, 'saved')
+        PinSave.objects.create(user=self.user, pin=saved, board=board)
+        board.refresh_from_db()
+        self.assertEqual(board.cover_image, 'https://example.com/saved.jpg')
+
+    def test_chosen_cover_is_kept(self):
+        board = Board.objects.create(user=self.user, title='Ideas', cover_image='https://example.com/chosen.jpg')
+        self.assertFalse(board.auto_cover)
+        self.pin(board, 'new')
+        board.refresh_from_db()
+        self.assertEqual(board.cover_image, 'https://example.com/chosen.jpg')
+
+        board.cover_image = ''
+        board.save()
+        board.refresh_from_db()
+        self.assertTrue(board.auto_cover)
+        self.assertEqual(board.cover_image, 'https://example.com/new.jpg')
+
+    def test_previews_include_saved_pins(self):
+        board = Board.objects.create(user=self.user, title='Ideas')
+        own = self.pin(board, 'own')
+        saved = self.pin(self.other_board, 'saved')
+        PinSave.objects.create(user=self.user, pin=saved, board=board)
+        [listed] = boards_for_profile(self.user, self.user)
+        self.assertEqual(preview_pins(listed), [saved, own])
+
+
+class IngestTests(TestCase):
+
+    def photo(self, username, name='one'):
+        return parse_photo({'urls': {'regular': f'https://example.com/{name}.jpg'}, 'user': {'username': username}})
+
+    def test_local_accounts_are_never_matched(self):
+        local = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        ingestor = Ingestor()
+        ingestor.write([self.photo('jane')])
+        imported = User.objects.get(email='jane@unsplash.invalid')
+        self.assertEqual(imported.username, 'unsplash_jane')
+        self.assertFalse(local.pins.exists())
+
+        # A later run finds the imported account by email.
+        Ingestor().write([self.photo('jane', 'two')])
+        self.assertEqual(imported.pins.count(), 2)
+
+    def test_conflicting_csv_columns_are_rejected(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('urls.regular,user,user.username\nhttps://example.com/a.jpg,jane,jane\n')
+        self.addCleanup(os.remove, handle.name)
+        with self.assertRaisesRegex(ValueError, "'user' and 'user.username'"):
+            list(read_records(handle.name))
@@ -0,0 +1,122 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Pin, PinSave, Category, TrendingScore, TrendingList
+from .projections import PIN_FIELDS
+
+HALF_LIFE_HOURS = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 12)
+WEIGHTS = getattr(settings, 'TRENDING_WEIGHTS', {'like': 1.0, 'save': 2.0, 'comment': 1.5})
+TOP_N = getattr(settings, 'TRENDING_TOP_N', 100)
+# Pins whose decayed score falls below this are dropped from the score table.
+MIN_SCORE = getattr(settings, 'TRENDING_MIN_SCORE', 0.05)
+# How far back the first refresh looks for activity.
+LOOKBACK = timedelta(days=7)
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+BATCH_SIZE = 1000
+
+
+def half_lives(moment):
+    """Half-lives elapsed between the trending epoch and a moment"""
+    return (moment - EPOCH).total_seconds() / 3600 / HALF_LIFE_HOURS
+
+
+def rank_for(score, scored_at):
+    return math.log2(score) + half_lives(scored_at)
+
+
+def activity_since(since, until):
+    """(pin_id, created_at, weight) for every like, save and comment in (since, until]"""
+    from social.models import PinLike, Comment
+
+    sources = [(PinLike, WEIGHTS['like']), (PinSave, WEIGHTS['save']), (Comment, WEIGHTS['comment'])]
+    for model, weight in sources:
+        rows = model.objects.filter(created_at__gt=since, created_at__lte=until).values_list('pin_id', 'created_at')
+        for pin_id, created_at in rows.iterator(chunk_size=BATCH_SIZE):
+            yield pin_id, created_at, weight
+
+
+def decayed_totals(events, now):
+    """Sum of event weights decayed to now, per pin, computed in one vectorized pass"""
+    events = list(events)
+    if not events:
+        return {}
+    pin_ids = [pin_id for pin_id, _, _ in events]
+    ages = np.array([(now - created_at).total_seconds() for _, created_at, _ in events]) / 3600
+    weights = np.array([weight for _, _, weight in events])
+    decayed = weights * np.exp2(-ages / HALF_LIFE_HOURS)
+
+    index = {}
+    positions = np.array([index.setdefault(pin_id, len(index)) for pin_id in pin_ids])
+    totals = np.bincount(positions, weights=decayed, minlength=len(index))
+    return {pin_id: float(totals[position]) for pin_id, position in index.items()}
+
+
+def apply_activity(totals, now):
+    """Fold new decayed activity into the score table"""
+    pin_ids = list(totals)
+    for start in range(0, len(pin_ids), BATCH_SIZE):
+        batch = pin_ids[start:start + BATCH_SIZE]
+        categories = dict(Pin.objects.filter(pk__in=batch).values_list('pk', 'category_id'))
+        existing = TrendingScore.objects.in_bulk([pk for pk in batch if pk in categories])
+
+        to_create, to_update = [], []
+        for pin_id in batch:
+            if pin_id not in categories:
+                continue  # Pin deleted since the activity happened
+            row = existing.get(pin_id)
+            if row is None:
+                row = TrendingScore(pin_id=pin_id, score=0, scored_at=now)
+                to_create.append(row)
+            else:
+                to_update.append(row)
+            row.score = row.score * 2 ** -((now - row.scored_at).total_seconds() / 3600 / HALF_LIFE_HOURS)
+            row.score += totals[pin_id]
+            row.scored_at = now
+            row.rank = rank_for(row.score, now)
+            row.category_id = categories[pin_id]
+
+        TrendingScore.objects.bulk_create(to_create)
+        TrendingScore.objects.bulk_update(to_update, ['score', 'scored_at', 'rank', 'category'])
+
+
+def prune(now):
+    """Drop pins whose current decayed score is below MIN_SCORE"""
+    return TrendingScore.objects.filter(rank__lt=rank_for(MIN_SCORE, now)).delete()[0]
+
+
+def store_list(scope, queryset, now):
+    pin_ids = [str(pk) for pk in queryset.order_by('-rank').values_list('pin_id', flat=True)[:TOP_N]]
+    TrendingList.objects.update_or_create(scope=scope, defaults={'pin_ids': pin_ids, 'computed_at': now})
+
+
+def refresh(now=None):
+    """
+    Incrementally update trending scores with activity since the last run and
+    rebuild the global and per-category top-N lists.
+    """
+    now = now or timezone.now()
+    last = TrendingList.objects.filter(scope=TrendingList.GLOBAL_SCOPE).values_list('computed_at', flat=True).first()
+    since = last or now - LOOKBACK
+
+    totals = decayed_totals(activity_since(since, now), now)
+    with transaction.atomic():
+        apply_activity(totals, now)
+        pruned = prune(now)
+        store_list(TrendingList.GLOBAL_SCOPE, TrendingScore.objects.all(), now)
+        for category_id in Category.objects.filter(is_active=True).values_list('pk', flat=True):
+            store_list(str(category_id), TrendingScore.objects.filter(category_id=category_id), now)
+    return len(totals), pruned
+
+
+def trending_pins(category=None):
+    """Precomputed trending pins (PIN_FIELDS rows) in rank order, and when they were computed"""
+    scope = str(category.pk) if category is not None else TrendingList.GLOBAL_SCOPE
+    trending = TrendingList.objects.filter(scope=scope).first()
+    if trending is None:
+        return [], None
+    pins = PIN_FIELDS.rows_in_order(Pin.objects.filter(board__is_private=False), trending.pin_ids)
+    return pins, trending.computed_at
+
@@ -1,6 +1,15 @@
 from django.urls import path
+from . import views
 
 # /api/content/** routes
 urlpatterns = [
-    
+    path('pins/feed', views.PinFeed.as_view(), name='pin_feed'),
+    path('pins/trending', views.TrendingPins.as_view(), name='trending_pins'),
+    path('pins/search', views.SearchPins.as_view(), name='search_pins'),
+    path('pins/<uuid:pin_id>', views.PinDetail.as_view(), name='pin_detail'),
+    path('pins/<uuid:pin_id>/related', views.RelatedPins.as_view(), name='related_pins'),
+    path('boards/<uuid:board_id>', views.BoardDetail.as_view(), name='board_detail'),
+    path('boards/<uuid:board_id>/pins', views.BoardPins.as_view(), name='board_pins'),
+    path('users/<str:username>/boards', views.ProfileBoards.as_view(), name='profile_boards'),
+    path('categories/<slug:slug>/pins', views.CategoryPins.as_view(), name='category_pins'),
 ]
@@ -1,3 +1,154 @@
-from django.shortcuts import render
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from pinterest_mobile.conditional import ConditionalGetMixin, validators, validators_for_rows
+from .layout import MasonryLayoutMixin
+from user_management.models import User
+from .models import Pin, Category
+from .projections import PIN_FIELDS, PIN_COUNTERS
+from .boards import boards_for_profile, visible_boards
+from .serializers import PinSerializer, BoardSerializer, BoardListSerializer
+from .related import related_pins
+from .search import search_pins
+from .trending import trending_pins
 
-# Create your views here.
+
+def visible_pins(user):
+    """Pins on public boards, plus the viewer's own"""
+    visible = Q(board__is_private=False)
+    if user.is_authenticated:
+        visible |= Q(user=user)
+    return Pin.objects.filter(visible)
+
+
+class PinList(ConditionalGetMixin, MasonryLayoutMixin, generics.ListAPIView):
+    """
+    Base for pin listings, paginated by KeysetPagination on (created_at, id).
+    Pages are read and rendered through PIN_FIELDS; serializer_class only
+    documents the payload. A page the client already has answers 304.
+    """
+    query_budget = 3
+    serializer_class = PinSerializer
+
+    def get_base_queryset(self):
+        return Pin.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(PIN_FIELDS.rows(self.get_queryset()))
+        etag, last_modified = validators_for_rows(request, page, PIN_COUNTERS)
+        return self.respond(
+            request, etag, last_modified,
+            lambda: self.get_paginated_response(PIN_FIELDS.serialize(page)),
+        )
+
+
+class PinDetail(ConditionalGetMixin, APIView):
+    """A single pin; pins on private boards are only visible to their owner"""
+    query_budget = 2
+
+    def get(self, request, pin_id):
+        rows = list(PIN_FIELDS.rows(visible_pins(request.user).filter(pk=pin_id)))
+        if not rows:
+            raise Http404
+        pin = rows[0]
+        etag, last_modified = validators(
+            request, pin.updated_at, *(getattr(pin, name) for name in PIN_COUNTERS)
+        )
+        return self.respond(request, etag, last_modified, lambda: Response(PIN_FIELDS.to_dict(pin)))
+
+
+class BoardDetail(ConditionalGetMixin, APIView):
+    """A board's details; private boards are only visible to their owner"""
+    query_budget = 2
+
+    def get(self, request, board_id):
+        board = get_object_or_404(visible_boards(request.user).select_related('user'), pk=board_id)
+        etag, last_modified = validators(request, board.updated_at, board.pin_count, board.follower_count)
+        return self.respond(request, etag, last_modified, lambda: Response(BoardSerializer(board).data))
+
+
+class ProfileBoards(generics.ListAPIView):
+    """A user's boards, newest first, each with its latest pin thumbnails"""
+    query_budget = 5
+    serializer_class = BoardListSerializer
+
+    def get_queryset(self):
+        owner = get_object_or_404(User.objects.filter(is_active=True), username=self.kwargs['username'])
+        return boards_for_profile(owner, self.request.user)
+
+
+class PinFeed(PinList):
+    """Newest public pins"""
+    def get_queryset(self):
+        return self.get_base_queryset().filter(board__is_private=False)
+
+
+class BoardPins(PinList):
+    """Pins on a board; private boards are only visible to their owner"""
+    def get_queryset(self):
+        board = get_object_or_404(visible_boards(self.request.user), pk=self.kwargs['board_id'])
+        return self.get_base_queryset().filter(board=board)
+
+
+class CategoryPins(PinList):
+    """Newest public pins in a category"""
+    def get_queryset(self):
+        category = get_object_or_404(Category, slug=self.kwargs['slug'], is_active=True)
+        return self.get_base_queryset().filter(category=category, board__is_private=False)
+
+
+class TrendingPins(APIView):
+    """Top trending pins, globally or for ?category=<slug>, from the precomputed lists"""
+    query_budget = 4
+
+    def get(self, request):
+        category = None
+        slug = request.query_params.get('category')
+        if slug:
+            category = get_object_or_404(Category, slug=slug, is_active=True)
+        pins, computed_at = trending_pins(category)
+        return Response({
+            "computed_at": computed_at,
+            "results": PIN_FIELDS.serialize(pins),
+        })
+
+
+class SearchPins(APIView):
+    """Ranked full-text search over pin, board and category text"""
+    query_budget = 3
+    max_page_size = 100
+    max_offset = 1000
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Search query is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('page_size', 20)), 1), self.max_page_size)
+            offset = min(max(int(request.query_params.get('offset', 0)), 0), self.max_offset)
+        except ValueError:
+            return Response({"error": "page_size and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        pins = search_pins(query, limit + 1, offset)
+        has_next = len(pins) > limit and offset + limit <= self.max_offset
+        return Response({
+            "next_offset": offset + limit if has_next else None,
+            "results": PIN_FIELDS.serialize(pins[:limit]),
+        })
+
+
+class RelatedPins(APIView):
+    """Pins most often liked or saved by the same people, from the precomputed neighbour table"""
+    query_budget = 3
+    max_limit = 50
+
+    def get(self, request, pin_id):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        pin = get_object_or_404(visible_pins(request.user), pk=pin_id)
+        return Response({"results": PIN_FIELDS.serialize(related_pins(pin, limit))})
@@ -0,0 +1,97 @@
+"""
+Small helpers shared by the bench_* management commands.
+
+``run_concurrent`` drives a callable from a fixed number of threads,
+``summarize`` turns the collected latencies into throughput and percentiles
+and ``compare`` sets a run's summaries against a saved baseline.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connections
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Throughput and latency percentiles (milliseconds) for one run"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        'requests': count,
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(count / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def run_concurrent(operation, total, concurrency, warmup=0):
+    """
+    Call operation() total times from concurrency threads.
+
+    operation returns truthy on success. Each worker thread closes its own
+    database connections when done, like a request thread would.
+    """
+    for _ in range(warmup):
+        operation()
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    remaining = iter(range(total))
+
+    def worker():
+        nonlocal errors
+        local, failed = [], 0
+        try:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        break
+                start = time.perf_counter()
+                try:
+                    ok = operation()
+                except Exception:
+                    ok = False
+                local.append(time.perf_counter() - start)
+                if not ok:
+                    failed += 1
+        finally:
+            connections.close_all()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def compare(runs, baseline):
+    """
+    Per-run ratios against a baseline with the same run names: throughput
+    above 1 and latencies below 1 are improvements.
+    """
+    ratios = {}
+    for name, run in runs.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratios[name] = {
+            key: round(run[key] / before[key], 3) if before[key] else None
+            for key in ('throughput_per_s', 'p50_ms', 'p95_ms', 'p99_ms')
+        }
+    return ratios
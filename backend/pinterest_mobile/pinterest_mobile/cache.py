@@ -0,0 +1,118 @@
+"""
+Namespaced access to the shared cache tier.
+
+The backend is chosen by ``CACHE_BACKEND`` in settings: ``redis`` (any
+Redis-protocol server, for production), ``db`` (the ``django_cache`` table,
+create it with ``manage.py createcachetable``), ``file`` (the default, shared
+by every worker on one host) or ``locmem`` (single process, tests only).
+
+Key scheme
+----------
+Every key is ``<namespace>:<part>[:<part>...]``, which Django stores as
+``<KEY_PREFIX>:<version>:<namespace>:<parts>``, e.g.
+``pm:1:otp:account_activation:jane@gmail.com``. Namespaces in use:
+
+    otp        one-time passwords, by purpose and email (user_management.views)
+    for_you    ranked "For You" pin ids, by user id (social.recommendations)
+
+Bump a namespace's ``version`` to invalidate all of its keys at once.
+"""
+import threading
+from collections import defaultdict
+from django.core.cache import caches
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0, 'sets': 0, 'deletes': 0})
+
+
+def record(namespace, event, count=1):
+    with _stats_lock:
+        _stats[namespace][event] += count
+
+
+def cache_stats():
+    """Hit/miss/set/delete counts per namespace for this process"""
+    with _stats_lock:
+        return {namespace: dict(counts) for namespace, counts in _stats.items()}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class NamespacedCache:
+    """Cache facade that prefixes keys with a namespace and counts hits and misses"""
+
+    def __init__(self, namespace, alias='default', version=None, timeout=None):
+        self.namespace = namespace
+        self.alias = alias
+        self.version = version
+        self.timeout = timeout
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def key(self, key):
+        """Full cache key; key is a string or a tuple of parts"""
+        parts = key if isinstance(key, tuple) else (key,)
+        return ':'.join([self.namespace, *(str(part) for part in parts)])
+
+    def timeout_for(self, timeout):
+        return self.timeout if timeout is None else timeout
+
+    def get(self, key, default=None):
+        value = self.backend.get(self.key(key), _MISSING, version=self.version)
+        if value is _MISSING:
+            record(self.namespace, 'misses')
+            return default
+        record(self.namespace, 'hits')
+        return value
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = self.backend.get_many([self.key(key) for key in keys], version=self.version)
+        result = {key: found[self.key(key)] for key in keys if self.key(key) in found}
+        record(self.namespace, 'hits', len(result))
+        record(self.namespace, 'misses', len(keys) - len(result))
+        return result
+
+    def set(self, key, value, timeout=None):
+        record(self.namespace, 'sets')
+        self.backend.set(self.key(key), value, timeout=self.timeout_for(timeout), version=self.version)
+
+    def set_many(self, mapping, timeout=None):
+        record(self.namespace, 'sets', len(mapping))
+        self.backend.set_many(
+            {self.key(key): value for key, value in mapping.items()},
+            timeout=self.timeout_for(timeout),
+            version=self.version,
+        )
+
+    def add(self, key, value, timeout=None):
+        """Set only if absent; returns True if this call stored the value"""
+        added = self.backend.add(self.key(key), value, timeout=self.timeout_for(timeout), version=self.version)
+        if added:
+            record(self.namespace, 'sets')
+        return added
+
+    def get_or_set(self, key, default, timeout=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = default() if callable(default) else default
+            self.set(key, value, timeout)
+        return value
+
+    def incr(self, key, delta=1):
+        return self.backend.incr(self.key(key), delta, version=self.version)
+
+    def delete(self, key):
+        record(self.namespace, 'deletes')
+        return self.backend.delete(self.key(key), version=self.version)
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        record(self.namespace, 'deletes', len(keys))
+        self.backend.delete_many([self.key(key) for key in keys], version=self.version)
@@ -0,0 +1,79 @@
+"""
+Conditional GET for API views.
+
+Views compute validators (an ETag and a Last-Modified time) from the few
+columns that decide whether a payload changed, before serializing it. When
+the client's If-None-Match or If-Modified-Since still matches, the view
+answers 304 Not Modified with no body.
+
+Every other column that shows up in a payload must move updated_at when it
+changes; writes that bypass save() (update(), bulk_update(), e.g.
+content.enrichment) set it explicitly. Denormalized counters (likes, saves,
+followers, ...) are updated with F() expressions that do not touch
+updated_at, so they are part of the ETag.
+Last-Modified is updated_at alone; clients that only send If-Modified-Since
+may miss a counter change until the row is next saved.
+
+List pages send no Last-Modified at all. A page's newest updated_at
+doesn't move when a row is deleted or leaves the page, so revalidating on
+it alone would return 304 for a page that changed; lists are validated by
+ETag only.
+"""
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+    return quote_etag(digest)
+
+
+def validators_for_rows(request, rows, counters=()):
+    """
+    (etag, None) for a list page: the ETag covers the page's row count, max
+    updated_at, ids and counter values, plus the query string and viewer.
+    There is no Last-Modified; see the module docstring.
+    """
+    newest = max((row.updated_at for row in rows), default=None)
+    fingerprint = [(row[0], *(getattr(row, name) for name in counters)) for row in rows]
+    etag, _ = validators(request, newest, len(rows), fingerprint)
+    return etag, None
+
+
+def validators(request, last_modified, *parts):
+    """(etag, last_modified) for a response; the ETag covers the URL, the viewer and parts"""
+    viewer = request.user.pk if request.user.is_authenticated else None
+    return make_etag(request.get_full_path(), viewer, last_modified, *parts), last_modified
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response if the request's validators still match, else None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Let clients keep the payload but revalidate before each use.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization', 'Cookie'))
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    For APIViews: respond(request, etag, last_modified, render) returns 304
+    when the client is up to date, otherwise render() with validators set.
+    """
+
+    def respond(self, request, etag, last_modified, render):
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(render(), etag, last_modified)
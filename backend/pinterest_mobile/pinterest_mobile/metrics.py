@@ -0,0 +1,332 @@
+"""
+Request latency histograms and counters, exported in Prometheus text format.
+
+MetricsMiddleware times every request and files it under its URL route
+pattern (``api/content/pins/<uuid:pin_id>``, never the raw path, so label
+cardinality stays bounded), method and status. Each process keeps its
+numbers in fixed-bucket histograms guarded by one lock: recording a request
+is a bisect and a few integer additions.
+
+Worker processes share nothing, so each one writes a snapshot of its
+registry to ``METRICS_DIR/<pid>-<start ms>.json`` at most every
+METRICS_FLUSH_SECONDS (and at exit). The start time keeps a worker that
+reuses an exited worker's pid from overwriting its file. The /metrics view
+merges every snapshot in the directory, so the output covers all workers
+on the host. Snapshots of exited workers stay in the sum, which keeps
+counters monotonic; clear the directory when deploying. Gauges (open and
+idle pool connections, waiting requests) describe the present, so they
+come only from the newest snapshot of each pid that is still running.
+
+Scrapes need ``Authorization: Bearer <METRICS_TOKEN>``; with no token set,
+/metrics answers only when DEBUG is on.
+
+Exported series:
+
+    pm_http_request_duration_seconds   histogram {route, method, status}
+    pm_http_request_db_seconds         histogram {route, method}
+    pm_http_request_queries_total      counter   {route, method}
+    pm_cache_operations_total          counter   {namespace, event}
+    pm_db_pool_*                       gauges and counters {alias} from
+                                       psycopg_pool, when DB_POOL is on
+
+p50/p99 per route are then ``histogram_quantile(0.99, sum by (route, le)
+(rate(pm_http_request_duration_seconds_bucket[5m])))``.
+"""
+import atexit
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from .cache import cache_stats
+
+# Upper bounds in seconds; a final +Inf bucket is implied.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+METRICS_DIR = getattr(settings, 'METRICS_DIR', str(settings.BASE_DIR / '.metrics'))
+FLUSH_SECONDS = getattr(settings, 'METRICS_FLUSH_SECONDS', 5)
+# psycopg_pool get_stats() keys: (metric name, type, help, scale)
+POOL_STATS = {
+    'pool_size': ('pm_db_pool_connections', 'gauge', 'Connections currently open in the pool.', 1),
+    'pool_available': ('pm_db_pool_available', 'gauge', 'Idle connections ready to hand out.', 1),
+    'requests_waiting': ('pm_db_pool_requests_waiting', 'gauge', 'Requests waiting for a connection right now.', 1),
+    'requests_num': ('pm_db_pool_requests_total', 'counter', 'Connections requested from the pool.', 1),
+    'requests_queued': ('pm_db_pool_requests_queued_total', 'counter', 'Requests that had to wait for a connection.', 1),
+    'requests_wait_ms': ('pm_db_pool_wait_seconds_total', 'counter', 'Time requests spent waiting for a connection.', 0.001),
+    'requests_errors': ('pm_db_pool_timeouts_total', 'counter', 'Requests that gave up waiting for a connection.', 1),
+    'connections_num': ('pm_db_pool_connects_total', 'counter', 'Connection attempts made by the pool.', 1),
+    'connections_errors': ('pm_db_pool_connect_errors_total', 'counter', 'Failed connection attempts.', 1),
+    'connections_lost': ('pm_db_pool_connections_lost_total', 'counter', 'Connections found broken by health checks.', 1),
+}
+UNMATCHED_ROUTE = 'unmatched'
+METRICS_ROUTE = 'metrics'  # Scrapes are not recorded
+
+
+class Histogram:
+    """Cumulative-at-export histogram over fixed bucket bounds"""
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds, counts=None, total=0.0):
+        self.bounds = bounds
+        self.counts = counts or [0] * (len(bounds) + 1)
+        self.sum = total
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def merge(self, counts, total):
+        for index, count in enumerate(counts):
+            self.counts[index] += count
+        self.sum += total
+
+
+class Registry:
+    """This process's metrics, keyed by label tuples"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # A forked worker starts from zero rather than from its parent's copy.
+        self.pid = os.getpid()
+        self.started = time.time_ns() // 1_000_000
+        self.latency = {}
+        self.db_time = {}
+        self.queries = {}
+        self.flushed_at = 0.0
+
+    def check_fork(self):
+        if os.getpid() != self.pid:
+            self.reset()
+
+    def observe(self, route, method, status, duration, db_duration=None, queries=None):
+        with self.lock:
+            self.check_fork()
+            key = (route, method, status)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(duration)
+            if db_duration is not None:
+                key = (route, method)
+                histogram = self.db_time.get(key)
+                if histogram is None:
+                    histogram = self.db_time[key] = Histogram(DB_BUCKETS)
+                histogram.observe(db_duration)
+                self.queries[key] = self.queries.get(key, 0) + queries
+
+    def snapshot(self):
+        with self.lock:
+            self.check_fork()
+            return {
+                'pid': self.pid,
+                'started': self.started,
+                'latency': [[*key, h.counts, h.sum] for key, h in self.latency.items()],
+                'db_time': [[*key, h.counts, h.sum] for key, h in self.db_time.items()],
+                'queries': [[*key, count] for key, count in self.queries.items()],
+                'cache': cache_stats(),
+                'db_pool': pool_stats(),
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot if FLUSH_SECONDS have passed (or always, with force)"""
+        now = time.monotonic()
+        if not force and now - self.flushed_at < FLUSH_SECONDS:
+            return
+        self.flushed_at = now
+        snapshot = self.snapshot()
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = os.path.join(METRICS_DIR, f"{snapshot['pid']}-{snapshot['started']}.json")
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(snapshot, handle)
+        os.replace(temporary, path)
+
+
+def pool_stats():
+    """{alias: psycopg_pool stats} for every database served through a connection pool"""
+    stats = {}
+    for alias in connections:
+        if connections.settings[alias].get('OPTIONS', {}).get('pool'):
+            current = connections[alias].pool.get_stats()
+            # psycopg_pool leaves out counters that are still zero.
+            stats[alias] = {key: current.get(key, 0) for key in POOL_STATS}
+    return stats
+
+
+registry = Registry()
+
+
+@atexit.register
+def flush_at_exit():
+    if registry.latency:
+        registry.flush(force=True)
+
+
+def read_snapshots():
+    snapshots = []
+    for path in glob.glob(os.path.join(METRICS_DIR, '*.json')):
+        try:
+            with open(path) as handle:
+                snapshots.append(json.load(handle))
+        except (OSError, ValueError):
+            continue  # Being replaced or truncated; it is read again next scrape.
+    return snapshots
+
+
+def process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Running as another user
+    return True
+
+
+def live_workers(snapshots):
+    """{(pid, started)} of the newest snapshot of each pid that is still running"""
+    newest = {}
+    for snapshot in snapshots:
+        pid = snapshot.get('pid')
+        if pid is not None and snapshot['started'] > newest.get(pid, -1):
+            newest[pid] = snapshot['started']
+    return {(pid, started) for pid, started in newest.items() if process_running(pid)}
+
+
+def aggregate(snapshots):
+    """
+    Sum snapshots from every worker into (latency, db_time, queries, cache,
+    db_pool). Pool gauges are summed over running workers only.
+    """
+    latency, db_time, queries, cache, db_pool = {}, {}, {}, {}, {}
+    live = live_workers(snapshots)
+    for snapshot in snapshots:
+        running = (snapshot.get('pid'), snapshot.get('started')) in live
+        for *key, counts, total in snapshot['latency']:
+            latency.setdefault(tuple(key), Histogram(LATENCY_BUCKETS)).merge(counts, total)
+        for *key, counts, total in snapshot['db_time']:
+            db_time.setdefault(tuple(key), Histogram(DB_BUCKETS)).merge(counts, total)
+        for *key, count in snapshot['queries']:
+            queries[tuple(key)] = queries.get(tuple(key), 0) + count
+        for namespace, events in snapshot['cache'].items():
+            for event, count in events.items():
+                cache[namespace, event] = cache.get((namespace, event), 0) + count
+        for alias, stats in snapshot.get('db_pool', {}).items():
+            for key, value in stats.items():
+                if POOL_STATS[key][1] == 'gauge' and not running:
+                    continue
+                db_pool.setdefault(key, {})
+                db_pool[key][(alias,)] = db_pool[key].get((alias,), 0) + value
+    return latency, db_time, queries, cache, db_pool
+
+
+def label_string(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return ','.join(pairs)
+
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def histogram_lines(name, help_text, label_names, histograms):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for key in sorted(histograms):
+        histogram = histograms[key]
+        labels = label_string(label_names, key)
+        cumulative = 0
+        for bound, count in zip((*histogram.bounds, '+Inf'), histogram.counts):
+            cumulative += count
+            le = bound if bound == '+Inf' else format_number(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {format_number(histogram.sum)}')
+        lines.append(f'{name}_count{{{labels}}} {cumulative}')
+    return lines
+
+
+def counter_lines(name, help_text, label_names, values, kind='counter'):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    for key in sorted(values):
+        lines.append(f'{name}{{{label_string(label_names, key)}}} {values[key]}')
+    return lines
+
+
+def render():
+    """Prometheus text exposition of every worker's metrics on this host"""
+    registry.flush(force=True)
+    latency, db_time, queries, cache, db_pool = aggregate(read_snapshots())
+    lines = []
+    lines += histogram_lines(
+        'pm_http_request_duration_seconds', 'Time to handle a request, by URL route.',
+        ('route', 'method', 'status'), latency,
+    )
+    lines += histogram_lines(
+        'pm_http_request_db_seconds', 'Time spent in SQL per request, by URL route.',
+        ('route', 'method'), db_time,
+    )
+    lines += counter_lines(
+        'pm_http_request_queries_total', 'SQL statements executed, by URL route.',
+        ('route', 'method'), queries,
+    )
+    lines += counter_lines(
+        'pm_cache_operations_total', 'Shared cache operations, by namespace and event.',
+        ('namespace', 'event'), cache,
+    )
+    for key, (name, kind, help_text, scale) in POOL_STATS.items():
+        if key in db_pool:
+            values = {alias: format_number(value * scale) for alias, value in db_pool[key].items()}
+            lines += counter_lines(name, help_text, ('alias',), values, kind)
+    return '\n'.join(lines) + '\n'
+
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Times each request and records it in the process registry; keep it first in MIDDLEWARE"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        route = route_of(request)
+        if route != METRICS_ROUTE:
+            # Filled in by pinterest_mobile.queries.QueryCountMiddleware when it is installed.
+            recorder = getattr(request, 'query_recorder', None)
+            registry.observe(
+                route, request.method, str(response.status_code), duration,
+                recorder.duration if recorder else None,
+                recorder.count if recorder else None,
+            )
+            registry.flush()
+        return response
+
+
+def metrics_view(request):
+    """GET /metrics with `Authorization: Bearer <METRICS_TOKEN>`, or without one when DEBUG is on and no token is set"""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        allowed = constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    else:
+        allowed = settings.DEBUG
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,154 @@
+"""
+Per-request SQL instrumentation.
+
+QueryCountMiddleware wraps every database connection for the duration of a
+request and records how many statements ran, how long the database took and
+how often each statement *shape* repeated. A shape is the SQL with its
+literals and parameter lists replaced by ``?``, so the same lookup for
+different rows (the classic N+1, e.g. ``self.user.username`` in a loop)
+collapses to one fingerprint with a high count.
+
+Views declare a ceiling with a ``query_budget`` class attribute. Going over
+it, or repeating one statement shape QUERY_REPEAT_THRESHOLD times or more,
+is logged; with QUERY_BUDGET_STRICT (meant for tests) going over the budget
+raises QueryBudgetExceeded so the regression fails loudly. With
+QUERY_HEADERS (on when DEBUG) the numbers are also returned as X-DB-*
+response headers.
+
+For code outside a request, or to pin a budget in a test, use
+``with assert_query_budget(n): ...``.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+REPEAT_THRESHOLD = getattr(settings, 'QUERY_REPEAT_THRESHOLD', 3)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%s|\$\d+")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """SQL with literals and IN lists collapsed to ?, so repeated lookups of different rows match"""
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """execute_wrapper that counts statements, their time and their fingerprints"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def repeated(self, threshold=REPEAT_THRESHOLD):
+        """[(fingerprint, count)] for statement shapes run at least threshold times, most frequent first"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+    @property
+    def duplicates(self):
+        """Statements beyond the first of each shape"""
+        return self.count - len(self.fingerprints)
+
+    def summary(self, limit=5):
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f} ms"]
+        lines += [f"  {count}x {sql[:300]}" for sql, count in self.fingerprints.most_common(limit)]
+        return '\n'.join(lines)
+
+
+@contextmanager
+def assert_query_budget(budget, max_repeats=None):
+    """
+    Fail when the block runs more than `budget` statements, or, if
+    max_repeats is given, any one statement shape more than that many times.
+    """
+    recorder = QueryRecorder()
+    with recorder.record():
+        yield recorder
+    if recorder.count > budget:
+        raise QueryBudgetExceeded(f"Query budget {budget} exceeded: {recorder.summary()}")
+    if max_repeats is not None and recorder.repeated(max_repeats + 1):
+        raise QueryBudgetExceeded(f"A statement repeated more than {max_repeats} times: {recorder.summary()}")
+
+
+def view_budget(view_func):
+    """The query_budget declared on a class-based view, if any"""
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    return getattr(view_class, 'query_budget', None)
+
+
+class QueryCountMiddleware:
+    """Records the SQL issued while handling each request; see the module docstring"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.headers = getattr(settings, 'QUERY_HEADERS', settings.DEBUG)
+        self.strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+
+    def __call__(self, request):
+        recorder = request.query_recorder = QueryRecorder()
+        request.query_budget = None
+        with recorder.record():
+            response = self.get_response(request)
+        self.report(request, response, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = view_budget(view_func)
+
+    def report(self, request, response, recorder):
+        budget = request.query_budget
+        repeated = recorder.repeated()
+        if repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: %s", request.method, request.path,
+                '; '.join(f"{count}x {sql[:200]}" for sql, count in repeated),
+            )
+        if budget is not None and recorder.count > budget:
+            message = f"{request.method} {request.path} ran {recorder.count} queries, budget {budget}"
+            if self.strict:
+                raise QueryBudgetExceeded(f"{message}: {recorder.summary()}")
+            logger.warning(message)
+
+        if self.headers:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['X-DB-Time-Ms'] = f"{recorder.duration * 1000:.2f}"
+            response['X-DB-Duplicate-Queries'] = str(recorder.duplicates)
+            if budget is not None:
+                response['X-DB-Query-Budget'] = str(budget)
+            if repeated:
+                sql, count = repeated[0]
+                response['X-DB-Top-Repeated'] = f"{count}x {sql[:200]}"
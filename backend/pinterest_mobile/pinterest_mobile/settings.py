@@ -62,6 +62,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'pinterest_mobile.metrics.MetricsMiddleware',
+    'pinterest_mobile.queries.QueryCountMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -72,6 +74,21 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request SQL instrumentation (see pinterest_mobile/queries.py).
+# QUERY_HEADERS adds X-DB-* headers; set it in staging. QUERY_BUDGET_STRICT
+# turns a view going over its query_budget into an error; set it in tests.
+QUERY_HEADERS = os.getenv('QUERY_HEADERS', str(DEBUG)).lower() == 'true'
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'false').lower() == 'true'
+QUERY_REPEAT_THRESHOLD = 3
+
+# Request metrics (see pinterest_mobile/metrics.py). Every worker writes a
+# snapshot to METRICS_DIR; /metrics sums them. Scrapes must send
+# `Authorization: Bearer <METRICS_TOKEN>`; without a token /metrics is only
+# served when DEBUG is on.
+METRICS_DIR = os.getenv('METRICS_DIR', str(BASE_DIR / '.metrics'))
+METRICS_FLUSH_SECONDS = 5
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -113,21 +130,63 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'content.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_RATES': {
+        # Availability checks are unauthenticated; this caps account enumeration per client IP.
+        'availability': os.getenv('AVAILABILITY_THROTTLE_RATE', '30/min'),
+    },
 }
 
+# Skip the Django session on login and rely on the JWT cookies alone
+AUTH_STATELESS_LOGIN = os.getenv('AUTH_STATELESS_LOGIN', 'false').lower() == 'true'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(weeks=54),
+    # User's primary key is user_id; `id` is only a read-only property
+    'USER_ID_FIELD': 'user_id',
 }
 
+# Home timeline fan-out (see social/timeline.py)
+TIMELINE_FANOUT_MAX_FOLLOWERS = int(os.getenv('TIMELINE_FANOUT_MAX_FOLLOWERS', 10000))
+TIMELINE_BACKFILL_PINS = 100
+TIMELINE_MAX_ENTRIES = 1000
+
+# Trending pins (see content/trending.py)
+TRENDING_HALF_LIFE_HOURS = 12
+TRENDING_WEIGHTS = {'like': 1.0, 'save': 2.0, 'comment': 1.5}
+TRENDING_TOP_N = 100
+
+# Related pins (see content/related.py)
+RELATED_PINS_TOP_K = 20
+RELATED_PINS_WEIGHTS = {'like': 1.0, 'save': 2.0}
+
+# "For You" recommendations (see social/recommendations.py)
+FOR_YOU_TTL_SECONDS = 30 * 60
+FOR_YOU_LIST_SIZE = 500
+
 WSGI_APPLICATION = 'pinterest_mobile.wsgi.application'
 ASGI_APPLICATION = 'pinterest_mobile.asgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection management. With DB_POOL (the default) each process keeps a
+# psycopg_pool of connections that requests borrow and return; this is what
+# works under daphne/ASGI, where a persistent connection would be tied to a
+# single request thread. DB_POOL=false keeps one connection per thread for
+# DB_CONN_MAX_AGE seconds instead, which suits a threaded WSGI server.
+# Either way connections are health-checked before reuse.
+DB_POOL = os.getenv('DB_POOL', 'true').lower() == 'true'
+DB_POOL_OPTIONS = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),  # Seconds a request waits for a free connection
+    'max_idle': 300,
+    'max_lifetime': 1800,
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -136,9 +195,50 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'pool': DB_POOL_OPTIONS} if DB_POOL else {},
     },
 }
 
+# Shared cache tier (see pinterest_mobile/cache.py for the key scheme).
+# CACHE_BACKEND: redis (production), db, file (default) or locmem (single process only)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file')
+
+CACHE_BACKENDS = {
+    'redis': ('django.core.cache.backends.redis.RedisCache', os.getenv('CACHE_URL', 'redis://127.0.0.1:6379/0')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'django_cache'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.getenv('CACHE_DIR', str(BASE_DIR / '.cache'))),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'pinterest-mobile'),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': CACHE_BACKENDS[CACHE_BACKEND][1],
+        'KEY_PREFIX': 'pm',
+        'TIMEOUT': 300,
+    },
+}
+
+# Channel layer for realtime notifications (see social/notifications.py).
+# CHANNEL_BACKEND: memory (default, single process) or redis (channels-redis, across workers)
+CHANNEL_BACKEND = os.getenv('CHANNEL_BACKEND', 'memory')
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {'hosts': [os.getenv('CHANNEL_URL', 'redis://127.0.0.1:6379/1')], 'capacity': 1000},
+    } if CHANNEL_BACKEND == 'redis' else {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'CONFIG': {'capacity': 1000},
+    },
+}
+
+# Notifications arriving within this window go out in one WebSocket frame
+NOTIFICATIONS_FLUSH_SECONDS = 0.05
+NOTIFICATIONS_MAX_BATCH = 50
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
@@ -147,6 +247,12 @@ EMAIL_USE_SSL = False
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 
+# Outgoing mail is queued in outbound_emails and sent by `manage.py send_queued_email`
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BATCH_SIZE = 50
+# Sent and failed messages (they hold OTPs) are deleted this long after being queued.
+EMAIL_OUTBOX_RETENTION_SECONDS = 3600
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
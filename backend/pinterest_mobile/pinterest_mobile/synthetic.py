@@ -0,0 +1,404 @@
+"""
+Synthetic data at configurable scale, for load tests and local profiling.
+
+Shapes follow what a real pin-sharing service looks like rather than
+uniform noise:
+
+- who gets followed, liked and saved is heavy-tailed: users get a Zipf
+  popularity rank, follow targets are drawn by it, and a pin's chance of
+  engagement is its author's popularity times a Pareto draw of its own;
+- out-degrees (follows, likes, saves) are log-normal, and pins per user
+  Pareto-distributed, so most accounts are quiet and a few are very busy;
+- comment threads nest up to MAX_COMMENT_DEPTH levels, with a reply
+  attaching to any earlier comment on the same pin;
+- every timestamp falls in the last ``days`` days and after the things it
+  depends on (a like after its pin, a pin after its board and user).
+
+Rows are written with bulk_create, which skips signals, so ``refresh_derived``
+rebuilds counters, covers, the search index, timelines, trending and related
+pins afterwards. Every synthetic account's username starts with PREFIX and
+shares SYNTHETIC_PASSWORD, which is how ``clear`` and the benchmarks find them.
+"""
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import slugify
+from content.models import Board, Category, Pin, PinSave
+from social import threads
+from social.models import BoardFollow, Comment, PinLike, UserFollow
+from user_management.models import User
+
+PREFIX = 'synth_'
+SYNTHETIC_PASSWORD = 'Synthetic@12345'
+MAX_COMMENT_DEPTH = 4
+ACTIVE_FRACTION = 0.3  # Users with a last_login in the past week
+PRIVATE_BOARD_FRACTION = 0.1
+
+CATEGORIES = [
+    'Home Decor', 'Recipes', 'Travel', 'Fashion', 'Art', 'Photography',
+    'DIY', 'Gardening', 'Fitness', 'Architecture', 'Quotes', 'Animals',
+]
+WORDS = [
+    'cozy', 'minimal', 'vintage', 'bright', 'rustic', 'modern', 'summer', 'winter',
+    'easy', 'classic', 'bold', 'soft', 'coastal', 'urban', 'handmade', 'weekend',
+    'ideas', 'inspiration', 'board', 'look', 'guide', 'moodboard', 'palette', 'notes',
+]
+COMMENTS = [
+    'Love this!', 'Saving for later.', 'Where is this from?', 'So pretty.',
+    'Trying this weekend.', 'Great idea, thanks for sharing.', 'Beautiful colors.',
+]
+
+
+@contextmanager
+def backdated(*models):
+    """Let bulk_create keep the created_at/updated_at values we set instead of now()"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    try:
+        for field in fields:
+            field.auto_now = field.auto_now_add = False
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def zipf_weights(count, exponent=1.1):
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def sample_pairs(rng, sources, weights, degrees):
+    """(source, target) index pairs: each source i draws degrees[i] targets by weight, no self-pairs or duplicates"""
+    owners = np.repeat(sources, degrees)
+    targets = rng.choice(len(weights), size=len(owners), p=weights)
+    keep = owners != targets
+    keys = np.unique(owners[keep] * len(weights) + targets[keep])
+    return keys // len(weights), keys % len(weights)
+
+
+class Generator:
+    """Writes one batch of synthetic users and everything hanging off them"""
+
+    def __init__(self, seed=0, days=90, batch_size=2000, now=None, log=None):
+        self.rng = np.random.default_rng(seed)
+        self.now = (now or timezone.now()).timestamp()
+        self.start = self.now - days * 86400
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.counts = {}
+
+    def when(self, after):
+        """A random moment between each `after` timestamp and now"""
+        after = np.maximum(np.asarray(after, dtype=np.float64), self.start)
+        return after + self.rng.random(after.shape) * (self.now - after)
+
+    def degrees(self, count, mean, high):
+        """Log-normal sizes with the given mean, clipped to [0, high]"""
+        sigma = 1.0
+        values = self.rng.lognormal(np.log(max(mean, 1e-9)) - sigma ** 2 / 2, sigma, size=count)
+        return np.clip(np.rint(values), 0, high).astype(np.int64)
+
+    def insert(self, model, objects):
+        objects = list(objects)
+        for start in range(0, len(objects), self.batch_size):
+            model.objects.bulk_create(objects[start:start + self.batch_size])
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(objects)
+        self.log(f"{len(objects)} {model._meta.verbose_name_plural}")
+
+    def run(self, users=1000, boards_per_user=3, pins_per_user=10, follows_per_user=20,
+            board_follows_per_user=2, likes_per_user=30, saves_per_user=5, comments=2000):
+        models = (User, Board, Pin, UserFollow, BoardFollow, PinLike, PinSave, Comment)
+        with backdated(*models), transaction.atomic():
+            self.make_users(users)
+            self.make_categories()
+            self.make_boards(boards_per_user)
+            self.make_pins(pins_per_user)
+            self.make_follows(follows_per_user, board_follows_per_user)
+            self.make_engagement(likes_per_user, saves_per_user)
+            self.make_comments(comments)
+        return self.counts
+
+    def make_users(self, count):
+        offset = User.objects.filter(username__startswith=PREFIX).count()
+        password = make_password(SYNTHETIC_PASSWORD)
+        self.user_ids = [uuid.uuid4() for _ in range(count)]
+        self.user_created = self.when(np.full(count, self.start))
+        # Popularity rank is independent of signup order.
+        self.user_weights = zipf_weights(count)[self.rng.permutation(count)]
+        active = self.rng.random(count) < ACTIVE_FRACTION
+        last_login = self.when(np.maximum(self.user_created, self.now - 7 * 86400))
+        self.insert(User, (
+            User(
+                user_id=self.user_ids[i],
+                username=f"{PREFIX}{offset + i:07d}",
+                email=f"{PREFIX}{offset + i:07d}@example.com",
+                password=password,
+                first_name='Synthetic',
+                last_name=f"User {offset + i}",
+                is_verified=True,
+                last_login=stamp(last_login[i]) if active[i] else None,
+                created_at=stamp(self.user_created[i]),
+                updated_at=stamp(self.user_created[i]),
+            )
+            for i in range(count)
+        ))
+
+    def make_categories(self):
+        existing = dict(Category.objects.values_list('slug', 'id'))
+        missing = [name for name in CATEGORIES if slugify(name) not in existing]
+        Category.objects.bulk_create([Category(name=name, slug=slugify(name)) for name in missing])
+        categories = list(Category.objects.filter(is_active=True).values_list('id', 'name'))
+        self.category_ids = [pk for pk, _ in categories]
+        self.category_names = [name for _, name in categories]
+
+    def make_boards(self, per_user):
+        users = len(self.user_ids)
+        per_user_counts = 1 + self.rng.poisson(max(per_user - 1, 0), size=users)
+        self.board_owner = np.repeat(np.arange(users), per_user_counts)
+        self.board_start = np.concatenate([[0], np.cumsum(per_user_counts)[:-1]])
+        self.board_count = per_user_counts
+        total = len(self.board_owner)
+        self.board_ids = [uuid.uuid4() for _ in range(total)]
+        self.board_created = self.when(self.user_created[self.board_owner])
+        self.board_category = self.rng.integers(len(self.category_ids), size=total)
+        self.board_private = self.rng.random(total) < PRIVATE_BOARD_FRACTION
+        words = self.rng.integers(len(WORDS), size=(total, 2))
+        self.insert(Board, (
+            Board(
+                id=self.board_ids[i],
+                user_id=self.user_ids[self.board_owner[i]],
+                title=f"{WORDS[words[i, 0]]} {WORDS[words[i, 1]]}".title(),
+                is_private=bool(self.board_private[i]),
+                created_at=stamp(self.board_created[i]),
+                updated_at=stamp(self.board_created[i]),
+            )
+            for i in range(total)
+        ))
+
+    def make_pins(self, per_user):
+        users = len(self.user_ids)
+        activity = self.rng.pareto(1.5, size=users) + 1
+        counts = self.rng.poisson(per_user * activity / activity.mean())
+        owners = np.repeat(np.arange(users), counts)
+        total = len(owners)
+        boards = self.board_start[owners] + (self.rng.random(total) * self.board_count[owners]).astype(np.int64)
+        categories = np.where(
+            self.rng.random(total) < 0.8, self.board_category[boards],
+            self.rng.integers(len(self.category_ids), size=total),
+        )
+        widths = self.rng.integers(600, 1201, size=total)
+        heights = np.rint(widths * self.rng.uniform(0.6, 2.0, size=total)).astype(np.int64)
+        colors = self.rng.integers(0, 0x1000000, size=total)
+        words = self.rng.integers(len(WORDS), size=(total, 3))
+
+        self.pin_ids = [uuid.uuid4() for _ in range(total)]
+        self.pin_owner = owners
+        self.pin_created = self.when(self.board_created[boards])
+        self.pin_public = ~self.board_private[boards]
+        weights = self.user_weights[owners] * (self.rng.pareto(1.2, size=total) + 1) * self.pin_public
+        self.pin_weights = weights / weights.sum() if weights.sum() else weights
+
+        def pin(i):
+            category = self.category_names[categories[i]]
+            return Pin(
+                id=self.pin_ids[i],
+                user_id=self.user_ids[owners[i]],
+                board_id=self.board_ids[boards[i]],
+                category_id=self.category_ids[categories[i]],
+                title=f"{WORDS[words[i, 0]]} {WORDS[words[i, 1]]} {category}".capitalize(),
+                description=f"{WORDS[words[i, 2]].capitalize()} {category.lower()} ideas.",
+                image_url=f"https://picsum.photos/seed/{self.pin_ids[i].hex[:12]}/{widths[i]}/{heights[i]}",
+                width=int(widths[i]),
+                height=int(heights[i]),
+                dominant_color=f"#{colors[i]:06x}",
+                created_at=stamp(self.pin_created[i]),
+                updated_at=stamp(self.pin_created[i]),
+            )
+
+        self.insert(Pin, (pin(i) for i in range(total)))
+
+    def make_follows(self, per_user, board_follows_per_user):
+        users = len(self.user_ids)
+        followers, following = sample_pairs(
+            self.rng, np.arange(users), self.user_weights, self.degrees(users, per_user, users - 1)
+        )
+        created = self.when(np.maximum(self.user_created[followers], self.user_created[following]))
+        self.insert(UserFollow, (
+            UserFollow(
+                follower_id=self.user_ids[a], following_id=self.user_ids[b],
+                created_at=stamp(t),
+            )
+            for a, b, t in zip(followers.tolist(), following.tolist(), created.tolist())
+        ))
+
+        public = np.flatnonzero(~self.board_private)
+        if not len(public):
+            return
+        weights = self.user_weights[self.board_owner[public]]
+        followers, boards = sample_pairs(
+            self.rng, np.arange(users), weights / weights.sum(),
+            self.degrees(users, board_follows_per_user, len(public)),
+        )
+        boards = public[boards]
+        own = self.board_owner[boards] == followers
+        followers, boards = followers[~own], boards[~own]
+        created = self.when(np.maximum(self.user_created[followers], self.board_created[boards]))
+        self.insert(BoardFollow, (
+            BoardFollow(user_id=self.user_ids[u], board_id=self.board_ids[b], created_at=stamp(t))
+            for u, b, t in zip(followers.tolist(), boards.tolist(), created.tolist())
+        ))
+
+    def engaged(self, per_user):
+        """(user, pin) index pairs drawn by pin popularity, excluding users' own pins"""
+        users = len(self.user_ids)
+        if not len(self.pin_ids) or not self.pin_weights.sum():
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        degrees = self.degrees(users, per_user, len(self.pin_ids))
+        owners = np.repeat(np.arange(users), degrees)
+        pins = self.rng.choice(len(self.pin_ids), size=len(owners), p=self.pin_weights)
+        keys = np.unique(owners * len(self.pin_ids) + pins)
+        owners, pins = keys // len(self.pin_ids), keys % len(self.pin_ids)
+        keep = self.pin_owner[pins] != owners
+        return owners[keep], pins[keep]
+
+    def make_engagement(self, likes_per_user, saves_per_user):
+        users, pins = self.engaged(likes_per_user)
+        created = self.when(np.maximum(self.user_created[users], self.pin_created[pins]))
+        self.insert(PinLike, (
+            PinLike(user_id=self.user_ids[u], pin_id=self.pin_ids[p], created_at=stamp(t))
+            for u, p, t in zip(users.tolist(), pins.tolist(), created.tolist())
+        ))
+
+        users, pins = self.engaged(saves_per_user)
+        boards = self.board_start[users] + (self.rng.random(len(users)) * self.board_count[users]).astype(np.int64)
+        created = self.when(np.maximum(self.board_created[boards], self.pin_created[pins]))
+        self.insert(PinSave, (
+            PinSave(
+                user_id=self.user_ids[u], pin_id=self.pin_ids[p], board_id=self.board_ids[b],
+                created_at=stamp(t),
+            )
+            for u, p, b, t in zip(users.tolist(), pins.tolist(), boards.tolist(), created.tolist())
+        ))
+
+    def make_comments(self, count):
+        if not count or not len(self.pin_ids) or not self.pin_weights.sum():
+            return
+        pins = self.rng.choice(len(self.pin_ids), size=count, p=self.pin_weights)
+        authors = self.rng.choice(len(self.user_ids), size=count, p=self.user_weights)
+        texts = self.rng.integers(len(COMMENTS), size=count)
+        reply = self.rng.random(count) < 0.5
+        picks = self.rng.random(count)
+
+        # Comments on a pin are created in time order, so a reply always
+        # comes after the comment it answers.
+        order = np.lexsort((self.rng.random(count), pins))
+        created = self.when(np.maximum(self.pin_created[pins], self.user_created[authors]))
+        comments, thread = [], []
+        for position, i in enumerate(order.tolist()):
+            if position == 0 or pins[order[position - 1]] != pins[i]:
+                thread = []
+                moment = created[i]
+            else:
+                moment = max(created[i], thread[-1].created_at.timestamp() + 1)
+            parents = [c for c in thread if c.depth < MAX_COMMENT_DEPTH]
+            parent = parents[int(picks[i] * len(parents))] if reply[i] and parents else None
+            comment = Comment(
+                id=uuid.uuid4(),
+                user_id=self.user_ids[authors[i]],
+                pin_id=self.pin_ids[pins[i]],
+                parent=parent,
+                content=COMMENTS[texts[i]],
+                created_at=stamp(min(moment, self.now)),
+                updated_at=stamp(min(moment, self.now)),
+            )
+            threads.assign_path(comment)
+            if parent is not None:
+                parent.reply_count += 1
+            thread.append(comment)
+            comments.append(comment)
+        self.insert(Comment, comments)
+
+
+def stamp(seconds):
+    return datetime.fromtimestamp(float(seconds), tz=dt_timezone.utc)
+
+
+def refresh_derived(log=None):
+    """Rebuild everything the bulk inserts skipped; returns {step: result}"""
+    from content import boards, counters, related, search, trending
+    from social import follow_counts, timeline
+
+    log = log or (lambda message: None)
+    steps = [
+        ('counters', lambda: counters.reconcile()),
+        ('follow_counts', lambda: follow_counts.recompute()),
+        ('board_covers', lambda: boards.refresh_covers()),
+        ('search_index', lambda: search.index_pins(Pin.objects.all())),
+        ('pull_sources', lambda: timeline.refresh_pull_sources()),
+        ('timelines', lambda: sum(
+            timeline.rebuild_timeline(user)
+            for user in User.objects.filter(username__startswith=PREFIX).iterator(chunk_size=500)
+        )),
+        ('trending', lambda: trending.refresh()),
+        ('related_pins', lambda: related.refresh(full=True)),
+    ]
+    results = {}
+    for name, step in steps:
+        results[name] = step()
+        log(f"Refreshed {name}")
+    return results
+
+
+def endpoint_targets(users, samples):
+    """{name: [(path, needs_auth)]} with a spread of ids drawn from the synthetic data"""
+    usernames = [user.username for user in users]
+    pins = [str(pk) for pk in Pin.objects.filter(
+        user__in=users, board__is_private=False
+    ).order_by('-like_count').values_list('id', flat=True)[:samples]]
+    boards = [str(pk) for pk in Board.objects.filter(
+        user__in=users, is_private=False
+    ).order_by('-pin_count').values_list('id', flat=True)[:samples]]
+    categories = list(Category.objects.filter(is_active=True).values_list('slug', flat=True)[:samples])
+    comments = [str(pk) for pk in Comment.objects.filter(
+        pin_id__in=pins, depth=0, reply_count__gt=0
+    ).values_list('id', flat=True)[:samples]]
+    terms = ['cozy', 'modern recipes', 'travel', 'vintage art', 'summer ideas']
+
+    targets = {
+        'pin_feed': [('/api/content/pins/feed', False)],
+        'pin_detail': [(f'/api/content/pins/{pk}', False) for pk in pins],
+        'related_pins': [(f'/api/content/pins/{pk}/related', False) for pk in pins],
+        'trending': [('/api/content/pins/trending', False)],
+        'search': [(f'/api/content/pins/search?q={term.replace(" ", "+")}', False) for term in terms],
+        'board_detail': [(f'/api/content/boards/{pk}', False) for pk in boards],
+        'board_pins': [(f'/api/content/boards/{pk}/pins', False) for pk in boards],
+        'category_pins': [(f'/api/content/categories/{slug}/pins', False) for slug in categories],
+        'profile': [(f'/api/users/{name}', False) for name in usernames],
+        'profile_boards': [(f'/api/content/users/{name}/boards', False) for name in usernames],
+        'pin_comments': [(f'/api/social/pins/{pk}/comments', False) for pk in pins],
+        'comment_replies': [(f'/api/social/comments/{pk}/replies', False) for pk in comments],
+        'home_feed': [('/api/social/feed/home', True)],
+        'for_you': [('/api/social/feed/for-you', True)],
+    }
+    return {name: paths for name, paths in targets.items() if paths}
+
+
+def clear():
+    """Delete every synthetic user; their boards, pins and engagement cascade"""
+    deleted, _ = User.objects.filter(username__startswith=PREFIX).delete()
+    return deleted
+
+
+def sample_users(count):
+    """Up to count synthetic users, recently active ones first"""
+    users = User.objects.filter(username__startswith=PREFIX, is_active=True)
+    return list(users.order_by(F('last_login').desc(nulls_last=True), 'username')[:count])
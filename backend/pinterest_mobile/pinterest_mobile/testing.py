@@ -0,0 +1,32 @@
+"""
+Shared test helpers.
+
+QueryBudgetTestCase calls endpoints the way a client would, anonymously or
+with a JWT, so the token's user lookup is counted against the view's
+``query_budget`` like it is in production.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from .queries import assert_query_budget
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class QueryBudgetTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path, user=None, **extra):
+        if user is not None:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(user)}'
+        return self.client.get(path, **extra)
+
+    def assertWithinBudget(self, view_class, path, user=None, status=200):
+        """GET path as user (anonymous when None) within view_class.query_budget statements"""
+        with assert_query_budget(view_class.query_budget):
+            response = self.get(path, user)
+        self.assertEqual(response.status_code, status, path)
+        return response
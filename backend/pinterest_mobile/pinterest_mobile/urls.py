@@ -16,10 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('user_management.urls')),
     path('api/social/', include('social.urls')),
     path('api/content/', include('content.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
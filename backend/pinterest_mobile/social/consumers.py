@@ -0,0 +1,46 @@
+import asyncio
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from . import notifications
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """Pushes the connected user's like, comment and follow events as batched frames"""
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+        self.group = notifications.group_name(user.user_id)
+        self.pending = []
+        self.flush_task = None
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if not hasattr(self, 'group'):
+            return
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+        await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def notify_batch(self, message):
+        self.pending.extend(message['events'])
+        if len(self.pending) >= notifications.MAX_BATCH:
+            await self.flush()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(notifications.FLUSH_INTERVAL)
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        events, self.pending = self.pending, []
+        if events:
+            await self.send_json({'type': 'notifications', 'events': events})
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from content.counters import FLUSH_BATCH_SIZE, count_of, update_in_batches
+from content.models import Board
+from user_management.models import User
+from .models import UserFollow, BoardFollow
+
+# Unlike likes and saves, follows are rare enough per row to update the
+# counts in place, from the UserFollow/BoardFollow signals. The counts only
+# commit or roll back with the follow row when both run in one transaction:
+# write follows through follow_user/unfollow_user/follow_board/unfollow_board,
+# or inside transaction.atomic(). recompute repairs any drift.
+
+
+def follow_user(follower, following):
+    """Follow a user and update both counts atomically; returns (follow, created)"""
+    with transaction.atomic():
+        return UserFollow.objects.get_or_create(follower=follower, following=following)
+
+
+def unfollow_user(follower, following):
+    """Remove a user follow and update both counts atomically; returns whether one existed"""
+    with transaction.atomic():
+        deleted, _ = UserFollow.objects.filter(follower=follower, following=following).delete()
+    return bool(deleted)
+
+
+def follow_board(user, board):
+    """Follow a board and update its count atomically; returns (follow, created)"""
+    with transaction.atomic():
+        return BoardFollow.objects.get_or_create(user=user, board=board)
+
+
+def unfollow_board(user, board):
+    """Remove a board follow and update its count atomically; returns whether one existed"""
+    with transaction.atomic():
+        deleted, _ = BoardFollow.objects.filter(user=user, board=board).delete()
+    return bool(deleted)
+
+
+def adjust(model, pk, field, delta):
+    model.objects.filter(pk=pk).update(**{field: Greatest(F(field) + delta, Value(0))})
+
+
+def user_followed(follow, delta):
+    adjust(User, follow.follower_id, 'following_count', delta)
+    adjust(User, follow.following_id, 'follower_count', delta)
+
+
+def board_followed(follow, delta):
+    adjust(Board, follow.board_id, 'follower_count', delta)
+
+
+def recompute(batch_size=FLUSH_BATCH_SIZE):
+    """Recount follower/following counts from the follow tables, in primary key batches"""
+    return {
+        'User': update_in_batches(User, {
+            'follower_count': count_of(UserFollow, 'following'),
+            'following_count': count_of(UserFollow, 'follower'),
+        }, batch_size),
+        'Board': update_in_batches(Board, {'follower_count': count_of(BoardFollow, 'board')}, batch_size),
+    }
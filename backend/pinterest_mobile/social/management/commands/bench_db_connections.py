@@ -0,0 +1,107 @@
+import json
+import random
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+from pinterest_mobile import synthetic
+from pinterest_mobile.benchmark import run_concurrent
+from pinterest_mobile.metrics import pool_stats
+
+# Connection settings per mode, applied to DATABASES['default'] in place.
+MODES = {
+    'new_connection': {'CONN_MAX_AGE': 0, 'pool': None},
+    'persistent': {'CONN_MAX_AGE': 60, 'pool': None},
+    'pool': {'CONN_MAX_AGE': 0, 'pool': {}},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare in-process request throughput with a new database connection per request, persistent "
+        "per-thread connections (CONN_MAX_AGE) and a psycopg_pool connection pool. Pool mode needs "
+        "PostgreSQL. Run generate_synthetic_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', action='append', choices=sorted(MODES), default=[], help="Modes to run (repeatable). Defaults to all.")
+        parser.add_argument('--endpoint', default='pin_detail', help="bench_endpoints endpoint name to request.")
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--pool-size', type=int, help="Pool max_size; defaults to --concurrency.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        modes = options['mode'] or list(MODES)
+        if 'pool' in modes and connections['default'].vendor != 'postgresql':
+            raise CommandError("Connection pooling needs PostgreSQL; pass --mode new_connection --mode persistent to compare the others.")
+        users = synthetic.sample_users(50)
+        targets = synthetic.endpoint_targets(users, 50).get(options['endpoint'])
+        if not targets:
+            raise CommandError(f"No {options['endpoint']} targets; run manage.py generate_synthetic_data first.")
+        paths = [path for path, needs_auth in targets if not needs_auth]
+        if not paths:
+            raise CommandError("Pick an endpoint that does not need authentication.")
+
+        rng = random.Random(options['seed'])
+        pool_options = {
+            'min_size': 1,
+            'max_size': options['pool_size'] or options['concurrency'],
+            'timeout': 30,
+        }
+        settings_dict = connections.settings['default']
+        original = {
+            'CONN_MAX_AGE': settings_dict.get('CONN_MAX_AGE', 0),
+            'OPTIONS': dict(settings_dict.get('OPTIONS', {})),
+        }
+
+        runs = {}
+        try:
+            for mode in modes:
+                self.configure(settings_dict, MODES[mode], pool_options)
+                runs[mode] = run_concurrent(
+                    lambda: self.request(rng.choice(paths)),
+                    options['requests'], options['concurrency'], options['warmup'],
+                )
+                if mode == 'pool':
+                    runs[mode]['pool'] = pool_stats().get('default', {})
+                self.stderr.write(f"{mode}: {runs[mode]['throughput_per_s']}/s, p99 {runs[mode]['p99_ms']} ms")
+        finally:
+            self.close(settings_dict)
+            settings_dict['CONN_MAX_AGE'] = original['CONN_MAX_AGE']
+            settings_dict['OPTIONS'] = original['OPTIONS']
+
+        if 'new_connection' in runs:
+            base = runs['new_connection']['throughput_per_s']
+            for mode, run in runs.items():
+                run['speedup'] = round(run['throughput_per_s'] / base, 2) if base else None
+        self.stdout.write(json.dumps({
+            'benchmark': 'db_connections',
+            'endpoint': options['endpoint'],
+            'concurrency': options['concurrency'],
+            'runs': runs,
+        }, indent=2))
+
+    def request(self, path):
+        # The test client detaches close_old_connections from the request
+        # signals; call it around the request like a real server would, so
+        # each mode opens, keeps or returns connections as it would in production.
+        close_old_connections()
+        try:
+            return Client().get(path).status_code == 200
+        finally:
+            close_old_connections()
+
+    def configure(self, settings_dict, mode, pool_options):
+        """Switch every thread's future connections to mode, dropping the current ones"""
+        self.close(settings_dict)
+        settings_dict['CONN_MAX_AGE'] = mode['CONN_MAX_AGE']
+        options = {key: value for key, value in settings_dict.get('OPTIONS', {}).items() if key != 'pool'}
+        if mode['pool'] is not None:
+            options['pool'] = {**pool_options, **mode['pool']}
+        settings_dict['OPTIONS'] = options
+
+    def close(self, settings_dict):
+        connections.close_all()
+        if settings_dict.get('OPTIONS', {}).get('pool'):
+            connections['default'].close_pool()
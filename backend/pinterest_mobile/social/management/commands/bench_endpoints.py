@@ -0,0 +1,83 @@
+import json
+import random
+import urllib.error
+import urllib.request
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+from pinterest_mobile import synthetic
+from pinterest_mobile.benchmark import compare, run_concurrent
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the read API at fixed concurrency, in-process or against a running server, and report "
+        "throughput and p50/p95/p99 per endpoint as JSON. Run generate_synthetic_data first; authenticated "
+        "endpoints are called as a sample of synthetic users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--endpoint', action='append', default=[], help="Only run this endpoint (repeatable).")
+        parser.add_argument('--base-url', help="Benchmark a running server, e.g. http://127.0.0.1:8000. It must share this database and SECRET_KEY. Defaults to in-process requests.")
+        parser.add_argument('--sample-users', type=int, default=50, help="Synthetic users to spread requests across.")
+        parser.add_argument('--samples', type=int, default=50, help="Distinct pins, boards and comments per endpoint.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Also write the JSON report to this file.")
+        parser.add_argument('--baseline', help="A previous --output report; adds per-endpoint ratios against it.")
+
+    def handle(self, *args, **options):
+        users = synthetic.sample_users(options['sample_users'])
+        if not users:
+            raise CommandError("No synthetic users; run manage.py generate_synthetic_data first.")
+        tokens = [str(AccessToken.for_user(user)) for user in users]
+        targets = synthetic.endpoint_targets(users, options['samples'])
+        if options['endpoint']:
+            unknown = set(options['endpoint']) - set(targets)
+            if unknown:
+                raise CommandError(f"Unknown or empty endpoints: {', '.join(sorted(unknown))}. Available: {', '.join(targets)}.")
+            targets = {name: targets[name] for name in options['endpoint']}
+
+        rng = random.Random(options['seed'])
+        send = self.http_get if options['base_url'] else self.client_get
+        endpoints = {}
+        for name, paths in targets.items():
+            def operation(paths=paths):
+                path, needs_auth = rng.choice(paths)
+                token = rng.choice(tokens) if needs_auth else None
+                return send(options['base_url'], path, token)
+
+            endpoints[name] = run_concurrent(operation, options['requests'], options['concurrency'], options['warmup'])
+            self.stderr.write(f"{name}: {endpoints[name]['throughput_per_s']}/s, p99 {endpoints[name]['p99_ms']} ms")
+
+        report = {
+            'benchmark': 'endpoints',
+            'mode': 'http' if options['base_url'] else 'in_process',
+            'concurrency': options['concurrency'],
+            'requests_per_endpoint': options['requests'],
+            'endpoints': endpoints,
+        }
+        if options['baseline']:
+            with open(options['baseline']) as handle:
+                report['compared_to_baseline'] = compare(endpoints, json.load(handle)['endpoints'])
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
+
+    def client_get(self, base_url, path, token):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        return Client().get(path, **headers).status_code == 200
+
+    def http_get(self, base_url, path, token):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        request = urllib.request.Request(base_url.rstrip('/') + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                return response.status == 200
+        except urllib.error.HTTPError:
+            return False
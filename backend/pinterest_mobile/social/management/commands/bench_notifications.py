@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand
+from pinterest_mobile.benchmark import percentile
+from social import notifications
+from social.routing import websocket_urlpatterns
+
+
+class BenchUser:
+    is_authenticated = True
+
+    def __init__(self):
+        self.user_id = uuid.uuid4()
+
+
+async def drain(communicator, received):
+    while True:
+        # A long timeout: receive_output stops the consumer when it times out.
+        message = await communicator.receive_output(timeout=3600)
+        frame = json.loads(message['text'])
+        now = time.perf_counter()
+        received['frames'] += 1
+        for event in frame['events']:
+            received['latencies'].append(now - event['sent_at'])
+
+
+async def run_load(connections, events, publish_batch, timeout):
+    """Publish events round-robin to connected sockets and time their delivery"""
+    application = URLRouter(websocket_urlpatterns)
+    layer = get_channel_layer()
+    clients = []
+    for _ in range(connections):
+        user = BenchUser()
+        communicator = WebsocketCommunicator(application, '/ws/notifications')
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        if not connected:
+            raise RuntimeError("Notification socket refused the connection.")
+        clients.append((user.user_id, communicator))
+
+    received = {'frames': 0, 'latencies': []}
+    drains = [asyncio.create_task(drain(communicator, received)) for _, communicator in clients]
+    layer_messages = 0
+    started = time.perf_counter()
+    for start in range(0, events, publish_batch):
+        items = [
+            (clients[seq % connections][0], {'kind': 'like', 'seq': seq, 'sent_at': time.perf_counter()})
+            for seq in range(start, min(events, start + publish_batch))
+        ]
+        layer_messages += await notifications.publish_async(items, layer)
+        await asyncio.sleep(0)
+
+    deadline = started + timeout
+    while len(received['latencies']) < events and time.perf_counter() < deadline:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+
+    for task in drains:
+        task.cancel()
+    await asyncio.gather(*drains, return_exceptions=True)
+    for _, communicator in clients:
+        await communicator.disconnect()
+
+    latencies = sorted(received['latencies'])
+    delivered = len(latencies)
+    return {
+        'connections': connections,
+        'events': events,
+        'delivered': delivered,
+        'layer_messages': layer_messages,
+        'frames': received['frames'],
+        'elapsed_s': round(elapsed, 3),
+        'messages_per_s': round(delivered / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def run_worker(args):
+    return asyncio.run(run_load(*args))
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test notification fan-out: publish events through the channel layer to connected "
+        "NotificationConsumers and report delivered messages/sec and latency per worker process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=200, help="Sockets per worker.")
+        parser.add_argument('--events', type=int, default=20000, help="Events per worker.")
+        parser.add_argument('--publish-batch', type=int, default=100, help="Events per publish call.")
+        parser.add_argument('--workers', type=int, default=1, help="Independent worker processes.")
+        parser.add_argument('--timeout', type=float, default=60.0, help="Seconds to wait for delivery.")
+
+    def handle(self, *args, **options):
+        task = (options['connections'], options['events'], options['publish_batch'], options['timeout'])
+        if options['workers'] == 1:
+            runs = [run_worker(task)]
+        else:
+            with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                runs = list(executor.map(run_worker, [task] * options['workers']))
+
+        self.stdout.write(json.dumps({
+            'benchmark': 'notifications',
+            'flush_interval_s': notifications.FLUSH_INTERVAL,
+            'workers': runs,
+            'total_messages_per_s': round(sum(run['messages_per_s'] for run in runs), 2),
+        }, indent=2))
@@ -0,0 +1,57 @@
+import json
+from django.core.management.base import BaseCommand
+from pinterest_mobile import synthetic
+
+# Defaults per --scale; any explicit option overrides its value.
+SCALES = {
+    'small': {'users': 200, 'comments': 500},
+    'medium': {'users': 5000, 'comments': 20000},
+    'large': {'users': 50000, 'comments': 250000},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, a power-law follow graph, boards, pins, skewed likes/saves and nested "
+        "comment threads, then rebuild counters, timelines, search, trending and related pins. "
+        f"Synthetic usernames start with '{synthetic.PREFIX}' and share the password '{synthetic.SYNTHETIC_PASSWORD}'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+        parser.add_argument('--users', type=int)
+        parser.add_argument('--boards-per-user', type=float, default=3)
+        parser.add_argument('--pins-per-user', type=float, default=10)
+        parser.add_argument('--follows-per-user', type=float, default=20)
+        parser.add_argument('--board-follows-per-user', type=float, default=2)
+        parser.add_argument('--likes-per-user', type=float, default=30)
+        parser.add_argument('--saves-per-user', type=float, default=5)
+        parser.add_argument('--comments', type=int, help="Total comments across all pins.")
+        parser.add_argument('--days', type=int, default=90, help="Spread timestamps over this many past days.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true', help="Delete existing synthetic users (and their data) first.")
+        parser.add_argument('--skip-derived', action='store_true', help="Do not rebuild counters, timelines, search, trending or related pins.")
+
+    def handle(self, *args, **options):
+        scale = SCALES[options['scale']]
+        if options['clear']:
+            self.stdout.write(f"Deleted {synthetic.clear()} synthetic rows.")
+
+        generator = synthetic.Generator(
+            seed=options['seed'], days=options['days'], batch_size=options['batch_size'],
+            log=lambda message: self.stdout.write(f"Created {message}"),
+        )
+        counts = generator.run(
+            users=options['users'] or scale['users'],
+            boards_per_user=options['boards_per_user'],
+            pins_per_user=options['pins_per_user'],
+            follows_per_user=options['follows_per_user'],
+            board_follows_per_user=options['board_follows_per_user'],
+            likes_per_user=options['likes_per_user'],
+            saves_per_user=options['saves_per_user'],
+            comments=scale['comments'] if options['comments'] is None else options['comments'],
+        )
+        if not options['skip_derived']:
+            synthetic.refresh_derived(log=self.stdout.write)
+        self.stdout.write(json.dumps({'created': counts}, indent=2))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from user_management.models import User
+from social import timeline
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair materialized home timelines from the current follow graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help="Username or email to rebuild (repeatable). Defaults to all users.")
+        parser.add_argument('--skip-pull-sources', action='store_true', help="Do not recompute which accounts are pulled at read time.")
+
+    def handle(self, *args, **options):
+        if not options['skip_pull_sources']:
+            users, boards = timeline.refresh_pull_sources()
+            self.stdout.write(f"Pull sources: {users} users, {boards} boards above {timeline.FANOUT_MAX_FOLLOWERS} followers.")
+
+        users = User.objects.filter(is_active=True).order_by('created_at')
+        if options['user']:
+            names = options['user']
+            users = users.filter(username__in=names) | users.filter(email__in=names)
+            if not users.exists():
+                raise CommandError(f"No users matched {', '.join(names)}.")
+
+        rebuilt = entries = 0
+        for user in users.iterator(chunk_size=500):
+            entries += timeline.rebuild_timeline(user)
+            rebuilt += 1
+            if rebuilt % 1000 == 0:
+                self.stdout.write(f"Rebuilt {rebuilt} timelines...")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} timelines with {entries} entries."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from social import follow_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute User follower/following counts and Board follower counts from the follow tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=follow_counts.FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        for model, count in follow_counts.recompute(options['batch_size']).items():
+            self.stdout.write(f"Recomputed {count} {model} rows.")
+        self.stdout.write(self.style.SUCCESS("Follow counts recomputed."))
@@ -0,0 +1,26 @@
+import time
+from django.core.management.base import BaseCommand
+from social import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-rank the \"For You\" list of every recently active user into the cache. "
+        "Run it more often than FOR_YOU_TTL_SECONDS so feed requests never score on demand."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help="Users who logged in within this many days.")
+        parser.add_argument('--loop', action='store_true', help="Keep refreshing until interrupted.")
+        parser.add_argument('--interval', type=float, default=recommendations.TTL / 2,
+                            help="Seconds between refreshes with --loop (default: half the TTL).")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            refreshed = recommendations.refresh_active(options['days'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"Ranked recommendations for {refreshed} users in {elapsed:.1f}s.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:06
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_initial'),
+        ('social', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelinePullSource',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('follower_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('board', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_pull_source', to='content.board')),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_pull_source', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'timeline_pull_sources',
+            },
+        ),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('pin_created_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('pin', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='content.pin')),
+            ],
+            options={
+                'db_table': 'timeline_entries',
+                'ordering': ['-pin_created_at', '-pin'],
+                'indexes': [models.Index(fields=['owner', '-pin_created_at', '-pin'], name='timeline_owner_recent_idx'), models.Index(fields=['pin'], name='timeline_en_pin_id_5a6c00_idx')],
+                'unique_together': {('owner', 'pin')},
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:15
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def segment(created_at, pk):
+    # Same scheme as social.threads.segment
+    micros = int(created_at.timestamp() * 1_000_000)
+    return f"{micros:014x}{pk.hex[:4]}"
+
+
+def backfill_paths(apps, schema_editor):
+    Comment = apps.get_model('social', 'Comment')
+    # Roots first, then each level below, so parents always have a path.
+    level = Comment.objects.filter(parent__isnull=True)
+    depth = 0
+    while level.exists():
+        batch = []
+        for comment in level.select_related('parent').iterator(chunk_size=1000):
+            prefix = comment.parent.path if comment.parent_id else ''
+            comment.path = prefix + segment(comment.created_at, comment.pk)
+            comment.depth = depth
+            batch.append(comment)
+            if len(batch) >= 1000:
+                Comment.objects.bulk_update(batch, ['path', 'depth'])
+                batch = []
+        Comment.objects.bulk_update(batch, ['path', 'depth'])
+        depth += 1
+        level = Comment.objects.filter(parent__depth=depth - 1, parent__path__gt='', path='')
+
+    replies = (
+        Comment.objects.filter(parent=OuterRef('pk')).order_by()
+        .values('parent').annotate(total=Count('*')).values('total')
+    )
+    Comment.objects.update(reply_count=Coalesce(Subquery(replies), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0005_pin_search_vector'),
+        ('social', '0003_timeline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['pin', 'path'], name='comments_pin_path_idx'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-18 08:23
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(model, fk):
+    # Same as content.counters.count_of, against the historical models
+    counts = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def backfill_counts(apps, schema_editor):
+    User = apps.get_model('user_management', 'User')
+    Board = apps.get_model('content', 'Board')
+    UserFollow = apps.get_model('social', 'UserFollow')
+    BoardFollow = apps.get_model('social', 'BoardFollow')
+    User.objects.update(
+        follower_count=count_of(UserFollow, 'following'),
+        following_count=count_of(UserFollow, 'follower'),
+    )
+    Board.objects.update(follower_count=count_of(BoardFollow, 'board'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0007_board_follower_count'),
+        ('social', '0004_comment_paths'),
+        ('user_management', '0003_follow_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
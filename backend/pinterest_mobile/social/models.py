@@ -30,7 +30,7 @@ class UserFollow(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.follower.username} follows {self.following.username}"
+        return f"{self.follower_id} follows {self.following_id}"
 
 class BoardFollow(models.Model):
     """Board following relationship"""
@@ -57,7 +57,7 @@ class BoardFollow(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.user.username} follows {self.board.title}"
+        return f"{self.user_id} follows board {self.board_id}"
 
 class PinLike(models.Model):
     """Pin likes"""
@@ -85,7 +85,7 @@ class PinLike(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.user.username} likes pin"
+        return f"{self.user_id} likes pin {self.pin_id}"
 
 class Comment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -111,6 +111,13 @@ class Comment(models.Model):
     
     # Mobile-specific fields
     is_edited = models.BooleanField(default=False)
+
+    # Materialized path: one time-ordered segment per ancestor, so a pin's
+    # whole thread sorts into display order on the (pin, path) index.
+    # Maintained by social.threads on insert.
+    path = models.CharField(max_length=1000, default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    reply_count = models.PositiveIntegerField(default=0)  # Direct replies
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -122,8 +129,66 @@ class Comment(models.Model):
             models.Index(fields=['pin']),
             models.Index(fields=['parent']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['pin', 'path'], name='comments_pin_path_idx'),
         ]
         ordering = ['created_at']
     
     def __str__(self):
-        return f"Comment by {self.user.username}"
\ No newline at end of file
+        return f"Comment by {self.user_id} on pin {self.pin_id}"
+
+class TimelineEntry(models.Model):
+    """Materialized home timeline row, pushed when a followed user or board gets a pin"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        'user_management.User',
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        to_field='user_id'
+    )
+    pin = models.ForeignKey(
+        Pin,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries'
+    )
+    # Copied from the pin so the feed is a range read on a single index
+    pin_created_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'timeline_entries'
+        unique_together = ('owner', 'pin')
+        indexes = [
+            models.Index(fields=['owner', '-pin_created_at', '-pin'], name='timeline_owner_recent_idx'),
+            models.Index(fields=['pin']),
+        ]
+        ordering = ['-pin_created_at', '-pin']
+
+    def __str__(self):
+        return f"Timeline entry {self.pin_id} for {self.owner_id}"
+
+class TimelinePullSource(models.Model):
+    """User or board with too many followers to fan out; its pins are pulled at read time"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(
+        'user_management.User',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='timeline_pull_source',
+        to_field='user_id'
+    )
+    board = models.OneToOneField(
+        Board,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='timeline_pull_source'
+    )
+    follower_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'timeline_pull_sources'
+
+    def __str__(self):
+        return f"Pull source {self.user_id or self.board_id} ({self.follower_count} followers)"
@@ -0,0 +1,101 @@
+"""
+Realtime engagement notifications.
+
+Signals turn likes, comments and follows into (recipient_id, event) pairs,
+which are published after commit to the recipient's channel-layer group.
+Each publish sends one layer message per recipient however many events it
+carries, and NotificationConsumer coalesces what arrives within
+FLUSH_INTERVAL into a single WebSocket frame.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, 'NOTIFICATIONS_FLUSH_SECONDS', 0.05)
+MAX_BATCH = getattr(settings, 'NOTIFICATIONS_MAX_BATCH', 50)
+
+
+def group_name(user_id):
+    return f"notifications.{user_id}"
+
+
+def actor(user):
+    return {'user_id': str(user.user_id), 'username': user.username, 'profile_image': user.profile_image}
+
+
+def event(kind, instance, user, **extra):
+    return {
+        'kind': kind,
+        'id': str(instance.pk),
+        'actor': actor(user),
+        'created_at': instance.created_at.isoformat(),
+        **{key: str(value) for key, value in extra.items()},
+    }
+
+
+def for_recipients(recipient_ids, actor_id, payload):
+    """Pairs for each distinct recipient, leaving out the actor themselves"""
+    return [(recipient_id, payload) for recipient_id in dict.fromkeys(recipient_ids) if recipient_id != actor_id]
+
+
+def like_notifications(like):
+    pin = like.pin
+    return for_recipients([pin.user_id], like.user_id, event('like', like, like.user, pin_id=pin.pk))
+
+
+def comment_notifications(comment):
+    pin = comment.pin
+    recipients = [pin.user_id]
+    extra = {'pin_id': pin.pk}
+    if comment.parent_id:
+        recipients.append(comment.parent.user_id)
+        extra['parent_id'] = comment.parent_id
+    payload = event('comment', comment, comment.user, **extra)
+    payload['content'] = comment.content
+    return for_recipients(recipients, comment.user_id, payload)
+
+
+def user_follow_notifications(follow):
+    return for_recipients([follow.following_id], follow.follower_id, event('follow', follow, follow.follower))
+
+
+def board_follow_notifications(follow):
+    board = follow.board
+    return for_recipients(
+        [board.user_id], follow.user_id,
+        event('board_follow', follow, follow.user, board_id=board.pk, board_title=board.title),
+    )
+
+
+async def publish_async(items, layer=None):
+    """Send (recipient_id, event) pairs, one layer message per recipient. Returns the messages sent."""
+    layer = layer or get_channel_layer()
+    if layer is None:
+        return 0
+    by_recipient = defaultdict(list)
+    for recipient_id, payload in items:
+        by_recipient[recipient_id].append(payload)
+    await asyncio.gather(*[
+        layer.group_send(group_name(recipient_id), {'type': 'notify.batch', 'events': events})
+        for recipient_id, events in by_recipient.items()
+    ])
+    return len(by_recipient)
+
+
+def publish(items):
+    try:
+        async_to_sync(publish_async)(items)
+    except Exception:
+        # Notifications are best effort; the like or follow itself has committed.
+        logger.exception("Could not publish %d notifications", len(items))
+
+
+def publish_on_commit(items):
+    if items:
+        transaction.on_commit(lambda: publish(items))
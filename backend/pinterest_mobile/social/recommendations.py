@@ -0,0 +1,230 @@
+"""
+"For You" ranking.
+
+For one viewer this builds affinity vectors from their likes, saves and
+follows (categories, authors, boards), gathers candidates from several
+sources, scores them all at once with NumPy and caches the ranked pin ids
+under the ``for_you`` cache namespace. Feed requests page through the
+cached list with a cursor naming the ranking they started on;
+refresh_recommendations re-ranks active users before the TTL
+runs out, so only a cold viewer's first request pays for scoring.
+"""
+import numpy as np
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from content.models import Pin, PinSave, RelatedPin, TrendingList
+from content.projections import PIN_FIELDS
+from pinterest_mobile.cache import NamespacedCache
+from user_management.models import User
+from .models import PinLike, UserFollow, BoardFollow
+
+TTL = getattr(settings, 'FOR_YOU_TTL_SECONDS', 30 * 60)
+LIST_SIZE = getattr(settings, 'FOR_YOU_LIST_SIZE', 500)
+# Score = sum of weight * feature; see score_candidates for the features.
+WEIGHTS = getattr(settings, 'FOR_YOU_WEIGHTS', {
+    'category': 3.0,
+    'author': 2.0,
+    'board': 2.0,
+    'similar': 4.0,
+    'popularity': 1.0,
+    'freshness': 1.5,
+})
+ENGAGEMENT_WEIGHTS = {'like': 1.0, 'save': 2.0}
+# Engagement older than this many days counts half as much towards affinity.
+AFFINITY_HALF_LIFE_DAYS = 14
+FRESHNESS_HALF_LIFE_HOURS = 48
+HISTORY_SIZE = 200
+PER_SOURCE = 200
+MAX_PER_AUTHOR = 3
+
+cache = NamespacedCache('for_you', timeout=TTL)
+
+
+class Affinity:
+    """A viewer's decayed engagement weights per category, author and board"""
+
+    def __init__(self, user, now):
+        self.categories, self.authors, self.boards = {}, {}, {}
+        self.engaged = set()
+        self.recent = []  # Most recently engaged pins, newest first
+
+        history = []
+        for model, kind in ((PinLike, 'like'), (PinSave, 'save')):
+            rows = (
+                model.objects.filter(user=user).order_by('-created_at')
+                .values_list('pin_id', 'pin__category_id', 'pin__user_id', 'created_at')[:HISTORY_SIZE]
+            )
+            history.extend((*row, ENGAGEMENT_WEIGHTS[kind]) for row in rows)
+        history.sort(key=lambda row: row[3], reverse=True)
+
+        if history:
+            ages = np.array([(now - created_at).total_seconds() for *_, created_at, _ in history]) / 86400
+            weights = np.array([weight for *_, weight in history]) * np.exp2(-ages / AFFINITY_HALF_LIFE_DAYS)
+            for (pin_id, category_id, author_id, _, _), weight in zip(history, weights.tolist()):
+                if category_id is not None:
+                    self.categories[category_id] = self.categories.get(category_id, 0.0) + weight
+                self.authors[author_id] = self.authors.get(author_id, 0.0) + weight
+                if pin_id not in self.engaged:
+                    self.engaged.add(pin_id)
+                    self.recent.append(pin_id)
+
+        for following_id in UserFollow.objects.filter(follower=user).values_list('following_id', flat=True):
+            self.authors[following_id] = self.authors.get(following_id, 0.0) + 1.0
+        for board_id in BoardFollow.objects.filter(user=user).values_list('board_id', flat=True):
+            self.boards[board_id] = 1.0
+
+        self.categories = normalized(self.categories)
+        self.authors = normalized(self.authors)
+
+    def top_categories(self, count=3):
+        return sorted(self.categories, key=self.categories.get, reverse=True)[:count]
+
+
+def normalized(weights):
+    """Scale so the largest weight is 1"""
+    top = max(weights.values(), default=0)
+    return {key: value / top for key, value in weights.items()} if top else {}
+
+
+def candidate_sources(user, affinity):
+    """{source: queryset of candidate pin ids} over public pins the viewer has not engaged with"""
+    public = Pin.objects.filter(board__is_private=False).exclude(user=user).order_by('-created_at')
+    followed_users = UserFollow.objects.filter(follower=user).values('following_id')
+    followed_boards = BoardFollow.objects.filter(user=user).values('board_id')
+    sources = {
+        'follows': public.filter(Q(user_id__in=followed_users) | Q(board_id__in=followed_boards)),
+        'categories': public.filter(category_id__in=affinity.top_categories()),
+        # Newest pins keep a viewer with no history from getting an empty feed.
+        'recent': public,
+    }
+    trending = TrendingList.objects.filter(scope=TrendingList.GLOBAL_SCOPE).values_list('pin_ids', flat=True).first()
+    if trending:
+        sources['trending'] = public.filter(pk__in=trending)
+    return {name: queryset.values_list('id', flat=True)[:PER_SOURCE] for name, queryset in sources.items()}
+
+
+def similar_scores(affinity):
+    """Summed neighbour similarity to the viewer's recently engaged pins"""
+    scores = {}
+    rows = RelatedPin.objects.filter(pin_id__in=affinity.recent[:50]).values_list('related_id', 'score')
+    for related_id, score in rows:
+        scores[related_id] = scores.get(related_id, 0.0) + score
+    return scores
+
+
+def column(values):
+    return np.array(values, dtype=np.float64)
+
+
+def score_candidates(pins, affinity, similar, now):
+    """Score candidate rows (id, category_id, user_id, board_id, created_at, engagement) in one vectorized pass"""
+    if not pins:
+        return np.zeros(0)
+    category = column([affinity.categories.get(pin[1], 0.0) for pin in pins])
+    author = column([affinity.authors.get(pin[2], 0.0) for pin in pins])
+    board = column([affinity.boards.get(pin[3], 0.0) for pin in pins])
+    similar = column([similar.get(pin[0], 0.0) for pin in pins])
+    engagement = column([pin[5] for pin in pins])
+    age_hours = column([(now - pin[4]).total_seconds() for pin in pins]) / 3600
+
+    popularity = np.log1p(engagement)
+    if popularity.max() > 0:
+        popularity /= popularity.max()
+    if similar.max() > 0:
+        similar /= similar.max()
+    freshness = np.exp2(-np.maximum(age_hours, 0) / FRESHNESS_HALF_LIFE_HOURS)
+
+    return (
+        WEIGHTS['category'] * category +
+        WEIGHTS['author'] * author +
+        WEIGHTS['board'] * board +
+        WEIGHTS['similar'] * similar +
+        WEIGHTS['popularity'] * popularity +
+        WEIGHTS['freshness'] * freshness
+    )
+
+
+def rank(user, now=None):
+    """Compute the viewer's ranked candidate pin ids (most relevant first)"""
+    now = now or timezone.now()
+    affinity = Affinity(user, now)
+    similar = similar_scores(affinity)
+
+    candidate_ids = set(similar)
+    for pin_ids in candidate_sources(user, affinity).values():
+        candidate_ids.update(pin_ids)
+    candidate_ids -= affinity.engaged
+
+    pins = list(
+        Pin.objects.filter(pk__in=candidate_ids, board__is_private=False).exclude(user=user)
+        .values_list('id', 'category_id', 'user_id', 'board_id', 'created_at', 'like_count', 'save_count')
+    )
+    pins = [(*pin[:5], pin[5] + 2 * pin[6]) for pin in pins]
+    scores = score_candidates(pins, affinity, similar, now)
+
+    ranked, deferred, per_author = [], [], {}
+    for position in np.argsort(-scores, kind='stable').tolist():
+        pin_id, _, author_id = pins[position][:3]
+        # Past MAX_PER_AUTHOR, an author's pins drop below everyone else's,
+        # so one prolific account does not fill the top of the feed.
+        per_author[author_id] = per_author.get(author_id, 0) + 1
+        (ranked if per_author[author_id] <= MAX_PER_AUTHOR else deferred).append(str(pin_id))
+    return (ranked + deferred)[:LIST_SIZE]
+
+
+def refresh(user, now=None):
+    now = now or timezone.now()
+    entry = {'pin_ids': rank(user, now), 'computed_at': now.isoformat()}
+    # The latest ranking, plus a copy under its computed_at that an
+    # in-progress scroll keeps paging through after the next refresh.
+    cache.set_many({str(user.pk): entry, (user.pk, entry['computed_at']): entry})
+    return entry
+
+
+def ranked_pin_ids(user, computed_at=None):
+    """
+    The viewer's ranking computed at computed_at, or the latest one (computing
+    it only on a cache miss) when computed_at is None or has expired.
+    """
+    if computed_at is not None:
+        entry = cache.get((user.pk, computed_at))
+        if entry is not None:
+            return entry
+    entry = cache.get(str(user.pk))
+    if entry is None:
+        entry = refresh(user)
+    return entry
+
+
+def for_you_page(user, limit, position=None):
+    """
+    (PIN_FIELDS rows, computed_at, next position or None) for one page of the
+    cached ranking. position is (computed_at, offset) from the previous page:
+    paging stays in that ranking so a refresh mid-scroll neither repeats nor
+    skips pins, and restarts at the top of the latest one once it expires.
+    """
+    computed_at, offset = position or (None, 0)
+    entry = ranked_pin_ids(user, computed_at)
+    if entry['computed_at'] != computed_at:
+        offset = 0
+    end = offset + limit
+    return (
+        PIN_FIELDS.rows_in_order(Pin.objects.filter(board__is_private=False), entry['pin_ids'][offset:end]),
+        entry['computed_at'],
+        (entry['computed_at'], end) if end < len(entry['pin_ids']) else None,
+    )
+
+
+def active_users(days=7):
+    return User.objects.filter(is_active=True, last_login__gte=timezone.now() - timedelta(days=days))
+
+
+def refresh_active(days=7):
+    """Re-rank every recently active user; run at least once per TTL"""
+    refreshed = 0
+    for user in active_users(days).iterator(chunk_size=500):
+        refresh(user)
+        refreshed += 1
+    return refreshed
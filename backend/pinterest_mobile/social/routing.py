@@ -0,0 +1,7 @@
+from django.urls import path
+from . import consumers
+
+# ws/** routes, served by pinterest_mobile.asgi
+websocket_urlpatterns = [
+    path('ws/notifications', consumers.NotificationConsumer.as_asgi(), name='notifications'),
+]
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+from content.serializers import PinAuthorSerializer
+from .models import Comment
+
+
+class CommentSerializer(serializers.ModelSerializer):
+    user = PinAuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = [
+            'id', 'user', 'parent', 'content', 'depth', 'reply_count',
+            'is_edited', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,121 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from content import counters
+from content.models import Pin
+from .models import UserFollow, BoardFollow, PinLike, Comment
+from . import follow_counts, notifications, threads, timeline
+
+
+@receiver(post_save, sender=Pin)
+def fan_out_new_pin(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: timeline.fan_out_pin(instance))
+
+
+@receiver(post_save, sender=UserFollow)
+def count_new_user_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        follow_counts.user_followed(instance, 1)
+
+
+@receiver(post_delete, sender=UserFollow)
+def count_deleted_user_follow(sender, instance, **kwargs):
+    follow_counts.user_followed(instance, -1)
+
+
+@receiver(post_save, sender=BoardFollow)
+def count_new_board_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        follow_counts.board_followed(instance, 1)
+
+
+@receiver(post_delete, sender=BoardFollow)
+def count_deleted_board_follow(sender, instance, **kwargs):
+    follow_counts.board_followed(instance, -1)
+
+
+@receiver(post_save, sender=UserFollow)
+def backfill_user_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: timeline.backfill_user_follow(instance.follower_id, instance.following_id))
+
+
+@receiver(post_delete, sender=UserFollow)
+def prune_user_follow(sender, instance, **kwargs):
+    transaction.on_commit(lambda: timeline.remove_user_follow(instance.follower_id, instance.following_id))
+
+
+@receiver(post_save, sender=BoardFollow)
+def backfill_board_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: timeline.backfill_board_follow(instance.user_id, instance.board_id))
+
+
+@receiver(post_delete, sender=BoardFollow)
+def prune_board_follow(sender, instance, **kwargs):
+    transaction.on_commit(lambda: timeline.remove_board_follow(instance.user_id, instance.board_id))
+
+
+@receiver(post_save, sender=PinLike)
+def count_new_like(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.record('pin', instance.pin_id, 'like_count', 1)
+
+
+@receiver(post_delete, sender=PinLike)
+def count_deleted_like(sender, instance, **kwargs):
+    counters.record('pin', instance.pin_id, 'like_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.record('pin', instance.pin_id, 'comment_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    counters.record('pin', instance.pin_id, 'comment_count', -1)
+
+
+@receiver(pre_save, sender=Comment)
+def assign_thread_path(sender, instance, raw=False, **kwargs):
+    if instance._state.adding and not instance.path and not raw:
+        threads.assign_path(instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_reply(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.parent_id:
+        threads.adjust_reply_count(instance.parent_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_reply(sender, instance, **kwargs):
+    if instance.parent_id:
+        threads.adjust_reply_count(instance.parent_id, -1)
+
+
+@receiver(post_save, sender=PinLike)
+def notify_like(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.publish_on_commit(notifications.like_notifications(instance))
+
+
+@receiver(post_save, sender=Comment)
+def notify_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.publish_on_commit(notifications.comment_notifications(instance))
+
+
+@receiver(post_save, sender=UserFollow)
+def notify_user_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.publish_on_commit(notifications.user_follow_notifications(instance))
+
+
+@receiver(post_save, sender=BoardFollow)
+def notify_board_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.publish_on_commit(notifications.board_follow_notifications(instance))
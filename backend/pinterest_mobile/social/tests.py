@@ -1,3 +1,153 @@
+from datetime import timedelta
+from unittest import mock
+from django.db import DatabaseError
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from content.models import Board, Category, Pin
+from pinterest_mobile.testing import QueryBudgetTestCase
+from user_management.models import User
+from .models import BoardFollow, Comment, PinLike, TimelinePullSource, UserFollow
+from . import follow_counts, recommendations, views
 
-# Create your tests here.
+
+class SocialQueryBudgetTests(QueryBudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author@example.com', 'author', 'Password@123')
+        cls.celebrity = User.objects.create_user('celebrity@example.com', 'celebrity', 'Password@123')
+        cls.viewer = User.objects.create_user('viewer@example.com', 'viewer', 'Password@123')
+        category = Category.objects.create(name='Food', slug='food')
+        board = Board.objects.create(user=cls.author, title='Recipes')
+        famous_board = Board.objects.create(user=cls.celebrity, title='Kitchen')
+        cls.pins = [
+            Pin.objects.create(
+                user=owner, board=pin_board, category=category,
+                title=f'Soup {index}', image_url=f'https://example.com/{index}.jpg',
+            )
+            for index in range(4)
+            for owner, pin_board in ((cls.author, board), (cls.celebrity, famous_board))
+        ]
+        UserFollow.objects.create(follower=cls.viewer, following=cls.author)
+        BoardFollow.objects.create(user=cls.viewer, board=famous_board)
+        PinLike.objects.create(user=cls.viewer, pin=cls.pins[0])
+
+        cls.comment = Comment.objects.create(user=cls.viewer, pin=cls.pins[0], content='Looks great')
+        reply = Comment.objects.create(user=cls.author, pin=cls.pins[0], parent=cls.comment, content='Thanks')
+        Comment.objects.create(user=cls.viewer, pin=cls.pins[0], parent=reply, content='Recipe?')
+
+    def test_home_feed(self):
+        path = reverse('home_feed')
+        self.assertWithinBudget(views.HomeFeed, path, status=401)
+        self.assertWithinBudget(views.HomeFeed, path, self.viewer)
+
+    def test_home_feed_with_pull_sources(self):
+        TimelinePullSource.objects.create(user=self.celebrity, follower_count=1)
+        TimelinePullSource.objects.create(board=self.pins[1].board, follower_count=1)
+        response = self.assertWithinBudget(views.HomeFeed, reverse('home_feed'), self.viewer)
+        self.assertTrue(response.data['results'])
+
+    def test_for_you_feed(self):
+        path = reverse('for_you_feed')
+        self.assertWithinBudget(views.ForYouFeed, path, status=401)
+        # Ranks on the first request, then pages through the cached ranking.
+        self.assertWithinBudget(views.ForYouFeed, path, self.viewer)
+        self.assertWithinBudget(views.ForYouFeed, path, self.viewer)
+
+    def test_for_you_pages_stay_on_one_ranking(self):
+        path = reverse('for_you_feed') + '?page_size=2'
+        first = self.get(path, self.viewer).data
+        recommendations.refresh(self.viewer, timezone.now() + timedelta(minutes=1))
+        second = self.get(f"{path}&cursor={first['next_cursor']}", self.viewer).data
+        self.assertEqual(second['computed_at'], first['computed_at'])
+        ranking = recommendations.cache.get((self.viewer.pk, first['computed_at']))['pin_ids']
+        self.assertEqual([row['id'] for row in first['results'] + second['results']], ranking[:4])
+
+        # Once that ranking expires the next page restarts on the latest one.
+        recommendations.cache.delete((self.viewer.pk, first['computed_at']))
+        restarted = self.get(f"{path}&cursor={second['next_cursor']}", self.viewer).data
+        self.assertNotEqual(restarted['computed_at'], first['computed_at'])
+        latest = recommendations.cache.get(str(self.viewer.pk))['pin_ids']
+        self.assertEqual([row['id'] for row in restarted['results']], latest[:2])
+
+    def test_for_you_rejects_bad_cursors(self):
+        response = self.get(reverse('for_you_feed') + '?cursor=nope', self.viewer)
+        self.assertEqual(response.status_code, 400)
+
+    def test_pin_comments(self):
+        path = reverse('pin_comments', args=[self.pins[0].pk])
+        self.assertWithinBudget(views.PinComments, path)
+        self.assertWithinBudget(views.PinComments, path, self.viewer)
+
+    def test_comment_replies(self):
+        path = reverse('comment_replies', args=[self.comment.pk])
+        self.assertWithinBudget(views.CommentReplies, path)
+        self.assertWithinBudget(views.CommentReplies, path, self.viewer)
+
+
+class HomeFeedTests(QueryBudgetTestCase):
+
+    def test_pins_on_boards_made_private_after_fan_out_are_hidden(self):
+        author = User.objects.create_user('author@example.com', 'author', 'Password@123')
+        viewer = User.objects.create_user('viewer@example.com', 'viewer', 'Password@123')
+        UserFollow.objects.create(follower=viewer, following=author)
+        board = Board.objects.create(user=author, title='Drafts')
+        with self.captureOnCommitCallbacks(execute=True):
+            pin = Pin.objects.create(user=author, board=board, image_url='https://example.com/a.jpg')
+        self.assertEqual([row['id'] for row in self.get(reverse('home_feed'), viewer).data['results']], [str(pin.pk)])
+
+        board.is_private = True
+        board.save()
+        self.assertEqual(self.get(reverse('home_feed'), viewer).data['results'], [])
+        self.assertEqual(self.get(reverse('pin_detail', args=[pin.pk]), viewer).status_code, 404)
+
+
+class FollowCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jane = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        cls.sam = User.objects.create_user('sam@example.com', 'sam', 'Password@123')
+        cls.board = Board.objects.create(user=cls.jane, title='Ideas')
+
+    def counts(self):
+        self.jane.refresh_from_db()
+        self.sam.refresh_from_db()
+        self.board.refresh_from_db()
+        return self.jane.follower_count, self.sam.following_count, self.board.follower_count
+
+    def test_follow_and_unfollow(self):
+        self.assertTrue(follow_counts.follow_user(self.sam, self.jane)[1])
+        self.assertFalse(follow_counts.follow_user(self.sam, self.jane)[1])
+        follow_counts.follow_board(self.sam, self.board)
+        self.assertEqual(self.counts(), (1, 1, 1))
+
+        self.assertTrue(follow_counts.unfollow_user(self.sam, self.jane))
+        self.assertFalse(follow_counts.unfollow_user(self.sam, self.jane))
+        follow_counts.unfollow_board(self.sam, self.board)
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_follow_rolls_back_with_its_counts(self):
+        calls = []
+
+        def fail_second(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise DatabaseError("lost connection")
+            adjust(*args)
+
+        adjust = follow_counts.adjust
+        with mock.patch.object(follow_counts, 'adjust', fail_second), self.assertRaises(DatabaseError):
+            follow_counts.follow_user(self.sam, self.jane)
+        self.assertFalse(UserFollow.objects.exists())
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_recompute_repairs_drift(self):
+        follow_counts.follow_user(self.sam, self.jane)
+        follow_counts.follow_board(self.sam, self.board)
+        User.objects.update(follower_count=7, following_count=7)
+        Board.objects.update(follower_count=7)
+        follow_counts.recompute()
+        self.assertEqual(self.counts(), (1, 1, 1))
+        self.assertEqual(User.objects.get(pk=self.sam.pk).follower_count, 0)
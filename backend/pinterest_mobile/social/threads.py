@@ -0,0 +1,58 @@
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.utils import timezone
+from .models import Comment
+
+# Each path segment is 14 hex digits of creation time in microseconds plus 4
+# hex digits of the comment id. Segments are fixed width and hex only, so
+# plain string order is thread order under any collation, and a subtree is
+# the range (path, path + 'g').
+SEGMENT_LENGTH = 18
+MAX_DEPTH = Comment._meta.get_field('path').max_length // SEGMENT_LENGTH - 1
+SUBTREE_END = 'g'
+
+
+def segment(created_at, pk):
+    micros = int(created_at.timestamp() * 1_000_000)
+    return f"{micros:014x}{pk.hex[:4]}"
+
+
+def assign_path(comment):
+    """Set path and depth on an unsaved comment from its parent"""
+    own = segment(comment.created_at or timezone.now(), comment.pk)
+    if comment.parent_id is None:
+        comment.path, comment.depth = own, 0
+        return
+    parent = comment.parent
+    if parent.depth >= MAX_DEPTH:
+        raise ValidationError(f"Replies can be nested at most {MAX_DEPTH} levels deep.")
+    comment.path = parent.path + own
+    comment.depth = parent.depth + 1
+
+
+def adjust_reply_count(parent_id, delta):
+    Comment.objects.filter(pk=parent_id).update(reply_count=F('reply_count') + delta)
+
+
+def thread(pin_id, max_depth=None, after=None, limit=50):
+    """
+    One page of a pin's discussion in display order, in a single range scan
+    of the (pin, path) index. after is the path of the last row already seen.
+    """
+    comments = Comment.objects.filter(pin_id=pin_id)
+    if max_depth is not None:
+        comments = comments.filter(depth__lte=max_depth)
+    if after:
+        comments = comments.filter(path__gt=after)
+    return list(comments.select_related('user').order_by('path')[:limit])
+
+
+def replies(parent, max_depth=1, after=None, limit=50):
+    """One page of the subtree under a comment, up to max_depth levels below it"""
+    comments = Comment.objects.filter(
+        pin_id=parent.pin_id,
+        path__gt=after if after and after > parent.path else parent.path,
+        path__lt=parent.path + SUBTREE_END,
+        depth__lte=parent.depth + max_depth,
+    )
+    return list(comments.select_related('user').order_by('path')[:limit])
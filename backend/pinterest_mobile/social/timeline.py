@@ -0,0 +1,173 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from content.models import Pin
+from content.pagination import keyset_filter
+from content.projections import PIN_FIELDS
+from .models import UserFollow, BoardFollow, TimelineEntry, TimelinePullSource
+
+# Authors/boards above this many followers are not fanned out on write; their
+# pins are pulled and merged into the timeline at read time instead.
+FANOUT_MAX_FOLLOWERS = getattr(settings, 'TIMELINE_FANOUT_MAX_FOLLOWERS', 10000)
+# How many recent pins are copied into a timeline when a follow is created.
+BACKFILL_PINS = getattr(settings, 'TIMELINE_BACKFILL_PINS', 100)
+# Timelines are trimmed back to this many entries by the rebuild command.
+MAX_ENTRIES = getattr(settings, 'TIMELINE_MAX_ENTRIES', 1000)
+BATCH_SIZE = 1000
+
+TIMELINE_CURSOR_FIELDS = ('pin_created_at', 'pin_id')
+
+
+def push_entries(owner_ids, pins):
+    """Insert timeline rows for every (owner, pin) pair, skipping existing ones"""
+    entries = [
+        TimelineEntry(owner_id=owner_id, pin_id=pin.pk, pin_created_at=pin.created_at)
+        for owner_id in owner_ids
+        for pin in pins
+    ]
+    for start in range(0, len(entries), BATCH_SIZE):
+        TimelineEntry.objects.bulk_create(entries[start:start + BATCH_SIZE], ignore_conflicts=True)
+    return len(entries)
+
+
+def update_pull_source(follower_count, **lookup):
+    """Record whether a user or board is fanned out on write or pulled on read"""
+    if follower_count > FANOUT_MAX_FOLLOWERS:
+        TimelinePullSource.objects.update_or_create(defaults={'follower_count': follower_count}, **lookup)
+        return True
+    TimelinePullSource.objects.filter(**lookup).delete()
+    return False
+
+
+def fan_out_pin(pin):
+    """Push a newly created pin to the timelines of its author's and board's followers"""
+    if pin.board.is_private:
+        return 0
+
+    owner_ids = {pin.user_id}
+
+    # The denormalized counts decide push vs pull without a COUNT(*) per pin.
+    if not update_pull_source(pin.user.follower_count, user_id=pin.user_id):
+        owner_ids.update(UserFollow.objects.filter(following_id=pin.user_id).values_list('follower_id', flat=True))
+
+    if not update_pull_source(pin.board.follower_count, board_id=pin.board_id):
+        owner_ids.update(BoardFollow.objects.filter(board_id=pin.board_id).values_list('user_id', flat=True))
+
+    return push_entries(owner_ids, [pin])
+
+
+def recent_pins(**filters):
+    return list(
+        Pin.objects.filter(board__is_private=False, **filters)
+        .order_by('-created_at', '-id')
+        .only('id', 'created_at')[:BACKFILL_PINS]
+    )
+
+
+def backfill_user_follow(follower_id, following_id):
+    """Copy the followed user's recent pins into the new follower's timeline"""
+    if TimelinePullSource.objects.filter(user_id=following_id).exists():
+        return 0
+    return push_entries([follower_id], recent_pins(user_id=following_id))
+
+
+def backfill_board_follow(user_id, board_id):
+    """Copy the followed board's recent pins into the new follower's timeline"""
+    if TimelinePullSource.objects.filter(board_id=board_id).exists():
+        return 0
+    return push_entries([user_id], recent_pins(board_id=board_id))
+
+
+def remove_user_follow(follower_id, following_id):
+    """Drop an unfollowed user's pins, keeping those still reachable through a followed board"""
+    followed_boards = BoardFollow.objects.filter(user_id=follower_id).values('board_id')
+    return TimelineEntry.objects.filter(
+        owner_id=follower_id,
+        pin__user_id=following_id,
+    ).exclude(pin__board_id__in=followed_boards).delete()[0]
+
+
+def remove_board_follow(user_id, board_id):
+    """Drop an unfollowed board's pins, keeping those still reachable through a followed user"""
+    followed_users = UserFollow.objects.filter(follower_id=user_id).values('following_id')
+    return TimelineEntry.objects.filter(
+        owner_id=user_id,
+        pin__board_id=board_id,
+    ).exclude(pin__user_id__in=followed_users).exclude(pin__user_id=user_id).delete()[0]
+
+
+def pull_filter(user):
+    """Q matching pins from pull-mode users and boards this user follows, as subqueries"""
+    sources = TimelinePullSource.objects.filter(
+        Q(user__followers__follower=user) | Q(board__followers__user=user)
+    )
+    return (
+        Q(user_id__in=sources.filter(user__isnull=False).values('user_id')) |
+        Q(board_id__in=sources.filter(board__isnull=False).values('board_id'))
+    )
+
+
+def read_home_timeline(user, position=None, limit=20):
+    """
+    Newest-first pins for a user's home feed.
+
+    Reads the materialized timeline with one range read on (owner, pin_created_at,
+    pin) and merges in pins from followed pull-mode accounts, found with one
+    query whether or not there are any. Returns PIN_FIELDS rows. Entries whose
+    board was made private after fan-out are skipped.
+    """
+    entries = keyset_filter(
+        TimelineEntry.objects.filter(owner=user, pin__board__is_private=False), position, TIMELINE_CURSOR_FIELDS,
+    )
+    keys = list(
+        entries.order_by('-pin_created_at', '-pin_id')
+        .values_list('pin_created_at', 'pin_id')[:limit]
+    )
+
+    pins = keyset_filter(Pin.objects.filter(pull_filter(user), board__is_private=False), position)
+    pulled = list(pins.order_by('-created_at', '-id').values_list('created_at', 'id')[:limit])
+    if pulled:
+        keys = sorted(set(keys + pulled), reverse=True)[:limit]
+
+    return PIN_FIELDS.rows_in_order(Pin.objects.filter(board__is_private=False), [pk for _, pk in keys])
+
+
+def rebuild_timeline(user):
+    """Recompute one user's timeline from their current follows"""
+    owner_ids = [user.pk]
+    followed_users = UserFollow.objects.filter(follower=user).values('following_id')
+    followed_boards = BoardFollow.objects.filter(user=user).values('board_id')
+    pulled_users = TimelinePullSource.objects.filter(user__isnull=False).values('user_id')
+    pulled_boards = TimelinePullSource.objects.filter(board__isnull=False).values('board_id')
+
+    pins = list(
+        Pin.objects.filter(board__is_private=False)
+        .filter(
+            Q(user=user) |
+            (Q(user_id__in=followed_users) & ~Q(user_id__in=pulled_users)) |
+            (Q(board_id__in=followed_boards) & ~Q(board_id__in=pulled_boards))
+        )
+        .order_by('-created_at', '-id')
+        .only('id', 'created_at')[:MAX_ENTRIES]
+    )
+    TimelineEntry.objects.filter(owner=user).exclude(pin_id__in=[pin.pk for pin in pins]).delete()
+    return push_entries(owner_ids, pins)
+
+
+def refresh_pull_sources():
+    """Recompute which users and boards are above the fan-out threshold"""
+    heavy_users = dict(
+        UserFollow.objects.values('following_id').annotate(total=Count('id'))
+        .filter(total__gt=FANOUT_MAX_FOLLOWERS).values_list('following_id', 'total')
+    )
+    heavy_boards = dict(
+        BoardFollow.objects.values('board_id').annotate(total=Count('id'))
+        .filter(total__gt=FANOUT_MAX_FOLLOWERS).values_list('board_id', 'total')
+    )
+    with transaction.atomic():
+        TimelinePullSource.objects.all().delete()
+        TimelinePullSource.objects.bulk_create(
+            [TimelinePullSource(user_id=pk, follower_count=total) for pk, total in heavy_users.items()] +
+            [TimelinePullSource(board_id=pk, follower_count=total) for pk, total in heavy_boards.items()]
+        )
+    return len(heavy_users), len(heavy_boards)
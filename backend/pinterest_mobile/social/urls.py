@@ -1,6 +1,10 @@
 from django.urls import path
+from . import views
 
 # /api/social/** routes
 urlpatterns = [
-    
+    path('feed/home', views.HomeFeed.as_view(), name='home_feed'),
+    path('feed/for-you', views.ForYouFeed.as_view(), name='for_you_feed'),
+    path('pins/<uuid:pin_id>/comments', views.PinComments.as_view(), name='pin_comments'),
+    path('comments/<uuid:comment_id>/replies', views.CommentReplies.as_view(), name='comment_replies'),
 ]
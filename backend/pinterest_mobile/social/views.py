@@ -1,3 +1,135 @@
-from django.shortcuts import render
+import base64
+import binascii
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from content.layout import MasonryLayoutMixin
+from content.models import Pin
+from content.projections import PIN_FIELDS, PIN_COUNTERS
+from pinterest_mobile.conditional import ConditionalGetMixin, validators_for_rows
+from content.serializers import PinSerializer
+from .models import Comment
+from .serializers import CommentSerializer
+from . import recommendations, threads
+from .timeline import read_home_timeline
 
-# Create your views here.
+
+class HomeFeed(ConditionalGetMixin, MasonryLayoutMixin, generics.ListAPIView):
+    """Pins from followed users and boards, read from the materialized timeline"""
+    query_budget = 4
+    permission_classes = [IsAuthenticated]
+    serializer_class = PinSerializer
+
+    def list(self, request, *args, **kwargs):
+        position = self.paginator.prepare(request)
+        rows = read_home_timeline(request.user, position, self.paginator.page_size + 1)
+        page = self.paginator.paginate_rows(rows)
+        etag, last_modified = validators_for_rows(request, page, PIN_COUNTERS)
+        return self.respond(
+            request, etag, last_modified,
+            lambda: self.get_paginated_response(PIN_FIELDS.serialize(page)),
+        )
+
+
+class ForYouFeed(APIView):
+    """
+    Personalized ranking of pins, paged from the viewer's cached recommendation
+    list. The cursor holds the ranking's computed_at and an offset into it; when
+    that ranking has expired the page starts over from the top of the new one,
+    with a different computed_at.
+    """
+    query_budget = 13
+    permission_classes = [IsAuthenticated]
+    max_page_size = 100
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('page_size', 20)), 1), self.max_page_size)
+        except ValueError:
+            return Response({"error": "page_size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        position = self.decode_cursor(request.query_params.get('cursor'))
+        if position is False:
+            return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        pins, computed_at, next_position = recommendations.for_you_page(request.user, limit, position)
+        return Response({
+            "computed_at": computed_at,
+            "next_cursor": self.encode_cursor(next_position) if next_position else None,
+            "results": PIN_FIELDS.serialize(pins),
+        })
+
+    def encode_cursor(self, position):
+        computed_at, offset = position
+        return base64.urlsafe_b64encode(f"{computed_at}|{offset}".encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, encoded):
+        """(computed_at, offset), None without a cursor, or False if it is malformed"""
+        if not encoded:
+            return None
+        try:
+            computed_at, offset = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|', 1)
+            offset = int(offset)
+        except (binascii.Error, UnicodeError, ValueError):
+            return False
+        if not computed_at or offset < 0:
+            return False
+        return computed_at, offset
+
+
+def visible_pins(user):
+    visible = Q(board__is_private=False)
+    if user.is_authenticated:
+        visible |= Q(user=user)
+    return Pin.objects.filter(visible)
+
+
+class CommentPage(APIView):
+    """Shared query-param handling for path-cursor comment pages"""
+    default_depth = 1
+    max_page_size = 200
+
+    def read_params(self, request):
+        try:
+            depth = int(request.query_params.get('depth', self.default_depth))
+            limit = int(request.query_params.get('page_size', 50))
+        except ValueError:
+            return None
+        return max(depth, 0), min(max(limit, 1), self.max_page_size), request.query_params.get('cursor')
+
+    def page_response(self, rows, limit):
+        page = rows[:limit]
+        return Response({
+            "next_cursor": page[-1].path if len(rows) > limit else None,
+            "results": CommentSerializer(page, many=True).data,
+        })
+
+
+class PinComments(CommentPage):
+    """A pin's discussion in display order, to ?depth levels of replies"""
+    query_budget = 3
+    default_depth = 2
+
+    def get(self, request, pin_id):
+        pin = get_object_or_404(visible_pins(request.user), pk=pin_id)
+        params = self.read_params(request)
+        if params is None:
+            return Response({"error": "depth and page_size must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        depth, limit, cursor = params
+        rows = threads.thread(pin.pk, max_depth=depth, after=cursor, limit=limit + 1)
+        return self.page_response(rows, limit)
+
+
+class CommentReplies(CommentPage):
+    """Replies under one comment, to ?depth levels below it"""
+    query_budget = 3
+
+    def get(self, request, comment_id):
+        parent = get_object_or_404(Comment.objects.filter(pin__in=visible_pins(request.user)), pk=comment_id)
+        params = self.read_params(request)
+        if params is None:
+            return Response({"error": "depth and page_size must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        depth, limit, cursor = params
+        rows = threads.replies(parent, max_depth=max(depth, 1), after=cursor, limit=limit + 1)
+        return self.page_response(rows, limit)
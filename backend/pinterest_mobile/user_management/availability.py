@@ -0,0 +1,117 @@
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from .models import User
+
+FALSE_POSITIVE_RATE = getattr(settings, 'AVAILABILITY_FALSE_POSITIVE_RATE', 0.01)
+# Users created or renamed by other worker processes are picked up at most this late.
+SYNC_INTERVAL = getattr(settings, 'AVAILABILITY_SYNC_SECONDS', 5)
+MIN_CAPACITY = 10000
+MAX_BATCH = 50
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing on one blake2b digest"""
+
+    def __init__(self, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        """Add value; count only grows for values not already (apparently) present"""
+        positions = self.positions(value)
+        if all(self.bits[position >> 3] & (1 << (position & 7)) for position in positions):
+            return
+        for position in positions:
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(value))
+
+
+class AvailabilityIndex:
+    """
+    In-memory Bloom filters of taken usernames and emails.
+
+    A negative answer from the filter is definite, so only possible positives
+    go to the users table. Built on first use, updated when a user is saved
+    in this process, and caught up with users created or changed elsewhere
+    every SYNC_INTERVAL seconds through the updated_at index. Old names stay
+    in the filters after a rename; the users table settles those hits.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.usernames = None
+        self.emails = None
+        self.synced_at = None
+        self.checked_at = 0.0
+
+    def rebuild(self):
+        capacity = max(MIN_CAPACITY, User.objects.count() * 2)
+        usernames, emails = BloomFilter(capacity), BloomFilter(capacity)
+        synced_at = None
+        for username, email, updated_at in User.objects.values_list('username', 'email', 'updated_at').iterator(chunk_size=5000):
+            usernames.add(username)
+            emails.add(email)
+            if synced_at is None or updated_at > synced_at:
+                synced_at = updated_at
+        self.usernames, self.emails, self.synced_at = usernames, emails, synced_at
+        self.checked_at = time.monotonic()
+
+    def sync(self):
+        """Build the filters if needed and fold in users saved since the last sync"""
+        with self.lock:
+            if self.usernames is None:
+                self.rebuild()
+                return
+            if time.monotonic() - self.checked_at < SYNC_INTERVAL:
+                return
+            self.checked_at = time.monotonic()
+            recent = User.objects.values_list('username', 'email', 'updated_at')
+            if self.synced_at is not None:
+                recent = recent.filter(updated_at__gte=self.synced_at)
+            for username, email, updated_at in recent:
+                self.add(username, email)
+                if self.synced_at is None or updated_at > self.synced_at:
+                    self.synced_at = updated_at
+            if self.usernames.count > self.usernames.capacity:
+                self.rebuild()
+
+    def add(self, username, email):
+        if self.usernames is not None:
+            self.usernames.add(username)
+            self.emails.add(email)
+
+    def taken(self, field, values):
+        """{value: is_taken} for usernames or emails, querying the DB only for filter hits"""
+        self.sync()
+        bloom = self.usernames if field == 'username' else self.emails
+        maybe = [value for value in values if value in bloom]
+        existing = set()
+        if maybe:
+            existing = set(User.objects.filter(**{f'{field}__in': maybe}).values_list(field, flat=True))
+        return {value: value in existing for value in values}
+
+
+index = AvailabilityIndex()
+
+
+def is_username_taken(username):
+    return index.taken('username', [username])[username]
+
+
+def is_email_taken(email):
+    return index.taken('email', [email])[email]
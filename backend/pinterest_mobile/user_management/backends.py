@@ -11,4 +11,19 @@ class EmailBackend(ModelBackend):
         
         if user.check_password(password):
             return user
-        return None
\ No newline at end of file
+        return None
+
+def check_credentials(email, password):
+    """
+    Look up a user by email and verify the password with a single hash.
+
+    Returns (user, is_valid); user is None when the email is unknown. Unknown
+    emails still pay for one hash so response time doesn't reveal which
+    addresses are registered.
+    """
+    UserModel = get_user_model()
+    user = UserModel.objects.filter(email=email).first()
+    if user is None:
+        UserModel().set_password(password)
+        return None, False
+    return user, user.is_active and user.check_password(password)
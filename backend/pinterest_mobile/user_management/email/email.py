@@ -1,9 +1,13 @@
-from django.core.mail import EmailMultiAlternatives
 import random, os
+from datetime import timedelta
 from dotenv import load_dotenv
+from .outbox import enqueue_email
 
 load_dotenv()
 
+# Matches the 2 minutes the OTP cache entries live; later delivery is useless.
+OTP_EXPIRY = timedelta(minutes=2)
+
 def send_otp_to_email(email, message):
     try:
         otp = random.randint(100000, 999999)
@@ -38,9 +42,7 @@ def send_otp_to_email(email, message):
 </html>
 """
         email_from = os.getenv('EMAIL_HOST_USER')
-        msg = EmailMultiAlternatives(subject, message, email_from, [email])
-        msg.attach_alternative(otp_message, "text/html")
-        msg.send()
+        enqueue_email(subject, message, [email], from_email=email_from, html_body=otp_message, expires_in=OTP_EXPIRY)
         return otp
     except Exception:
         return None
@@ -79,9 +81,7 @@ def send_reset_password(email):
 </html>
 """
         email_from = os.getenv('EMAIL_HOST_USER')
-        msg = EmailMultiAlternatives(subject, message, email_from, [email])
-        msg.attach_alternative(message, "text/html")
-        msg.send()
+        enqueue_email(subject, message, [email], from_email=email_from, html_body=message, expires_in=OTP_EXPIRY)
 
         return otp
     except Exception:
@@ -0,0 +1,125 @@
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from ..models import OutboundEmail
+
+MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+BATCH_SIZE = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+# A claimed message becomes due again after this long if its worker dies mid-send.
+CLAIM_TIMEOUT = timedelta(minutes=5)
+BASE_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 3600
+RETENTION = timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_RETENTION_SECONDS', 3600))
+
+
+def enqueue_email(subject, body, to, from_email=None, html_body='', expires_in=None):
+    """
+    Store a message for the outbox worker; nothing is sent during the request.
+    A message with expires_in (a timedelta) is dropped if it can't be sent in time.
+    """
+    now = timezone.now()
+    return OutboundEmail.objects.create(
+        from_email=from_email or settings.EMAIL_HOST_USER or '',
+        to=list(to),
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        next_attempt_at=now,
+        expires_at=now + expires_in if expires_in is not None else None,
+    )
+
+
+def backoff(attempts):
+    """Exponential backoff with jitter: ~30s, 1m, 2m, 4m... capped at an hour"""
+    delay = min(BASE_BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    """Lease a batch of due messages to this worker by pushing their next attempt forward"""
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboundEmail.objects.filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=now),
+            status=OutboundEmail.STATUS_PENDING,
+            next_attempt_at__lte=now,
+        ).order_by('next_attempt_at')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        for message in batch:
+            message.attempts += 1
+            message.next_attempt_at = now + CLAIM_TIMEOUT
+        OutboundEmail.objects.bulk_update(batch, ['attempts', 'next_attempt_at'])
+    return batch
+
+
+def build_message(message, smtp):
+    email = EmailMultiAlternatives(message.subject, message.body, message.from_email, message.to, connection=smtp)
+    if message.html_body:
+        email.attach_alternative(message.html_body, "text/html")
+    return email
+
+
+def drain(batch_size=BATCH_SIZE):
+    """
+    Send one batch of due messages over a single SMTP connection.
+
+    Returns (sent, failed) counts; failed messages are retried with backoff
+    until MAX_ATTEMPTS, then left in the failed state.
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    smtp = get_connection(fail_silently=False)
+    try:
+        smtp.open()
+    except Exception as e:
+        for message in batch:
+            record_failure(message, e)
+        return 0, len(batch)
+
+    try:
+        for message in batch:
+            try:
+                build_message(message, smtp).send()
+            except Exception as e:
+                record_failure(message, e)
+                failed += 1
+            else:
+                message.status = OutboundEmail.STATUS_SENT
+                message.sent_at = timezone.now()
+                message.last_error = ''
+                message.save(update_fields=['status', 'sent_at', 'last_error'])
+                sent += 1
+    finally:
+        smtp.close()
+    return sent, failed
+
+
+def record_failure(message, error):
+    message.last_error = str(error)
+    if message.attempts >= MAX_ATTEMPTS:
+        message.status = OutboundEmail.STATUS_FAILED
+    else:
+        message.next_attempt_at = timezone.now() + backoff(message.attempts)
+    message.save(update_fields=['status', 'last_error', 'next_attempt_at'])
+
+
+def purge(retention=RETENTION):
+    """
+    Delete expired unsent messages, and sent or failed ones queued more than
+    retention ago, so OTPs don't linger in the table. Returns the number deleted.
+    """
+    now = timezone.now()
+    deleted, _ = OutboundEmail.objects.filter(
+        Q(status=OutboundEmail.STATUS_PENDING, expires_at__lte=now) |
+        Q(status__in=[OutboundEmail.STATUS_SENT, OutboundEmail.STATUS_FAILED], created_at__lt=now - retention)
+    ).delete()
+    return deleted
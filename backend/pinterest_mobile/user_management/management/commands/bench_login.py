@@ -0,0 +1,65 @@
+import json
+import urllib.error
+import urllib.request
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from pinterest_mobile.benchmark import run_concurrent
+from user_management.models import User
+
+BENCH_EMAIL = 'bench.login@gmail.com'
+BENCH_USERNAME = 'bench_login'
+BENCH_PASSWORD = 'Bench@12345'
+
+
+class Command(BaseCommand):
+    help = "Measure auth/login throughput (logins/sec) and p50/p99 latency under concurrency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--url', help="Benchmark a running server, e.g. http://127.0.0.1:8000/api/auth/login. Defaults to in-process requests.")
+        parser.add_argument('--email', default=BENCH_EMAIL, help="Existing account to log in as over --url.")
+        parser.add_argument('--password', default=BENCH_PASSWORD)
+        parser.add_argument('--mode', choices=['session', 'stateless', 'both'], default='both', help="In-process login mode(s) to run.")
+
+    def handle(self, *args, **options):
+        body = json.dumps({'email': options['email'], 'password': options['password']}).encode()
+        runs = {}
+
+        if options['url']:
+            runs['http'] = self.run(lambda: self.http_login(options['url'], body), options)
+        else:
+            created = self.ensure_user()
+            try:
+                modes = ['session', 'stateless'] if options['mode'] == 'both' else [options['mode']]
+                for mode in modes:
+                    with override_settings(AUTH_STATELESS_LOGIN=(mode == 'stateless')):
+                        runs[mode] = self.run(lambda: self.client_login(body), options)
+            finally:
+                if created:
+                    User.objects.filter(email=BENCH_EMAIL).delete()
+
+        self.stdout.write(json.dumps({'benchmark': 'login', 'runs': runs}, indent=2))
+
+    def run(self, operation, options):
+        return run_concurrent(operation, options['requests'], options['concurrency'], options['warmup'])
+
+    def ensure_user(self):
+        if User.objects.filter(email=BENCH_EMAIL).exists():
+            return False
+        User.objects.create_user(BENCH_EMAIL, BENCH_USERNAME, BENCH_PASSWORD, is_verified=True)
+        return True
+
+    def client_login(self, body):
+        response = Client().post('/api/auth/login', body, content_type='application/json')
+        return response.status_code == 200
+
+    def http_login(self, url, body):
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status == 200
+        except urllib.error.HTTPError:
+            return False
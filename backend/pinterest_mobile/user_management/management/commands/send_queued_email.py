@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from user_management.email import outbox
+
+PURGE_INTERVAL_SECONDS = 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued OTP and password-reset email, one SMTP connection per batch. Expired OTP mail "
+        "and sent or failed messages past the retention window are deleted as it goes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=outbox.BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep draining the outbox until interrupted.")
+        parser.add_argument('--interval', type=float, default=1.0, help="Seconds to sleep when the outbox is empty with --loop.")
+
+    def handle(self, *args, **options):
+        purged_at = None
+        while True:
+            if purged_at is None or time.monotonic() - purged_at >= PURGE_INTERVAL_SECONDS:
+                purged_at = time.monotonic()
+                purged = outbox.purge()
+                if purged:
+                    self.stdout.write(f"Deleted {purged} expired or old messages.")
+            sent, failed = outbox.drain(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(f"Sent {sent} messages, {failed} failed.")
+            if not options['loop']:
+                return
+            if not sent and not failed:
+                time.sleep(options['interval'])
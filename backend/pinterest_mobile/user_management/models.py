@@ -26,6 +26,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     profile_image = models.URLField(max_length=500, blank=True)
     bio = models.TextField(blank=True)
     is_verified = models.BooleanField(default=False)
+
+    # Maintained by social.follow_counts when UserFollow rows change
+    follower_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
     
     # Required fields from AbstractBaseUser
     last_login = models.DateTimeField(null=True, blank=True)
@@ -56,4 +60,39 @@ class User(AbstractBaseUser, PermissionsMixin):
             models.Index(fields=['username']),
             models.Index(fields=['email']),
             models.Index(fields=['created_at']),
-        ]
\ No newline at end of file
+            models.Index(fields=['updated_at']),
+        ]
+
+class OutboundEmail(models.Model):
+    """Queued email, delivered by the send_queued_email worker"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField(default=list)
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    expires_at = models.DateTimeField(null=True, blank=True)  # Dropped unsent after this, e.g. OTPs
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'outbound_emails'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
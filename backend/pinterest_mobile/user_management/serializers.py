@@ -5,4 +5,14 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = '__all__'
-        read_only_fields = ['user_id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['user_id', 'created_at', 'follower_count', 'following_count']
+
+class ProfileSerializer(serializers.ModelSerializer):
+    """Public profile fields; never includes email or credentials"""
+    class Meta:
+        model = User
+        fields = [
+            'user_id', 'username', 'first_name', 'last_name', 'profile_image', 'bio',
+            'is_verified', 'follower_count', 'following_count', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
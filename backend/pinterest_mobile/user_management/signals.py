@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import User
+from .availability import index
+
+
+@receiver(post_save, sender=User)
+def track_taken_names(sender, instance, created, raw=False, **kwargs):
+    # On updates too: a changed username or email is taken from now on.
+    if not raw:
+        index.add(instance.username, instance.email)
@@ -1,3 +1,107 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core import mail
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.throttling import ScopedRateThrottle
+from pinterest_mobile.testing import QueryBudgetTestCase
+from .availability import AvailabilityIndex, is_username_taken
+from .email import outbox
+from .models import OutboundEmail, User
+from . import views
 
-# Create your tests here.
+
+class UserQueryBudgetTests(QueryBudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        cls.viewer = User.objects.create_user('sam@example.com', 'sam', 'Password@123')
+
+    def test_profile(self):
+        path = reverse('profile', args=['jane'])
+        self.assertWithinBudget(views.Profile, path)
+        self.assertWithinBudget(views.Profile, path, self.viewer)
+        self.assertWithinBudget(views.Profile, path, self.user)
+
+    def test_missing_profile(self):
+        path = reverse('profile', args=['nobody'])
+        self.assertWithinBudget(views.Profile, path, status=404)
+        self.assertWithinBudget(views.Profile, path, self.viewer, status=404)
+
+
+class LoginTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+
+    def login(self, email, password):
+        return self.client.post(reverse('login'), {'email': email, 'password': password}, content_type='application/json')
+
+    def test_unknown_email_looks_like_a_wrong_password(self):
+        unknown = self.login('nobody@example.com', 'Password@123')
+        wrong = self.login('jane@example.com', 'Wrong@123')
+        self.assertEqual(unknown.status_code, 401)
+        self.assertEqual(unknown.json(), wrong.json())
+
+    def test_valid_credentials(self):
+        self.assertEqual(self.login('jane@example.com', 'Password@123').status_code, 200)
+
+
+class OutboxTests(TestCase):
+
+    def test_expired_messages_are_dropped_not_sent(self):
+        expired = outbox.enqueue_email('OTP', 'code', ['jane@example.com'], expires_in=timedelta(minutes=2))
+        OutboundEmail.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        outbox.enqueue_email('OTP', 'code', ['sam@example.com'], expires_in=timedelta(minutes=2))
+        self.assertEqual(outbox.drain(), (1, 0))
+        self.assertEqual(mail.outbox[0].to, ['sam@example.com'])
+        self.assertEqual(outbox.purge(), 1)
+        self.assertFalse(OutboundEmail.objects.filter(pk=expired.pk).exists())
+
+    def test_purge_deletes_old_sent_messages(self):
+        outbox.enqueue_email('Welcome', 'hi', ['jane@example.com'])
+        outbox.drain()
+        self.assertEqual(outbox.purge(), 0)
+        OutboundEmail.objects.update(created_at=timezone.now() - outbox.RETENTION - timedelta(seconds=1))
+        self.assertEqual(outbox.purge(), 1)
+
+
+class AvailabilityTests(TestCase):
+
+    def test_renames_are_taken(self):
+        user = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        self.assertFalse(is_username_taken('jane_doe'))
+        user.username = 'jane_doe'
+        user.save()
+        self.assertTrue(is_username_taken('jane_doe'))
+
+    def test_sync_picks_up_changes_from_other_processes(self):
+        user = User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        other = AvailabilityIndex()
+        self.assertEqual(other.taken('email', ['jane.doe@example.com']), {'jane.doe@example.com': False})
+        # As if saved by another worker: this process's signal never ran.
+        User.objects.filter(pk=user.pk).update(email='jane.doe@example.com', updated_at=timezone.now())
+        other.checked_at = 0.0
+        self.assertEqual(other.taken('email', ['jane.doe@example.com']), {'jane.doe@example.com': True})
+
+
+class CheckAvailabilityTests(QueryBudgetTestCase):
+
+    def check(self, **data):
+        return self.client.post(reverse('check_availability'), data, content_type='application/json')
+
+    def test_one_email_per_request(self):
+        User.objects.create_user('jane@example.com', 'jane', 'Password@123')
+        response = self.check(usernames=['jane', 'sam'], emails=['jane@example.com'])
+        self.assertEqual(response.json(), {'usernames': {'jane': False, 'sam': True}, 'emails': {'jane@example.com': False}})
+        self.assertEqual(self.check(emails=['jane@example.com', 'sam@example.com']).status_code, 400)
+
+    def test_checks_are_throttled(self):
+        rate = settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['availability']
+        allowed, _ = ScopedRateThrottle().parse_rate(rate)
+        for _ in range(allowed):
+            self.assertEqual(self.check(usernames=['sam']).status_code, 200)
+        self.assertEqual(self.check(usernames=['sam']).status_code, 429)
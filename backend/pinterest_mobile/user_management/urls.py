@@ -12,4 +12,8 @@ urlpatterns = [
     path('auth/logout', views.Logout.as_view(), name='logout'),
     path('auth/register', views.SendRegisterOTP.as_view(), name='register'),
     path('auth/verify_otp', views.VerifyOTP.as_view(), name='verify_otp'),
+    path('auth/availability', views.CheckAvailability.as_view(), name='check_availability'),
+
+    # Profiles
+    path('users/<str:username>', views.Profile.as_view(), name='profile'),
 ]
@@ -1,17 +1,27 @@
-from django.contrib.auth import authenticate, login
-from django.contrib.auth.hashers import make_password, check_password
+from django.conf import settings
+from django.contrib.auth import login
+from django.contrib.auth.hashers import make_password
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.response import Response
 from rest_framework import status
-from django.core.cache import cache
+from pinterest_mobile.cache import NamespacedCache
+from pinterest_mobile.conditional import ConditionalGetMixin, validators
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 from datetime import timedelta
 from .validation.validation import RegistrationForm
+from .availability import index as availability_index, is_username_taken, is_email_taken, MAX_BATCH
+from .backends import check_credentials
 from .models import User
+from .serializers import ProfileSerializer
 from .email.email import send_otp_to_email, send_reset_password
 import uuid
 
+otp_cache = NamespacedCache('otp')
+
 class Login(APIView):
     def post(self, request):
         try:
@@ -21,15 +31,18 @@ class Login(APIView):
             if not email or not password:
                 return Response({"error": "Email and password are required."}, status=status.HTTP_400_BAD_REQUEST)
             
-            user = authenticate(request, email=email, password=password)
-            
-            if not user:
-                return Response({"error": "User not found."}, status=status.HTTP_404_NOT_FOUND)
+            user, is_valid = check_credentials(email, password)
 
-            if not check_password(password, user.password):
+            # Unknown emails get the same answer as wrong passwords, so the
+            # endpoint can't be used to find out who has an account.
+            if not is_valid:
                 return Response({"error": "Invalid credentials."}, status=status.HTTP_401_UNAUTHORIZED)
 
-            login(request, user)
+            if settings.AUTH_STATELESS_LOGIN:
+                # JWT only: no session row, just record the sign-in time
+                User.objects.filter(pk=user.pk).update(last_login=timezone.now())
+            else:
+                login(request, user, backend='django.contrib.auth.backends.ModelBackend')
             token = RefreshToken.for_user(user)
 
             response = Response({
@@ -91,7 +104,7 @@ class SendRegisterOTP(APIView):
 
             if not username.isalnum() and "_" not in username:
                 return Response({"error": "Username must be alphanumeric or contain underscores only."}, status=status.HTTP_400_BAD_REQUEST)
-            if User.objects.filter(username=username).exists():
+            if is_username_taken(username):
                 return Response({"error": "Username is already taken."}, status=status.HTTP_400_BAD_REQUEST)
 
             if not first_name.isalpha() or not last_name.isalpha():
@@ -100,7 +113,7 @@ class SendRegisterOTP(APIView):
             if password != confirm_password:
                 return Response({"error": "Passwords do not match."}, status=status.HTTP_400_BAD_REQUEST)
 
-            if User.objects.filter(email=email).exists():
+            if is_email_taken(email):
                 return Response({"error": "Email is already registered."}, status=status.HTTP_400_BAD_REQUEST)
 
             form = RegistrationForm({
@@ -115,8 +128,8 @@ class SendRegisterOTP(APIView):
                 return Response({"errors": form.errors}, status=status.HTTP_400_BAD_REQUEST)
 
             purpose = 'account_activation'
-            cache_key = f"otp_{purpose}_{email}"
-            if cache.get(cache_key):
+            cache_key = (purpose, email)
+            if otp_cache.get(cache_key):
                 return Response({"error": "An OTP has already been sent to this email. Please wait before requesting another."}, status=status.HTTP_429_TOO_MANY_REQUESTS)
 
             message = "OTP for Account Activation"
@@ -125,7 +138,7 @@ class SendRegisterOTP(APIView):
                 return Response({"error": "Failed to send OTP. Please try again later."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
             expiry_time = 120 # 2 minutes
-            cache.set(cache_key, otp_generated, timeout=expiry_time)
+            otp_cache.set(cache_key, otp_generated, timeout=expiry_time)
 
             return Response({
                 "message": "OTP sent to email.",
@@ -148,8 +161,8 @@ class VerifyOTP(APIView):
                 return Response({"error": "Email, username, first name, last name, password, and otp are required."}, status=status.HTTP_400_BAD_REQUEST)
 
             purpose = 'account_activation'
-            cache_key = f"otp_{purpose}_{email}"
-            cached_otp = cache.get(cache_key)
+            cache_key = (purpose, email)
+            cached_otp = otp_cache.get(cache_key)
 
             if not cached_otp or str(cached_otp) != str(otp):
                 return Response({"error": "Invalid or expired OTP."}, status=status.HTTP_400_BAD_REQUEST)
@@ -176,7 +189,7 @@ class VerifyOTP(APIView):
 
             user.save()
 
-            cache.delete(cache_key)
+            otp_cache.delete(cache_key)
 
             return Response({
                 "message": "Account verified and created successfully.",
@@ -192,3 +205,41 @@ class VerifyOTP(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class CheckAvailability(APIView):
+    """Whether usernames (up to MAX_BATCH) and a single email are free to register"""
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'availability'
+
+    def post(self, request):
+        try:
+            usernames = request.data.get('usernames') or []
+            emails = request.data.get('emails') or []
+
+            if not isinstance(usernames, list) or not isinstance(emails, list):
+                return Response({"error": "Usernames and emails must be lists."}, status=status.HTTP_400_BAD_REQUEST)
+            if not usernames and not emails:
+                return Response({"error": "At least one username or email is required."}, status=status.HTTP_400_BAD_REQUEST)
+            if len(usernames) > MAX_BATCH or len(emails) > 1:
+                return Response({"error": f"At most {MAX_BATCH} usernames and one email per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+            usernames = [str(username) for username in usernames]
+            emails = [str(email) for email in emails]
+            taken_usernames = availability_index.taken('username', usernames) if usernames else {}
+            taken_emails = availability_index.taken('email', emails) if emails else {}
+
+            return Response({
+                "usernames": {username: not taken for username, taken in taken_usernames.items()},
+                "emails": {email: not taken for email, taken in taken_emails.items()},
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class Profile(ConditionalGetMixin, APIView):
+    """A user's public profile by username"""
+    query_budget = 2
+
+    def get(self, request, username):
+        user = get_object_or_404(User.objects.filter(is_active=True), username=username)
+        etag, last_modified = validators(request, user.updated_at, user.follower_count, user.following_count)
+        return self.respond(request, etag, last_modified, lambda: Response(ProfileSerializer(user).data))
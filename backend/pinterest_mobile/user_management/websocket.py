@@ -0,0 +1,36 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+
+def raw_token(scope):
+    """Access token from ?token=, an Authorization: Bearer header or the access_token cookie"""
+    query = parse_qs(scope.get('query_string', b'').decode())
+    if query.get('token'):
+        return query['token'][0]
+    headers = dict(scope.get('headers', []))
+    authorization = headers.get(b'authorization', b'').decode()
+    if authorization.lower().startswith('bearer '):
+        return authorization[7:].strip()
+    return scope.get('cookies', {}).get('access_token')
+
+
+@database_sync_to_async
+def authenticate(token):
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Sets scope['user'] from the same JWT the REST API accepts"""
+
+    async def __call__(self, scope, receive, send):
+        token = raw_token(scope)
+        scope['user'] = await authenticate(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)